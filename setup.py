@@ -8,8 +8,12 @@ Run this after cloning the repository.
 import os
 import shutil
 import sys
+from collections import defaultdict
 from pathlib import Path
 
+# Resolve once; every setup path is built from this instead of chdir'ing into it
+BASE_DIR = Path(__file__).resolve().parent
+
 def print_header(message):
     """Print a formatted header message."""
     print(f"\n{'='*70}")
@@ -28,14 +32,21 @@ def print_error(message):
     """Print an error message."""
     print(f"✗ {message}")
 
-def setup_config_files():
+def list_entries(directory):
+    """Return the names of entries in a directory (one readdir instead of a stat per path)."""
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries}
+
+def setup_config_files(base_dir=BASE_DIR):
     """Copy template config files to actual config files if they don't exist."""
     print_header("Setting up configuration files")
     
-    config_dir = Path("config")
+    config_dir = base_dir / "config"
     
-    # Check if config directory exists
-    if not config_dir.exists():
+    # List the config directory once; this also checks that it exists
+    try:
+        existing = list_entries(config_dir)
+    except FileNotFoundError:
         print_error(f"Config directory not found: {config_dir}")
         return False
     
@@ -48,27 +59,29 @@ def setup_config_files():
         template_path = config_dir / template_name
         target_path = config_dir / target_name
         
-        # Check if template exists
-        if not template_path.exists():
-            print_error(f"Template not found: {template_path}")
-            continue
-        
-        # Check if target already exists
-        if target_path.exists():
+        if target_name in existing:
             print_warning(f"Config file already exists: {target_name} (skipping)")
             continue
+        if template_name not in existing:
+            print_error(f"Template not found: {template_path}")
+            continue
         
-        # Copy template to target
+        # Copy template to target; exclusive create ("xb") skips existing files
         try:
-            shutil.copy(template_path, target_path)
+            with open(template_path, "rb") as src, open(target_path, "xb") as dst:
+                shutil.copyfileobj(src, dst)
             print_success(f"Created: {target_name}")
+        except FileExistsError:
+            print_warning(f"Config file already exists: {target_name} (skipping)")
+        except FileNotFoundError:
+            print_error(f"Template not found: {template_path}")
         except Exception as e:
             print_error(f"Failed to create {target_name}: {e}")
             return False
     
     return True
 
-def verify_directories():
+def verify_directories(base_dir=BASE_DIR):
     """Verify that all required directories exist."""
     print_header("Verifying directory structure")
     
@@ -82,19 +95,34 @@ def verify_directories():
         "logs/accounts"
     ]
     
+    # Group targets by parent so each parent is listed once
+    targets = {dir_path: base_dir / dir_path for dir_path in required_dirs}
+    by_parent = defaultdict(list)
+    for path in targets.values():
+        by_parent[path.parent].append(path)
+    
+    existing = set()
+    for parent, children in by_parent.items():
+        try:
+            names = list_entries(parent)
+        except FileNotFoundError:
+            continue
+        existing.update(child for child in children if child.name in names)
+    
     all_exist = True
     for dir_path in required_dirs:
-        path = Path(dir_path)
-        if path.exists():
+        path = targets[dir_path]
+        if path in existing:
             print_success(f"Directory exists: {dir_path}")
-        else:
-            print_warning(f"Directory missing: {dir_path} (will be created)")
-            try:
-                path.mkdir(parents=True, exist_ok=True)
-                print_success(f"Created directory: {dir_path}")
-            except Exception as e:
-                print_error(f"Failed to create {dir_path}: {e}")
-                all_exist = False
+            continue
+        try:
+            path.mkdir(parents=True)
+            print_success(f"Created directory: {dir_path}")
+        except FileExistsError:
+            print_success(f"Directory exists: {dir_path}")
+        except Exception as e:
+            print_error(f"Failed to create {dir_path}: {e}")
+            all_exist = False
     
     return all_exist
 
@@ -140,11 +168,7 @@ def main():
     """Main setup function."""
     print_header("Twitter Automation AI - Initial Setup")
     
-    # Change to script directory
-    script_dir = Path(__file__).parent
-    os.chdir(script_dir)
-    
-    print(f"Working directory: {os.getcwd()}")
+    print(f"Project directory: {BASE_DIR}")
     
     # Run setup steps
     success = True
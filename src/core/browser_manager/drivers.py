@@ -67,6 +67,22 @@ def init_firefox_driver(
     return webdriver.Firefox(service=service, options=options)
 
 
+# Fonts and video segments that Chrome's image content setting does not cover
+BLOCKED_MEDIA_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.m4s", "*.m3u8", "*.webm"]
+
+
+def block_media_requests(driver: WebDriver, browser_type: str) -> None:
+    """Block font and video requests through CDP (Chrome only; Firefox uses profile preferences)."""
+    if browser_type != 'chrome':
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_MEDIA_URL_PATTERNS})
+        logger.info("Blocking font and video requests in the browser.")
+    except Exception as e:
+        logger.warning(f"Failed to block media requests via CDP: {e}")
+
+
 def apply_stealth_if_configured(driver: WebDriver, browser_type: str, enable_stealth: bool) -> None:
     if browser_type == 'chrome' and enable_stealth and SELENIUM_STEALTH_AVAILABLE:
         try:
@@ -19,6 +19,7 @@ def configure_driver_options(
     proxy: Optional[str],
     additional_options: Optional[list],
     custom_user_agent: Optional[str] = None,
+    block_media: bool = False,
 ) -> Union[ChromeOptions, FirefoxOptions]:
     user_agent = get_user_agent(custom_user_agent)
     options.add_argument(f"user-agent={user_agent}")
@@ -54,6 +55,15 @@ def configure_driver_options(
             else:
                 logger.warning(f"Proxy URL appears invalid for Firefox prefs: {proxy}")
 
+    # Skip image/font/video downloads; tweet media URLs are still read from the DOM attributes
+    if block_media:
+        if browser_type == 'chrome':
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        else:
+            options.set_preference('permissions.default.image', 2)
+            options.set_preference('gfx.downloadable_fonts.enabled', False)
+            options.set_preference('media.autoplay.default', 5)
+
     # Reduce automation fingerprints for Chrome
     if browser_type == 'chrome':
         try:
@@ -13,6 +13,7 @@ from .drivers import (
     init_chrome_driver,
     init_firefox_driver,
     apply_stealth_if_configured,
+    block_media_requests,
 )
 # Flexible import for login state utilities (works when run as module or script)
 try:
@@ -90,6 +91,7 @@ class BrowserManager:
         headless = bool(self.browser_settings.get('headless', False))
         window_size = self.browser_settings.get('window_size')
         driver_options_extra = self.browser_settings.get('driver_options', [])
+        block_media = bool(self.browser_settings.get('block_media_resources', False))
         
         if browser_type == 'chrome':
             from selenium.webdriver.chrome.options import Options as ChromeOptions  # local import to avoid heavy deps at import time
@@ -101,6 +103,7 @@ class BrowserManager:
                 proxy=self.effective_proxy,
                 additional_options=driver_options_extra,
                 custom_user_agent=self.browser_settings.get('custom_user_agent') if self.browser_settings.get('user_agent_generation') == 'custom' else None,
+                block_media=block_media,
             )
             use_uc = bool(self.browser_settings.get('use_undetected_chromedriver', False))
             service_args = self.browser_settings.get('chrome_service_args', [])
@@ -121,6 +124,7 @@ class BrowserManager:
                 proxy=self.effective_proxy,
                 additional_options=driver_options_extra,
                 custom_user_agent=self.browser_settings.get('custom_user_agent') if self.browser_settings.get('user_agent_generation') == 'custom' else None,
+                block_media=block_media,
             )
             service_args = self.browser_settings.get('firefox_service_args', [])
             configured_path = self.browser_settings.get('gecko_driver_path')
@@ -142,6 +146,8 @@ class BrowserManager:
 
         # Optional stealth
         apply_stealth_if_configured(self.driver, browser_type, bool(self.browser_settings.get('enable_stealth', True)))
+        if block_media:
+            block_media_requests(self.driver, browser_type)
 
         # Apply cookies if available
         if self.cookies_data:
@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 try:  # LangChain 0.2+ exposes messages via langchain_core
     from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, BaseMessage
@@ -9,48 +11,87 @@ except ImportError:  # pragma: no cover - fall back for older langchain versions
 logger = logging.getLogger(__name__)
 
 
-def _build_user_content(prompt: str, inline_media: List[Dict[str, Any]]) -> Any:  # type: ignore[valid-type]
-    text_prompt = (prompt or "").strip()
-    if not inline_media:
-        return text_prompt
+@dataclass(frozen=True)
+class ContentPart:
+    """Provider-neutral piece of user content: plain text or an image URL."""
+
+    kind: str  # 'text' or 'image_url'
+    value: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.kind == 'text':
+            return {"type": "text", "text": self.value}
+        return {"type": "image_url", "image_url": {"url": self.value}}
 
-    content: List[Dict[str, Any]] = []
-    if text_prompt:
-        content.append({"type": "text", "text": text_prompt})
 
-    for media in inline_media:
+def _normalize_inline_media(inline_media: Optional[List[Dict[str, Any]]]) -> List[ContentPart]:
+    """Flatten inline media entries into content parts shared by every provider."""
+    normalized: List[ContentPart] = []
+    for media in inline_media or []:
         parts = media.get('parts', []) if isinstance(media, dict) else []
-        for part in parts:
-            part_type = part.get('type') if isinstance(part, dict) else None
+        for part in parts or []:
+            if not isinstance(part, dict):
+                continue
+            part_type = part.get('type')
             if part_type == 'text':
                 text_value = str(part.get('text', '')).strip()
                 if text_value:
-                    content.append({"type": "text", "text": text_value})
+                    normalized.append(ContentPart('text', text_value))
             elif part_type == 'media':
-                source = part.get('source') if isinstance(part, dict) else None
+                source = part.get('source')
                 if not isinstance(source, dict):
                     continue
-                url = source.get('url')
-                if not url:
-                    continue
-                content.append({
-                    "type": "image_url",
-                    "image_url": {"url": str(url)},
-                })
+                # Media inlined upstream carries a data URL instead of a remote URL.
+                url = source.get('url') or source.get('data_url')
+                if url:
+                    normalized.append(ContentPart('image_url', str(url)))
+    return normalized
+
 
-    if not content:
-        fallback_text = text_prompt or "Please respond appropriately to the provided media."
-        content.append({"type": "text", "text": fallback_text})
+def _build_user_content(
+    prompt: str, media_parts: List[ContentPart], media_requested: bool = False
+) -> Any:  # type: ignore[valid-type]
+    text_prompt = (prompt or "").strip()
+    if not media_parts:
+        if media_requested and not text_prompt:
+            # Every inline media entry was dropped; never send an empty user message.
+            return [{"type": "text", "text": "Please respond appropriately to the provided media."}]
+        return text_prompt
 
+    content: List[Dict[str, Any]] = []
+    if text_prompt:
+        content.append({"type": "text", "text": text_prompt})
+    content.extend(part.to_dict() for part in media_parts)
     return content
 
 
+def _build_chat_messages(
+    prompt: str,
+    system_prompt: Optional[str],
+    messages: Optional[List[Dict[str, str]]],
+    media_parts: List[ContentPart],
+    media_requested: bool = False,
+) -> List[Dict[str, Any]]:
+    """Assemble the chat payload in one list build instead of copying history and appending.
+
+    The caller's history is never mutated, so this is the one copy of it per request.
+    """
+    user_message = {"role": "user", "content": _build_user_content(prompt, media_parts, media_requested)}
+    if messages is not None:
+        return [*messages, user_message]
+    if system_prompt:
+        return [{"role": "system", "content": system_prompt}, user_message]
+    return [user_message]
+
+
 class TextGenerator:
     """
     Service-agnostic text generation with fallback across providers.
     Expects pre-initialized clients and llm settings.
     """
 
+    KNOWN_SERVICES = ('gemini', 'azure', 'openai')
+
     def __init__(self, clients: Dict[str, Any], llm_settings: Dict[str, Any]):
         self.gemini_client = clients.get('gemini_client')
         self.openai_client = clients.get('openai_client')
@@ -59,6 +100,25 @@ class TextGenerator:
         self.service_preference_order: List[str] = self.llm_settings.get(
             'service_preference_order', ['azure', 'openai', 'gemini']
         )
+        # Hedged requests trade extra provider calls for lower tail latency; opt-in only.
+        self.hedge_requests: bool = bool(self.llm_settings.get('hedge_requests', False))
+        self.hedge_delay_seconds: float = float(self.llm_settings.get('hedge_delay_seconds', 2.0))
+        self._ordered_services: Tuple[str, ...] = tuple(self.service_preference_order)
+        # Dispatch table holding only the providers whose client is initialized.
+        self._handlers: Dict[str, Callable[..., Awaitable[Optional[str]]]] = {
+            name: handler
+            for name, handler, client in (
+                ('gemini', self._call_gemini, self.gemini_client),
+                ('azure', self._call_azure, self.azure_openai_client),
+                ('openai', self._call_openai, self.openai_client),
+            )
+            if client
+        }
+
+    def _service_order(self, service_preference: Optional[str]) -> Tuple[str, ...]:
+        if not service_preference:
+            return self._ordered_services
+        return (service_preference, *(s for s in self._ordered_services if s != service_preference))
 
     async def generate_text(
         self,
@@ -69,119 +129,192 @@ class TextGenerator:
         messages: Optional[List[Dict[str, str]]] = None,
         **call_params: Any,
     ) -> Optional[str]:
-        services_to_try = list(self.service_preference_order)
-        if service_preference and service_preference in services_to_try:
-            services_to_try.insert(0, services_to_try.pop(services_to_try.index(service_preference)))
-        elif service_preference:
-            services_to_try.insert(0, service_preference)
-
-        logger.debug(f"Service attempt order: {services_to_try}")
-
-        for service_name in services_to_try:
-            logger.info(f"Attempting to generate text using {service_name}...")
-            service_config = self.llm_settings.get(service_name, {})
-
-            final_params = {**service_config.get('default_params', {}), **call_params}
-            if 'model_name' in final_params and 'model' not in final_params:
-                final_params['model'] = final_params.pop('model_name')
-            if 'max_tokens' not in final_params:
-                final_params['max_tokens'] = self.llm_settings.get('default_max_tokens', 250)
-
-            inline_media_payload: List[Dict[str, Any]] = final_params.pop('inline_media', []) or []
-
-            try:
-                if service_name == 'gemini' and self.gemini_client:
-                    model_to_use = final_params.pop('model', service_config.get('model', 'gemini-2.5-pro'))
-                    if 'max_tokens' in final_params and 'max_output_tokens' not in final_params:
-                        final_params['max_output_tokens'] = final_params.pop('max_tokens')
-
-                    gemini_messages: List[BaseMessage] = []
-                    if system_prompt:
-                        gemini_messages.append(SystemMessage(content=system_prompt.strip()))
-
-                    user_parts: List[Dict[str, Any]] = [{"type": "text", "text": prompt.strip()}]
-                    for media in inline_media_payload:
-                        try:
-                            media_parts = media.get('parts', []) or []
-                            for part in media_parts:
-                                part_type = part.get('type')
-                                if part_type == 'text':
-                                    text_value = str(part.get('text', '')).strip()
-                                    if text_value:
-                                        user_parts.append({"type": "text", "text": text_value})
-                                elif part_type == 'media':
-                                    source = part.get('source') or {}
-                                    url = source.get('url')
-                                    if url:
-                                        # Gemini expects web images as "image_url" entries when provided via LangChain messages
-                                        user_parts.append({"type": "image_url", "image_url": {"url": str(url)}})
-                        except Exception as media_error:
-                            logger.error(
-                                f"Failed to attach inline media to Gemini request: {media_error}",
-                                exc_info=True,
-                            )
-
-                    gemini_messages.append(HumanMessage(content=user_parts))
-
-                    response = await self.gemini_client.ainvoke(gemini_messages, **final_params)
-                    logger.info(f"Successfully generated text using Gemini model '{model_to_use}'.")
-                    if isinstance(response, AIMessage):
-                        return response.content
-                    if hasattr(response, 'content'):
-                        return response.content
-                    return str(response)
-
-                elif service_name == 'azure' and self.azure_openai_client:
-                    deployment_name = final_params.pop(
-                        'model', service_config.get('deployment_name')
-                    )
-                    if not deployment_name:
-                        logger.error("Azure deployment name not specified for Azure OpenAI call.")
-                        continue
-                    built_messages = messages[:] if messages is not None else []
-                    if messages is None and system_prompt:
-                        built_messages.append({"role": "system", "content": system_prompt})
-
-                    user_content = _build_user_content(prompt, inline_media_payload)
-                    if messages is None:
-                        built_messages.append({"role": "user", "content": user_content})
-                    else:
-                        built_messages.append({"role": "user", "content": user_content})
-
-                    response = await self.azure_openai_client.chat.completions.create(
-                        model=deployment_name,
-                        messages=built_messages,
-                        **final_params,
-                    )
-                    logger.info(f"Successfully generated text using Azure OpenAI deployment '{deployment_name}'.")
-                    return response.choices[0].message.content.strip()
-
-                elif service_name == 'openai' and self.openai_client:
-                    model_to_use = final_params.pop('model', service_config.get('model', 'gpt-3.5-turbo'))
-                    built_messages = messages[:] if messages is not None else []
-                    if messages is None and system_prompt:
-                        built_messages.append({"role": "system", "content": system_prompt})
-
-                    user_content = _build_user_content(prompt, inline_media_payload)
-                    built_messages.append({"role": "user", "content": user_content})
-
-                    response = await self.openai_client.chat.completions.create(
-                        model=model_to_use,
-                        messages=built_messages,
-                        **final_params,
-                    )
-                    logger.info(f"Successfully generated text using OpenAI model '{model_to_use}'.")
-                    return response.choices[0].message.content.strip()
-
-                elif service_name not in ['gemini', 'azure', 'openai']:
-                    if service_preference == service_name:
-                        logger.warning(f"Unknown LLM service preference: {service_name}")
-                else:
-                    logger.info(f"{service_name.capitalize()} client not available or not initialized. Skipping.")
-
-            except Exception as e:
-                logger.error(f"Error using {service_name} LLM: {e}", exc_info=True)
+        # Walk the inline media once; every provider adapts the same parts.
+        inline_media = call_params.pop('inline_media', None)
+        media_parts = _normalize_inline_media(inline_media)
+
+        services_to_try = self._service_order(service_preference)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Service attempt order: {list(services_to_try)}")
+
+        # Azure and OpenAI take the same chat payload; build it once for every attempt.
+        chat_messages = (
+            _build_chat_messages(prompt, system_prompt, messages, media_parts, bool(inline_media))
+            if any(name in self._handlers for name in ('azure', 'openai'))
+            else None
+        )
+        attempt_kwargs = dict(
+            service_preference=service_preference,
+            system_prompt=system_prompt,
+            messages=messages,
+            chat_messages=chat_messages,
+            media_parts=media_parts,
+            call_params=call_params,
+        )
+        if self.hedge_requests:
+            result = await self._generate_hedged(prompt, services_to_try, **attempt_kwargs)
+            if result is not None:
+                return result
+        else:
+            for service_name in services_to_try:
+                result = await self._attempt_service(service_name, prompt, **attempt_kwargs)
+                if result is not None:
+                    return result
 
         logger.error("All configured LLM services failed or none are available/configured to generate text.")
         return None
 
+    async def _generate_hedged(
+        self,
+        prompt: str,
+        services_to_try: Tuple[str, ...],
+        **attempt_kwargs: Any,
+    ) -> Optional[str]:
+        """
+        Start the preferred service and, whenever no answer arrives within
+        hedge_delay_seconds (or an attempt fails), also start the next one.
+        The first successful result wins and the remaining attempts are cancelled.
+        """
+        remaining = list(services_to_try)
+        pending: Set[asyncio.Task] = set()
+        try:
+            while remaining or pending:
+                if remaining:
+                    service_name = remaining.pop(0)
+                    pending.add(asyncio.create_task(
+                        self._attempt_service(service_name, prompt, **attempt_kwargs)
+                    ))
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay_seconds if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        return result
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt_service(
+        self,
+        service_name: str,
+        prompt: str,
+        *,
+        service_preference: Optional[str],
+        system_prompt: Optional[str],
+        messages: Optional[List[Dict[str, str]]],
+        chat_messages: Optional[List[Dict[str, Any]]],
+        media_parts: List[ContentPart],
+        call_params: Dict[str, Any],
+    ) -> Optional[str]:
+        """Run one provider. Returns None when it is unavailable or fails."""
+        handler = self._handlers.get(service_name)
+        if handler is None:
+            if service_name not in self.KNOWN_SERVICES:
+                if service_preference == service_name:
+                    logger.warning(f"Unknown LLM service preference: {service_name}")
+            else:
+                logger.info(f"{service_name.capitalize()} client not available or not initialized. Skipping.")
+            return None
+
+        logger.info(f"Attempting to generate text using {service_name}...")
+        service_config = self.llm_settings.get(service_name, {})
+
+        final_params = {**service_config.get('default_params', {}), **call_params}
+        if 'model_name' in final_params and 'model' not in final_params:
+            final_params['model'] = final_params.pop('model_name')
+        if 'max_tokens' not in final_params:
+            final_params['max_tokens'] = self.llm_settings.get('default_max_tokens', 250)
+
+        try:
+            return await handler(
+                prompt,
+                system_prompt=system_prompt,
+                messages=messages,
+                chat_messages=chat_messages,
+                service_config=service_config,
+                params=final_params,
+                media_parts=media_parts,
+            )
+        except Exception as e:
+            logger.error(f"Error using {service_name} LLM: {e}", exc_info=True)
+            return None
+
+    async def _call_gemini(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str],
+        messages: Optional[List[Dict[str, str]]],
+        chat_messages: Optional[List[Dict[str, Any]]],
+        service_config: Dict[str, Any],
+        params: Dict[str, Any],
+        media_parts: List[ContentPart],
+    ) -> Optional[str]:
+        model_to_use = params.pop('model', service_config.get('model', 'gemini-2.5-pro'))
+        if 'max_tokens' in params and 'max_output_tokens' not in params:
+            params['max_output_tokens'] = params.pop('max_tokens')
+
+        gemini_messages: List[BaseMessage] = []
+        if system_prompt:
+            gemini_messages.append(SystemMessage(content=system_prompt.strip()))
+
+        user_parts: List[Dict[str, Any]] = [{"type": "text", "text": prompt.strip()}]
+        # Gemini accepts web and data URLs as "image_url" entries in LangChain messages
+        user_parts.extend(part.to_dict() for part in media_parts)
+
+        gemini_messages.append(HumanMessage(content=user_parts))
+
+        response = await self.gemini_client.ainvoke(gemini_messages, **params)
+        logger.info(f"Successfully generated text using Gemini model '{model_to_use}'.")
+        if isinstance(response, AIMessage):
+            return response.content
+        if hasattr(response, 'content'):
+            return response.content
+        return str(response)
+
+    async def _call_azure(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str],
+        messages: Optional[List[Dict[str, str]]],
+        chat_messages: Optional[List[Dict[str, Any]]],
+        service_config: Dict[str, Any],
+        params: Dict[str, Any],
+        media_parts: List[ContentPart],
+    ) -> Optional[str]:
+        deployment_name = params.pop('model', service_config.get('deployment_name'))
+        if not deployment_name:
+            logger.error("Azure deployment name not specified for Azure OpenAI call.")
+            return None
+        response = await self.azure_openai_client.chat.completions.create(
+            model=deployment_name,
+            messages=chat_messages,
+            **params,
+        )
+        logger.info(f"Successfully generated text using Azure OpenAI deployment '{deployment_name}'.")
+        return response.choices[0].message.content.strip()
+
+    async def _call_openai(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str],
+        messages: Optional[List[Dict[str, str]]],
+        chat_messages: Optional[List[Dict[str, Any]]],
+        service_config: Dict[str, Any],
+        params: Dict[str, Any],
+        media_parts: List[ContentPart],
+    ) -> Optional[str]:
+        model_to_use = params.pop('model', service_config.get('model', 'gpt-3.5-turbo'))
+        response = await self.openai_client.chat.completions.create(
+            model=model_to_use,
+            messages=chat_messages,
+            **params,
+        )
+        logger.info(f"Successfully generated text using OpenAI model '{model_to_use}'.")
+        return response.choices[0].message.content.strip()
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 
 from core.config_loader import ConfigLoader
 from .constants import DEFAULT_SERVICE_ORDER
@@ -43,6 +44,43 @@ class LLMService:
             **call_params,
         )
 
+    async def generate_text_batch(
+        self,
+        prompts: Sequence[str],
+        inline_media_list: Optional[Sequence[Optional[List[Dict[str, Any]]]]] = None,
+        *,
+        max_concurrency: int = 8,
+        **call_params: Any,
+    ) -> List[Optional[str]]:
+        """
+        Generate text for several prompts, returning results in prompt order.
+        Provider chat APIs take one prompt per request, so the batch is sent as
+        concurrent requests (at most max_concurrency in flight) that the provider
+        can batch server-side. A prompt whose generation fails yields None.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        media_for_prompts = list(inline_media_list or [])
+
+        async def _generate_one(index: int, prompt: str) -> Optional[str]:
+            inline_media = media_for_prompts[index] if index < len(media_for_prompts) else None
+            async with semaphore:
+                return await self.generate_text(prompt, inline_media=inline_media, **call_params)
+
+        results = await asyncio.gather(
+            *(_generate_one(index, prompt) for index, prompt in enumerate(prompts)),
+            return_exceptions=True,
+        )
+        outputs: List[Optional[str]] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                logger.error(f"Batched text generation failed for one prompt: {result}")
+                outputs.append(None)
+            else:
+                outputs.append(result)
+        return outputs
+
     async def generate_structured(
         self,
         task_instruction: str,
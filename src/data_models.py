@@ -31,10 +31,12 @@ class ActionConfig(BaseModel): # This can be global or per-account
     # General action timing
     min_delay_between_actions_seconds: int = Field(60, description="Minimum delay between any two actions for an account.")
     max_delay_between_actions_seconds: int = Field(180, description="Maximum delay between any two actions for an account.")
+    human_like_jitter: bool = Field(True, description="Add a short random pause before UI actions such as replies. Disable for non-interactive runs.")
 
     # Competitor Reposting specific controls
     enable_competitor_reposts: bool = Field(True, description="Enable reposting based on competitor tweets.")
     max_posts_per_competitor_run: int = Field(2, description="Max tweets to generate from each competitor profile per run.")
+    max_concurrent_profile_scrapes: int = Field(1, description="Competitor profiles scraped at the same time. Each one beyond the first opens an extra browser for the account.")
     repost_only_tweets_with_media: bool = Field(False, description="Only consider competitor tweets with media for reposting.")
     min_likes_for_repost_candidate: int = Field(0, description="Minimum likes on original competitor tweet to consider.")
     min_retweets_for_repost_candidate: int = Field(0, description="Minimum retweets on original competitor tweet to consider.")
@@ -57,6 +59,18 @@ class ActionConfig(BaseModel): # This can be global or per-account
         3,
         description="Maximum number of hours to continue home timeline replies during one session.",
     )
+    home_timeline_reply_prefetch: int = Field(
+        0,
+        description="Number of upcoming home timeline candidates whose replies are generated concurrently with the current one. 0 generates one at a time; higher values cut waiting after guardrail rejections at the cost of extra LLM calls.",
+    )
+    home_timeline_pacing_seed: Optional[int] = Field(
+        None,
+        description="Seed for the home timeline reply delay schedule. Set it to replay a session's pacing exactly; None draws fresh delays every session.",
+    )
+    style_memory_ttl_hours: float = Field(
+        6.0,
+        description="Reuse the persisted style memory instead of re-scraping the account's profile while it is younger than this many hours. 0 always re-scrapes.",
+    )
     style_prompt_template: Optional[str] = Field(
         None,
         description="Custom template for constructing the style system prompt. Supports formatting keys: {handle}, {style_context}, {media_references}, {account_id}.",
@@ -65,6 +79,7 @@ class ActionConfig(BaseModel): # This can be global or per-account
     # Keyword Reply specific controls
     enable_keyword_replies: bool = Field(True, description="Enable replying to tweets based on keywords.")
     max_replies_per_keyword_run: int = Field(3, description="Max replies to make per keyword per run.")
+    llm_batch_size: int = Field(16, description="Max keyword-reply prompts generated together in one concurrent LLM batch.")
     reply_only_to_recent_tweets_hours: Optional[int] = Field(None, description="Only reply to tweets newer than X hours. None means no age limit.")
     avoid_replying_to_own_tweets: bool = Field(True, description="Prevent replying to the account's own tweets found via keyword search.")
 
@@ -108,6 +123,7 @@ class ActionConfig(BaseModel): # This can be global or per-account
     decision_quote_min: Optional[float] = Field(None, description="Relevance >= this triggers quote tweet.")
     decision_retweet_min: Optional[float] = Field(None, description="Relevance >= this triggers retweet.")
     decision_repost_min: Optional[float] = Field(None, description="Relevance >= this triggers repost; below becomes like.")
+    decision_like_below_keyword_score: Optional[float] = Field(None, description="Keyword-match score (no LLM) below this decides like without consulting the LLM.")
 
     # Community engagement controls
     enable_community_engagement: bool = Field(
@@ -138,6 +154,10 @@ class ActionConfig(BaseModel): # This can be global or per-account
         24,
         description="Only reply to community posts newer than X hours; None for no age limit.",
     )
+    community_reply_prefetch: int = Field(
+        0,
+        description="Number of upcoming reply-eligible community posts whose replies are generated while the current post is handled. 0 generates each reply when its post is reached; unused replies still cost LLM calls.",
+    )
 
 
 class AccountConfig(BaseModel):
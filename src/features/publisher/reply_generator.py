@@ -2,20 +2,26 @@
 from __future__ import annotations
 
 import asyncio
-import base64
+import copy
 import logging
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import re
+from binascii import b2a_base64
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
 
 import requests
 
 from core.llm_service import LLMService
 from data_models import LLMSettings, ScrapedTweet
 from utils.text_utils import (
+    analyze_texts,
     describe_media_urls,
-    extract_keywords_from_texts,
-    infer_tone_from_samples,
     is_probably_humorous,
     tokenize_for_overlap,
+    truncate_text,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,8 +46,99 @@ DEFAULT_OFF_TOPIC_TERMS: Tuple[str, ...] = (
     "command line",
 )
 
+
+def _trie_regex(terms: Sequence[str]) -> str:
+    """Build an alternation of ``terms`` factored by shared prefixes.
+
+    ``re`` backtracks through a flat alternation term by term at every offset;
+    a prefix trie rejects most offsets after a single character test. Optional
+    tails are greedy, so the longest term at an offset wins as before.
+    """
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + _emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:{})".format("|".join(branches))
+        return "(?:{})?".format(body) if "" in node else body
+
+    return _emit(trie)
+
+
+# Single-pass matcher over all default terms. The lookahead reports one match per
+# offset (the longest term there), so it equals the per-term `in` checks only while
+# no term is a prefix of another ("repository" would hide "repo").
+assert not any(
+    other != term and other.startswith(term)
+    for term in DEFAULT_OFF_TOPIC_TERMS
+    for other in DEFAULT_OFF_TOPIC_TERMS
+), "DEFAULT_OFF_TOPIC_TERMS must be prefix-free for _OFF_TOPIC_PATTERN"
+_OFF_TOPIC_PATTERN = re.compile("(?=({}))".format(_trie_regex(DEFAULT_OFF_TOPIC_TERMS)))
+
 MEDIA_DOWNLOAD_TIMEOUT = 12.0
 MAX_INLINE_MEDIA_SIZE = 6 * 1024 * 1024  # 6 MiB safety budget
+MEDIA_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MEDIA_CACHE_MAX_ENTRIES = 64
+MEDIA_POOL_MAX_CONNECTIONS = 16
+
+_REPLY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "reply_text": {
+            "type": "string",
+            "description": f"Final reply under {MAX_REPLY_CHARS} characters.",
+        },
+        "is_relevant": {"type": "boolean"},
+        "relevance_reason": {
+            "type": "string",
+            "description": "Brief reason explaining relevance judgement.",
+        },
+        "referenced_topics": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Key topics mentioned in the reply.",
+        },
+    },
+    "required": ["reply_text", "is_relevant", "relevance_reason"],
+}
+
+# Static instruction fragments, evaluated once at import time.
+_INSTRUCTION_HEADER = "\n".join((
+    "You are crafting a public reply on X (Twitter).",
+    "Your reply must stay tightly focused on the tweet's content.",
+    f"Allowed length: <= {MAX_REPLY_CHARS} characters.",
+    "Do not fabricate knowledge about attached media; if unsure, acknowledge uncertainty briefly.",
+    "If you cannot determine what is in the media, explicitly note that instead of guessing.",
+))
+_INSTRUCTION_HEADER_NEUTRAL = _INSTRUCTION_HEADER + "\nUse a neutral, conversational tone."
+_NO_CAPTION_LINE = (
+    "\nThe tweet has no visible text caption; rely solely on the media or acknowledge that you cannot see it."
+)
+
+_SCHEMA_INSTRUCTION_SUFFIX = (
+    "\nRespond with JSON having this schema: {\n"
+    "  \"reply_text\": string,\n"
+    "  \"is_relevant\": boolean,\n"
+    "  \"relevance_reason\": string,\n"
+    "  \"referenced_topics\": array of strings (0-4 items)\n"
+    "}."
+    "\nMark is_relevant=false if your reply fails to reference the tweet's subject."
+    " Provide concise rationale in relevance_reason."
+)
+
+# Recently inlined media keyed by URL (LRU order). Only successful downloads are stored.
+_MEDIA_CACHE: "OrderedDict[str, str]" = OrderedDict()
+# Downloads in progress, so concurrent replies that inline the same media fetch it once.
+# Keyed by (event loop, URL): a future can only be awaited on the loop that created it,
+# and each account worker process or asyncio.run() call brings its own loop.
+_MEDIA_IN_FLIGHT: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Future[Optional[str]]"] = {}
+_HTTP_SESSION: Optional[requests.Session] = None
 
 
 def _normalize_urls(urls: Optional[Sequence[str]]) -> List[str]:
@@ -50,12 +147,20 @@ def _normalize_urls(urls: Optional[Sequence[str]]) -> List[str]:
     return [str(url) for url in urls if url]
 
 
-def _prepare_tweet_context(tweet: ScrapedTweet) -> Dict[str, Any]:
-    text = (tweet.text_content or "").strip()
-    keywords = extract_keywords_from_texts([text], max_keywords=6)
-    tone = infer_tone_from_samples([text])
-    media_urls = _normalize_urls(getattr(tweet, "embedded_media_urls", None))
-    media_note = describe_media_urls(media_urls)
+def _prepare_tweet_context(tweet: ScrapedTweet) -> Mapping[str, Any]:
+    # The same tweet is analysed by should_apply_style_profile and again by
+    # generate_guarded_reply, so the derived context is cached on its content.
+    # Every caller gets the same object, hence the read-only mapping of immutable values.
+    return _cached_tweet_context(
+        (tweet.text_content or "").strip(),
+        tuple(_normalize_urls(getattr(tweet, "embedded_media_urls", None))),
+    )
+
+
+@lru_cache(maxsize=256)
+def _cached_tweet_context(text: str, media_url_key: Tuple[str, ...]) -> Mapping[str, Any]:
+    keywords, tone = analyze_texts([text], max_keywords=6)
+    media_note = describe_media_urls(media_url_key)
     humor_flag = is_probably_humorous(text)
 
     descriptor_segments: List[str] = [f"Tone: {tone}."]
@@ -63,18 +168,19 @@ def _prepare_tweet_context(tweet: ScrapedTweet) -> Dict[str, Any]:
         descriptor_segments.append("Humorous or meme-like language detected.")
     if text.count("?"):
         descriptor_segments.append("This tweet asks a question; answer it directly.")
-    if not text and media_urls:
+    if not text and media_url_key:
         descriptor_segments.append("Tweet has no textual caption; rely on media context or acknowledge if you cannot view it.")
     descriptor = " ".join(descriptor_segments)
 
-    return {
+    return MappingProxyType({
         "text": text,
-        "keywords": keywords,
-        "media_urls": media_urls,
+        "tokens": frozenset(tokenize_for_overlap(text)),
+        "keywords": tuple(keywords),
+        "media_urls": media_url_key,
         "media_note": media_note,
         "descriptor": descriptor,
         "humor_flag": humor_flag,
-    }
+    })
 
 
 def should_apply_style_profile(tweet: ScrapedTweet, style_keywords: Sequence[str]) -> bool:
@@ -84,55 +190,53 @@ def should_apply_style_profile(tweet: ScrapedTweet, style_keywords: Sequence[str
     context = _prepare_tweet_context(tweet)
     if context["humor_flag"]:
         return False
-    tweet_tokens = tokenize_for_overlap(context["text"])
-    overlap = tweet_tokens.intersection({keyword.lower() for keyword in style_keywords})
-    return bool(overlap)
+    return not _style_keyword_set(tuple(style_keywords)).isdisjoint(context["tokens"])
+
+
+@lru_cache(maxsize=64)
+def _style_keyword_set(style_keywords: Tuple[str, ...]) -> FrozenSet[str]:
+    # One account reuses the same keyword signature for every candidate tweet.
+    return frozenset(keyword.lower() for keyword in style_keywords)
 
 
 def _find_off_topic_terms(
     reply_text: str,
-    tweet_text: str,
-    allowed_terms: Sequence[str],
+    allowed_lower: AbstractSet[str],
 ) -> List[str]:
-    reply_lower = reply_text.lower()
-    allowed = {term.lower() for term in allowed_terms}
-    allowed.update(tokenize_for_overlap(tweet_text))
+    # allowed_lower is prepared once per request (focus keywords + tweet tokens),
+    # so each retry only lowercases the reply itself.
+    matched = {match.group(1) for match in _OFF_TOPIC_PATTERN.finditer(reply_text.lower())}
+    if not matched:
+        return []
     return [
         term
         for term in DEFAULT_OFF_TOPIC_TERMS
-        if term in reply_lower and term not in allowed
+        if term in matched and term not in allowed_lower
     ]
 
 
 def _build_instruction(
     tweet: ScrapedTweet,
-    tweet_context: Dict[str, Any],
+    tweet_context: Mapping[str, Any],
     *,
     style_summary: Optional[str],
     persona_handle: Optional[str],
     banned_terms: Sequence[str],
-    feedback: Optional[str],
-) -> str:
-    focus_keywords = tweet_context.get("keywords") or []
+) -> Tuple[str, str]:
+    """Return the instruction as (prefix, suffix) around the per-attempt correction line.
+
+    Everything except the retry feedback is constant for a tweet, so callers
+    build this once and join it with `_apply_feedback` on each attempt.
+    """
+    focus_keywords = tweet_context.get("keywords") or ()
     media_note = tweet_context.get("media_note", "No media attached.")
     descriptor = tweet_context.get("descriptor", "")
     handle = tweet.user_handle or "user"
 
-    lines = [
-        "You are crafting a public reply on X (Twitter).",
-        "Your reply must stay tightly focused on the tweet's content.",
-        f"Allowed length: <= {MAX_REPLY_CHARS} characters.",
-        "Do not fabricate knowledge about attached media; if unsure, acknowledge uncertainty briefly.",
-        "If you cannot determine what is in the media, explicitly note that instead of guessing.",
-    ]
     if style_summary:
-        lines.append("Match the following style cues when relevant:")
-        lines.append(style_summary)
+        prefix = f"{_INSTRUCTION_HEADER}\nMatch the following style cues when relevant:\n{style_summary}"
     else:
-        lines.append("Use a neutral, conversational tone.")
-
-    if feedback:
-        lines.append(f"Correction guidance: {feedback}")
+        prefix = _INSTRUCTION_HEADER_NEUTRAL
 
     keyword_line = (
         f"Prioritise these tweet keywords in your reply: {', '.join(focus_keywords)}."
@@ -140,41 +244,34 @@ def _build_instruction(
         else "Focus on what the tweet explicitly states."
     )
     banned_line = (
-        f"Avoid these off-topic terms unless the tweet mentions them: {', '.join(banned_terms)}."
+        f"\nAvoid these off-topic terms unless the tweet mentions them: {', '.join(banned_terms)}."
         if banned_terms
         else ""
     )
-
-    if not tweet_context.get("text"):
-        lines.append("The tweet has no visible text caption; rely solely on the media or acknowledge that you cannot see it.")
-
-    instruction = (
-        "\n".join(lines)
-        + "\n\n" + keyword_line
-        + ("\n" + banned_line if banned_line else "")
-        + "\n\nTweet details:\n"
+    persona_line = f"- You are replying as @{persona_handle}.\n" if persona_handle else ""
+
+    suffix = "".join((
+        "" if tweet_context.get("text") else _NO_CAPTION_LINE,
+        "\n\n",
+        keyword_line,
+        banned_line,
+        "\n\nTweet details:\n"
         f"- Author handle: @{handle}\n"
         f"- Tweet text: {tweet_context['text'] or '[no text supplied]'}\n"
         f"- Media note: {media_note}\n"
-        f"- Descriptor: {descriptor or 'Neutral'}\n"
-    )
-    if persona_handle:
-        instruction += f"- You are replying as @{persona_handle}.\n"
-
-    instruction += (
-        "\nRespond with JSON having this schema: {\n"
-        "  \"reply_text\": string,\n"
-        "  \"is_relevant\": boolean,\n"
-        "  \"relevance_reason\": string,\n"
-        "  \"referenced_topics\": array of strings (0-4 items)\n"
-        "}."
-    )
-    instruction += (
-        "\nMark is_relevant=false if your reply fails to reference the tweet's subject."
-        " Provide concise rationale in relevance_reason."
-    )
+        f"- Descriptor: {descriptor or 'Neutral'}\n",
+        persona_line,
+        _SCHEMA_INSTRUCTION_SUFFIX,
+    ))
 
-    return instruction
+    return prefix, suffix
+
+
+def _apply_feedback(instruction_parts: Tuple[str, str], feedback: Optional[str]) -> str:
+    prefix, suffix = instruction_parts
+    if feedback:
+        return f"{prefix}\nCorrection guidance: {feedback}{suffix}"
+    return prefix + suffix
 
 
 def _merge_unique(sequence: Sequence[str]) -> List[str]:
@@ -189,72 +286,180 @@ def _merge_unique(sequence: Sequence[str]) -> List[str]:
     return ordered
 
 
+def _get_http_session() -> requests.Session:
+    """Return the shared keep-alive session used for media downloads."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=MEDIA_POOL_MAX_CONNECTIONS,
+            pool_maxsize=MEDIA_POOL_MAX_CONNECTIONS,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
 async def _download_media_to_data_url(url: str) -> Optional[str]:
+    cached = _MEDIA_CACHE.get(url)
+    if cached is not None:
+        _MEDIA_CACHE.move_to_end(url)
+        return cached
+
+    key = (asyncio.get_running_loop(), url)
+    pending = _MEDIA_IN_FLIGHT.get(key)
+    if pending is None:
+        pending = _MEDIA_IN_FLIGHT[key] = asyncio.ensure_future(_fetch_media_data_url(url))
+        pending.add_done_callback(lambda _: _MEDIA_IN_FLIGHT.pop(key, None))
+    # Shielded: one cancelled reply must not abort the download for the others.
+    return await asyncio.shield(pending)
+
+
+async def _fetch_media_data_url(url: str) -> Optional[str]:
     def _fetch() -> Optional[str]:
-        response = requests.get(url, timeout=MEDIA_DOWNLOAD_TIMEOUT)
-        response.raise_for_status()
-        content = response.content
-        if len(content) > MAX_INLINE_MEDIA_SIZE:
-            raise ValueError(f"media payload exceeds {MAX_INLINE_MEDIA_SIZE} bytes")
-        mime = response.headers.get('Content-Type', 'image/jpeg').split(';')[0]
-        encoded = base64.b64encode(content).decode('ascii')
-        return f"data:{mime};base64,{encoded}"
+        with _get_http_session().get(url, timeout=MEDIA_DOWNLOAD_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            declared_size = response.headers.get('Content-Length')
+            if declared_size and declared_size.isdigit() and int(declared_size) > MAX_INLINE_MEDIA_SIZE:
+                raise ValueError(f"media payload exceeds {MAX_INLINE_MEDIA_SIZE} bytes")
+            content = bytearray()
+            for chunk in response.iter_content(chunk_size=MEDIA_DOWNLOAD_CHUNK_SIZE):
+                content.extend(chunk)
+                if len(content) > MAX_INLINE_MEDIA_SIZE:
+                    raise ValueError(f"media payload exceeds {MAX_INLINE_MEDIA_SIZE} bytes")
+            mime = response.headers.get('Content-Type', 'image/jpeg').split(';')[0]
+        # Encode straight into the data URL buffer so only one str is materialized.
+        data_url = bytearray(f"data:{mime};base64,".encode('ascii'))
+        data_url += b2a_base64(content, newline=False)
+        return data_url.decode('ascii')
 
     try:
-        return await asyncio.to_thread(_fetch)
+        data_url = await asyncio.to_thread(_fetch)
     except Exception as exc:
         logger.warning("Failed to inline media %s for Gemini: %s", url, exc)
         return None
 
+    if data_url:
+        _MEDIA_CACHE[url] = data_url
+        _MEDIA_CACHE.move_to_end(url)
+        while len(_MEDIA_CACHE) > MEDIA_CACHE_MAX_ENTRIES:
+            _MEDIA_CACHE.popitem(last=False)
+    return data_url
+
+
+@dataclass(frozen=True)
+class _MediaRef:
+    """Typed view of one media part inside an inline_media payload."""
+
+    entry_idx: int
+    part_idx: int
+    url: Optional[str]
+    is_data_url: bool
+
+    @property
+    def needs_download(self) -> bool:
+        return bool(self.url) and not self.is_data_url
+
+    @property
+    def log_label(self) -> Optional[str]:
+        return '<embedded-data-url>' if self.is_data_url else self.url
+
+
+def _coerce_inline_media(inline_media: Optional[List[Dict[str, Any]]]) -> Tuple[_MediaRef, ...]:
+    """Validate the untyped inline_media payload once and return its media parts."""
+    refs: List[_MediaRef] = []
+    for entry_idx, entry in enumerate(inline_media or []):
+        parts = entry.get('parts') if isinstance(entry, dict) else None
+        for part_idx, part in enumerate(parts or []):
+            if not isinstance(part, dict) or part.get('type') != 'media':
+                continue
+            source = part.get('source')
+            if not isinstance(source, dict):
+                continue
+            url = source.get('url')
+            refs.append(
+                _MediaRef(
+                    entry_idx=entry_idx,
+                    part_idx=part_idx,
+                    url=str(url) if url else None,
+                    is_data_url=str(source.get('type', 'url')).lower() == 'data_url',
+                )
+            )
+    return tuple(refs)
+
+
+def _needs_media_prep(
+    media_refs: Sequence[_MediaRef],
+    service_preference: Optional[str],
+) -> bool:
+    """Cheap synchronous check: only Gemini needs remote media inlined as data URLs."""
+    if not media_refs or not service_preference or 'gemini' not in service_preference.lower():
+        return False
+    return any(ref.needs_download for ref in media_refs)
+
 
 async def _prepare_inline_media_for_service(
     inline_media: List[Dict[str, Any]],
     service_preference: Optional[str],
+    media_refs: Optional[Sequence[_MediaRef]] = None,
 ) -> List[Dict[str, Any]]:
+    """Inline remote media as data URLs for Gemini.
+
+    ``media_refs`` is the already coerced view of ``inline_media``, if the caller has one.
+    """
     if not inline_media or not service_preference or 'gemini' not in service_preference.lower():
         return inline_media
+    if media_refs is None:
+        media_refs = _coerce_inline_media(inline_media)
+
+    # Flatten downloadable parts into parallel arrays: the unique URLs to fetch,
+    # and for each part location the index of its URL in that list.
+    urls: List[str] = []
+    url_index: Dict[str, int] = {}
+    locations: List[Tuple[int, int, int]] = []
+    for ref in media_refs:
+        if not ref.needs_download:
+            continue
+        idx = url_index.get(ref.url)
+        if idx is None:
+            idx = url_index[ref.url] = len(urls)
+            urls.append(ref.url)
+        locations.append((ref.entry_idx, ref.part_idx, idx))
 
-    prepared: List[Dict[str, Any]] = []
-    for entry in inline_media:
-        new_entry = dict(entry)
-        parts = []
-        for part in entry.get('parts', []) if isinstance(entry, dict) else []:
-            if not isinstance(part, dict) or part.get('type') != 'media':
-                parts.append(part)
-                continue
-
-            source = part.get('source') if isinstance(part, dict) else {}
-            if not isinstance(source, dict):
-                parts.append(part)
-                continue
-
-            src_type = source.get('type', 'url').lower()
-            if src_type == 'data_url':
-                parts.append(part)
-                continue
+    if not locations:
+        return inline_media
 
-            url = source.get('url')
-            if not url:
-                parts.append(part)
-                continue
+    results = await asyncio.gather(
+        *(_download_media_to_data_url(url) for url in urls),
+        return_exceptions=True,
+    )
 
-            data_url = await _download_media_to_data_url(str(url))
-            if not data_url:
-                parts.append(part)
-                continue
+    # Copy-on-write: only entries and parts that receive a data URL are copied;
+    # everything else is shared with the caller's structure.
+    prepared: Optional[List[Dict[str, Any]]] = None
+    for entry_idx, part_idx, url_idx in locations:
+        data_url = results[url_idx]
+        if not isinstance(data_url, str) or not data_url:
+            continue
 
-            new_part = dict(part)
-            new_source = dict(source)
-            new_source['type'] = 'data_url'
-            new_source['data_url'] = data_url
-            new_source.pop('url', None)
-            new_part['source'] = new_source
-            parts.append(new_part)
+        if prepared is None:
+            prepared = list(inline_media)
+        entry = prepared[entry_idx]
+        if entry is inline_media[entry_idx]:
+            entry = copy.copy(entry)
+            entry['parts'] = list(entry['parts'])
+            prepared[entry_idx] = entry
 
-        new_entry['parts'] = parts
-        prepared.append(new_entry)
+        new_part = copy.copy(entry['parts'][part_idx])
+        new_source = copy.copy(new_part['source'])
+        new_source['type'] = 'data_url'
+        new_source['data_url'] = data_url
+        new_source.pop('url', None)
+        new_part['source'] = new_source
+        entry['parts'][part_idx] = new_part
 
-    return prepared
+    return prepared if prepared is not None else inline_media
 
 
 async def generate_guarded_reply(
@@ -272,81 +477,63 @@ async def generate_guarded_reply(
     """Generate a reply that passes basic topical guardrails."""
 
     tweet_context = _prepare_tweet_context(tweet)
-    focus_keywords = tweet_context.get("keywords") or []
+    focus_keywords = tweet_context.get("keywords") or ()
+    allowed_lower = tweet_context["tokens"].union(k.lower() for k in focus_keywords)
     banned_terms = _merge_unique(list(DEFAULT_OFF_TOPIC_TERMS) + list(banned_terms or []))
 
-    prepared_inline_media = await _prepare_inline_media_for_service(
-        list(inline_media or []),
-        llm_settings.service_preference,
-    )
+    prepared_inline_media = inline_media or []
+    # The untyped payload is validated once; the refs serve the prep check, the download and the debug log.
+    media_refs = _coerce_inline_media(prepared_inline_media)
+    if _needs_media_prep(media_refs, llm_settings.service_preference):
+        prepared_inline_media = await _prepare_inline_media_for_service(
+            prepared_inline_media,
+            llm_settings.service_preference,
+            media_refs,
+        )
 
     logger.info(
         "Reply generation request for tweet %s: style_applied=%s, media_count=%s, text_chars=%s",
         getattr(tweet, "tweet_id", "unknown"),
         bool(style_summary),
-        len(tweet_context.get("media_urls", [])),
+        len(tweet_context.get("media_urls", ())),
         len(tweet_context.get("text", "")),
     )
 
-    schema: Dict[str, Any] = {
-        "type": "object",
-        "properties": {
-            "reply_text": {
-                "type": "string",
-                "description": "Final reply under 270 characters.",
-            },
-            "is_relevant": {"type": "boolean"},
-            "relevance_reason": {
-                "type": "string",
-                "description": "Brief reason explaining relevance judgement.",
-            },
-            "referenced_topics": {
-                "type": "array",
-                "items": {"type": "string"},
-                "description": "Key topics mentioned in the reply.",
-            },
-        },
-        "required": ["reply_text", "is_relevant", "relevance_reason"],
-    }
-
     attempt = 0
     last_error: Optional[str] = None
 
+    instruction_parts = _build_instruction(
+        tweet,
+        tweet_context,
+        style_summary=style_summary,
+        persona_handle=persona_handle,
+        banned_terms=banned_terms,
+    )
+
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    media_log_labels: Optional[List[str]] = None
+    if debug_enabled and media_refs:
+        # Source labels (URL or embedded) of the media as passed in, before any inlining.
+        media_log_labels = [ref.log_label for ref in media_refs if ref.log_label]
+
     max_attempts = max(1, retry_limit)
     while attempt < max_attempts:
         feedback = last_error if attempt > 0 else None
-        instruction = _build_instruction(
-            tweet,
-            tweet_context,
-            style_summary=style_summary,
-            persona_handle=persona_handle,
-            banned_terms=banned_terms,
-            feedback=feedback,
-        )
+        instruction = _apply_feedback(instruction_parts, feedback)
 
-        logger.debug(
-            "LLM attempt %s instruction preview: %s",
-            attempt + 1,
-            instruction[:600].replace("\n", " | "),
-        )
-        if prepared_inline_media:
-            media_urls = []
-            for media in prepared_inline_media:
-                parts = media.get('parts', []) if isinstance(media, dict) else []
-                for part in parts:
-                    if isinstance(part, dict) and part.get('type') == 'media':
-                        source = part.get('source') or {}
-                        if source.get('type') == 'data_url':
-                            media_urls.append('<embedded-data-url>')
-                        else:
-                            url = source.get('url')
-                            if url:
-                                media_urls.append(str(url))
-            logger.debug("Inline media URLs for attempt %s: %s", attempt + 1, media_urls or "(none)")
+        # Previews are only built when DEBUG is on; logger.debug would still evaluate its args.
+        if debug_enabled:
+            logger.debug(
+                "LLM attempt %s instruction preview: %s",
+                attempt + 1,
+                instruction[:600].replace("\n", " | "),
+            )
+            if media_log_labels is not None:
+                logger.debug("Inline media URLs for attempt %s: %s", attempt + 1, media_log_labels or "(none)")
 
         data, err = await llm_service.generate_structured(
             task_instruction=instruction,
-            schema=schema,
+            schema=_REPLY_SCHEMA,
             service_preference=llm_settings.service_preference,
             system_prompt=system_prompt,
             model_name=llm_settings.model_name_override,
@@ -362,20 +549,20 @@ async def generate_guarded_reply(
             attempt += 1
             continue
 
-        reply_text = (data.get("reply_text") or "").strip()
-        if reply_text:
-            reply_text = reply_text[:MAX_REPLY_CHARS].rstrip()
+        raw_reply = data.get("reply_text")
+        reply_text = raw_reply.strip() if raw_reply else ""
+        # Measure before truncating: over-long replies are retried with feedback, and only
+        # the final attempt falls back to a truncated reply instead of posting nothing.
+        too_long = len(reply_text) > MAX_REPLY_CHARS
+        if too_long and attempt + 1 >= max_attempts:
+            reply_text = truncate_text(reply_text, MAX_REPLY_CHARS)
+            too_long = False
         is_relevant = bool(data.get("is_relevant"))
         relevance_reason = (data.get("relevance_reason") or "").strip()
         referenced_topics = data.get("referenced_topics") or []
 
-        flagged_terms = _find_off_topic_terms(
-            reply_text,
-            tweet_context["text"],
-            allowed_terms=focus_keywords,
-        ) if reply_text else []
+        flagged_terms = _find_off_topic_terms(reply_text, allowed_lower) if reply_text else []
 
-        too_long = bool(reply_text and len(reply_text) > MAX_REPLY_CHARS)
         missing_reply = not reply_text
 
         if missing_reply:
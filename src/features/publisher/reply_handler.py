@@ -1,44 +1,242 @@
 import logging
 import time
 import random
-from typing import Optional, Set
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Optional, Set, Tuple
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import (
+    TimeoutException,
+    ElementClickInterceptedException,
+    InvalidSelectorException,
+    StaleElementReferenceException,
+)
 
 from core.browser_manager import BrowserManager
 from data_models import ScrapedTweet, AccountConfig
+from utils.text_utils import normalize_handle, truncate_text
+from .reply_generator import MAX_REPLY_CHARS
 
 logger = logging.getLogger(__name__)
 
 
-def _normalize_handle(raw: Optional[str]) -> Optional[str]:
-    if not raw:
-        return None
-    value = str(raw).strip()
-    if not value:
-        return None
-    return value.lstrip('@').split('?')[0].strip('/').lower() or None
+# Locators are (By, selector) pairs built once at import instead of per reply.
+# CSS selectors go through the browser's native querySelector; XPath is kept
+# only where CSS cannot express the match (text content).
+_REPLY_ICON_LOCATOR = (By.CSS_SELECTOR, "button[data-testid='reply']")
+_DIALOG_LOCATOR = (By.CSS_SELECTOR, "div[role='dialog'][aria-modal='true']")
+_TEXTBOX_LOCATOR = (By.CSS_SELECTOR, "div[data-testid='tweetTextarea_0'][role='textbox']")
+_TEXTAREA_LOCATOR = (By.CSS_SELECTOR, "div[data-testid='tweetTextarea_0']")
+_POST_BUTTON_LOCATOR = (By.CSS_SELECTOR, "button[data-testid='tweetButton']")
+_COMPOSER_MASK_LOCATOR = (By.CSS_SELECTOR, "[data-testid='twc-cc-mask']")
+_SUBMIT_ERROR_LOCATOR = (
+    By.XPATH,
+    "//*[contains(., 'Try again') or contains(., 'rate limit') or contains(., 'over the limit') or contains(., 'went wrong')]",
+)
+
+_COLLECT_REPLY_LINKS_JS = """
+var needle = arguments[0], out = [];
+var anchors = document.querySelectorAll("article[role='article'] a[role='link'][href*='/status/']");
+for (var i = 0; i < anchors.length; i++) {
+  var href = anchors[i].href;
+  if (href && href.indexOf(needle) !== -1 && out.indexOf(href) === -1) out.push(href);
+}
+return out;
+"""
+
+# Long-polls in the page for a reply link by our handle that was not there before.
+# Resolves to the new href, or null once the deadline passes.
+_AWAIT_NEW_REPLY_LINK_JS = """
+var needle = arguments[0], existing = new Set(arguments[1]), deadline = Date.now() + arguments[2];
+var done = arguments[arguments.length - 1];
+(function poll() {
+  var anchors = document.querySelectorAll("article[role='article'] a[role='link'][href*='/status/']");
+  for (var i = 0; i < anchors.length; i++) {
+    var href = anchors[i].href;
+    if (href && href.indexOf(needle) !== -1 && !existing.has(href)) { done(href); return; }
+  }
+  if (Date.now() > deadline) { done(null); return; }
+  setTimeout(poll, 150);
+})();
+"""
+
+# Counts in-flight fetch/XHR requests in window.__pendingRequests. Registered via
+# CDP so it runs before the page's own scripts on every navigation. It patches
+# page globals a site can detect, so it is opt-in (browser_settings.track_network_idle).
+_REQUEST_TRACKER_JS = """
+(function () {
+  if (window.__pendingRequests !== undefined) return;
+  window.__pendingRequests = 0;
+  var settle = function () { window.__pendingRequests = Math.max(0, window.__pendingRequests - 1); };
+  var originalFetch = window.fetch;
+  if (originalFetch) {
+    window.fetch = function () {
+      window.__pendingRequests++;
+      return originalFetch.apply(this, arguments).finally(settle);
+    };
+  }
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    window.__pendingRequests++;
+    this.addEventListener('loadend', settle, {once: true});
+    return originalSend.apply(this, arguments);
+  };
+})();
+"""
+_PENDING_REQUESTS_JS = "return window.__pendingRequests === undefined ? null : window.__pendingRequests;"
+# Long-lived or periodic requests can keep the counter above zero; never wait on it for long.
+_NETWORK_IDLE_TIMEOUT_SECONDS = 1.5
+_TRACKED_DRIVERS: "weakref.WeakSet" = weakref.WeakSet()
+
+# Types the reply and clicks Post inside the page, so the happy path costs one
+# WebDriver round-trip. execCommand('insertText') fires the beforeinput/input
+# events the composer's editor listens to. Resolves to {typed, clicked}.
+_TYPE_AND_SUBMIT_JS = """
+var textarea = arguments[0], scope = arguments[1] || document, text = arguments[2];
+var done = arguments[arguments.length - 1];
+var squash = function (value) { return (value || '').replace(/\\s+/g, ' ').trim(); };
+try {
+  textarea.focus();
+  document.execCommand('selectAll', false, null);
+  document.execCommand('delete', false, null);
+  document.execCommand('insertText', false, text);
+} catch (e) {
+  done({typed: false, clicked: false});
+  return;
+}
+if (squash(textarea.textContent) !== squash(text)) {
+  try {
+    document.execCommand('selectAll', false, null);
+    document.execCommand('delete', false, null);
+  } catch (e) {}
+  done({typed: false, clicked: false});
+  return;
+}
+var deadline = Date.now() + 3000;
+(function poll() {
+  var button = scope.querySelector("button[data-testid='tweetButton']");
+  var mask = document.querySelector("[data-testid='twc-cc-mask']");
+  if (button && !mask && !button.disabled && button.getAttribute('aria-disabled') !== 'true') {
+    button.scrollIntoView({block: 'center'});
+    button.click();
+    done({typed: true, clicked: true});
+  } else if (Date.now() > deadline) {
+    done({typed: true, clicked: false});
+  } else {
+    setTimeout(poll, 100);
+  }
+})();
+"""
+
+
+@dataclass
+class _ElementCache:
+    """WebElements resolved once per reply; re-located only after they go stale."""
+
+    dialog: Optional[WebElement] = None
+    textarea: Optional[WebElement] = None
+    post_button: Optional[WebElement] = None
+
+
+@lru_cache(maxsize=128)
+def _main_tweet_locator(tweet_id: str) -> Tuple[str, str]:
+    return (By.CSS_SELECTOR, f"article:has(a[href*='/status/{tweet_id}'])")
+
+
+@lru_cache(maxsize=128)
+def _main_tweet_xpath_locator(tweet_id: str) -> Tuple[str, str]:
+    # Fallback for browsers without CSS :has() support.
+    return (By.XPATH, f"//article[.//a[contains(@href, '/status/{tweet_id}')]]")
+
+
+@lru_cache(maxsize=64)
+def _own_handles(
+    account_id: Optional[str],
+    self_handles: Tuple[str, ...],
+    detected_handle: Optional[str],
+) -> FrozenSet[str]:
+    """Normalized handles of the replying account; cached across replies in a run."""
+    candidates = (*self_handles, account_id, detected_handle)
+    return frozenset(filter(None, (normalize_handle(handle) for handle in candidates)))
 
 
 def _collect_existing_reply_links(driver, handle: str) -> Set[str]:
     if not handle:
         return set()
-    xpath = (
-        f"//article[@role='article']//a[contains(@href, '/{handle}/status/') and contains(@href, '/status/') and @role='link']"
-    )
-    links: Set[str] = set()
+    # Filter in the page and return plain hrefs: one round-trip instead of one per anchor.
     try:
-        for anchor in driver.find_elements(By.XPATH, xpath):
-            href = anchor.get_attribute('href')
-            if href and f"/{handle}/status/" in href:
-                links.add(href)
+        hrefs = driver.execute_script(_COLLECT_REPLY_LINKS_JS, f"/{handle}/status/")
     except Exception:
         return set()
-    return links
+    return set(hrefs or [])
+
+
+def _await_new_reply_link(driver, handle: str, existing: Set[str], timeout: float) -> Optional[str]:
+    """Return the href of a newly posted reply by ``handle``, or None after ``timeout`` seconds.
+
+    Runs as one in-page long-poll; falls back to polling from Python if async
+    scripts are unavailable or the session's script timeout is too short.
+    """
+    try:
+        return driver.execute_async_script(
+            _AWAIT_NEW_REPLY_LINK_JS, f"/{handle}/status/", list(existing), int(timeout * 1000)
+        )
+    except Exception as js_error:
+        logger.debug(f"In-page reply confirmation unavailable: {js_error}")
+    try:
+        new_links = WebDriverWait(driver, timeout).until(
+            lambda d: _collect_existing_reply_links(d, handle) - existing
+        )
+    except TimeoutException:
+        return None
+    return next(iter(new_links))
+
+
+def _install_request_tracker(driver) -> None:
+    """Register the fetch/XHR counter once per Chromium session; no-op elsewhere."""
+    if driver in _TRACKED_DRIVERS or not hasattr(driver, 'execute_cdp_cmd'):
+        return
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': _REQUEST_TRACKER_JS})
+        _TRACKED_DRIVERS.add(driver)
+    except Exception as cdp_error:
+        logger.debug(f"CDP request tracker unavailable: {cdp_error}")
+
+
+def _wait_for_composer_idle(driver, network_idle: bool = False, timeout: float = 5) -> None:
+    """Wait for the composer mask to clear; with network_idle, also briefly for fetch/XHR to settle."""
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.invisibility_of_element_located(_COMPOSER_MASK_LOCATOR)
+        )
+    except Exception:
+        pass
+    if not network_idle:
+        return
+    try:
+        if driver.execute_script(_PENDING_REQUESTS_JS) is None:
+            return
+        WebDriverWait(driver, _NETWORK_IDLE_TIMEOUT_SECONDS, poll_frequency=0.1).until(
+            lambda d: d.execute_script(_PENDING_REQUESTS_JS) == 0
+        )
+    except Exception:
+        pass
+
+
+def _type_and_submit_via_js(driver, textarea, dialog, text: str) -> dict:
+    """Run the in-page type+submit batch; an empty dict means fall back to send_keys."""
+    try:
+        outcome = driver.execute_async_script(_TYPE_AND_SUBMIT_JS, textarea, dialog, text)
+    except Exception as js_error:
+        logger.debug(f"In-page reply submission unavailable: {js_error}")
+        return {}
+    return outcome if isinstance(outcome, dict) else {}
 
 
 def reply_to_tweet(
@@ -48,7 +246,9 @@ def reply_to_tweet(
     account_config: Optional[AccountConfig] = None,
 ) -> bool:
     driver = browser_manager.get_driver()
-    time.sleep(random.uniform(0.8, 2.2))  # Human-like jitter
+    action_config = account_config.action_config if account_config else None
+    if action_config is None or action_config.human_like_jitter:
+        time.sleep(random.uniform(0.8, 2.2))  # Human-like jitter
 
     if not original_tweet.tweet_url:
         logger.error(f"Cannot reply to tweet {original_tweet.tweet_id}: Missing tweet URL.")
@@ -61,18 +261,11 @@ def reply_to_tweet(
         f"Attempting to reply to tweet {original_tweet.tweet_id} with text: '{reply_text[:50]}...'"
     )
 
-    own_handles: Set[str] = set()
-    if account_config:
-        if account_config.self_handles:
-            own_handles.update(
-                filter(None, (_normalize_handle(handle) for handle in account_config.self_handles))
-            )
-        normalized_account_id = _normalize_handle(account_config.account_id)
-        if normalized_account_id:
-            own_handles.add(normalized_account_id)
-    detected_handle = _normalize_handle(getattr(browser_manager, 'logged_in_handle', None))
-    if detected_handle:
-        own_handles.add(detected_handle)
+    own_handles = _own_handles(
+        account_config.account_id if account_config else None,
+        tuple(account_config.self_handles or ()) if account_config else (),
+        getattr(browser_manager, 'logged_in_handle', None),
+    )
 
     primary_handle = next(iter(own_handles)) if own_handles else None
     pre_existing_replies: Set[str] = set()
@@ -82,44 +275,51 @@ def reply_to_tweet(
         except Exception:
             pre_existing_replies = set()
 
+    browser_settings = getattr(browser_manager, 'browser_settings', None) or {}
+    track_network_idle = bool(browser_settings.get('track_network_idle', False))
+
     try:
+        if track_network_idle:
+            _install_request_tracker(driver)
         browser_manager.navigate_to(str(original_tweet.tweet_url))
-        time.sleep(3)
 
-        main_tweet_article_xpath = (
-            f"//article[.//a[contains(@href, '/status/{original_tweet.tweet_id}')]]"
-        )
-        main_tweet_element = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.XPATH, main_tweet_article_xpath))
-        )
+        tweet_id = str(original_tweet.tweet_id)
+        try:
+            main_tweet_element = WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located(_main_tweet_locator(tweet_id))
+            )
+        except InvalidSelectorException:
+            main_tweet_element = WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located(_main_tweet_xpath_locator(tweet_id))
+            )
 
         reply_icon_button = WebDriverWait(main_tweet_element, 10).until(
-            EC.element_to_be_clickable((By.XPATH, ".//button[@data-testid='reply']"))
+            EC.element_to_be_clickable(_REPLY_ICON_LOCATOR)
         )
         reply_icon_button.click()
         logger.info(f"Clicked reply icon for tweet {original_tweet.tweet_id}.")
-        time.sleep(2)
 
-        dialog = None
+        elements = _ElementCache()
         try:
-            dialog = WebDriverWait(driver, 12).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@role='dialog' and @aria-modal='true']"))
+            elements.dialog = WebDriverWait(driver, 12).until(
+                EC.presence_of_element_located(_DIALOG_LOCATOR)
             )
         except TimeoutException:
-            dialog = None
+            elements.dialog = None
+        dialog = elements.dialog
 
         reply_text_area = None
         search_scopes = []
         if dialog is not None:
-            search_scopes.append((dialog, ".//div[@data-testid='tweetTextarea_0' and @role='textbox']"))
-        search_scopes.append((driver, "//div[@data-testid='tweetTextarea_0' and @role='textbox']"))
-        search_scopes.append((driver, "//div[@data-testid='tweetTextarea_0']"))
+            search_scopes.append((dialog, _TEXTBOX_LOCATOR))
+        search_scopes.append((driver, _TEXTBOX_LOCATOR))
+        search_scopes.append((driver, _TEXTAREA_LOCATOR))
 
         last_error = None
-        for scope, xpath in search_scopes:
+        for scope, locator in search_scopes:
             try:
                 reply_text_area = WebDriverWait(scope, 18).until(
-                    EC.presence_of_element_located((By.XPATH, xpath))
+                    EC.presence_of_element_located(locator)
                 )
                 break
             except Exception as err:
@@ -127,49 +327,63 @@ def reply_to_tweet(
                 continue
         if not reply_text_area:
             raise TimeoutException(f"Reply textarea not found. Last error: {last_error}")
+        elements.textarea = reply_text_area
 
-        try:
-            reply_text_area.click()
-            reply_text_area.send_keys(Keys.CONTROL, "a")
-            reply_text_area.send_keys(Keys.BACKSPACE)
-        except Exception:
-            pass
-
-        safe_reply = (reply_text or "")[:270]
-        reply_text_area.send_keys(safe_reply)
-        logger.info("Typed reply text into textarea.")
-
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.invisibility_of_element_located((By.CSS_SELECTOR, "[data-testid='twc-cc-mask']"))
-            )
-        except Exception:
-            pass
-
-        def find_enabled_reply_button():
-            try:
-                scope = dialog if dialog is not None else driver
-                button = scope.find_element(
-                    By.XPATH,
-                    ".//button[@data-testid='tweetButton' and not(@disabled) and not(@aria-disabled='true')]",
-                )
-                return button
-            except Exception:
-                return None
+        safe_reply = truncate_text(reply_text, MAX_REPLY_CHARS)
+        js_outcome = _type_and_submit_via_js(driver, reply_text_area, dialog, safe_reply)
+        submission_attempted = bool(js_outcome.get('clicked'))
 
-        reply_post_button = None
-        for _ in range(3):
-            reply_post_button = find_enabled_reply_button()
-            if reply_post_button:
-                break
+        if js_outcome.get('typed'):
+            logger.info("Typed reply text into textarea.")
+        else:
             try:
-                reply_text_area.send_keys(" ")
+                reply_text_area.click()
+                reply_text_area.send_keys(Keys.CONTROL, "a")
                 reply_text_area.send_keys(Keys.BACKSPACE)
             except Exception:
                 pass
-            time.sleep(0.5)
 
-        submission_attempted = False
+            reply_text_area.send_keys(safe_reply)
+            logger.info("Typed reply text into textarea.")
+
+        if not submission_attempted:
+            _wait_for_composer_idle(driver, network_idle=track_network_idle)
+
+        def find_enabled_reply_button():
+            # Locate the button once, then only re-read its state on later checks.
+            for _ in range(2):
+                try:
+                    if elements.post_button is None:
+                        scope = dialog if dialog is not None else driver
+                        elements.post_button = scope.find_element(*_POST_BUTTON_LOCATOR)
+                    button = elements.post_button
+                    if button.get_attribute('aria-disabled') == 'true' or not button.is_enabled():
+                        return None
+                    return button
+                except StaleElementReferenceException:
+                    elements.post_button = None
+                except Exception:
+                    return None
+            return None
+
+        reply_post_button = None
+        if not submission_attempted:
+            # The button usually enables within a few hundred ms of typing; poll its state
+            # and only nudge the editor (space + backspace) if it stays disabled.
+            for nudge in (False, True):
+                if nudge:
+                    try:
+                        reply_text_area.send_keys(" ")
+                        reply_text_area.send_keys(Keys.BACKSPACE)
+                    except Exception:
+                        pass
+                try:
+                    reply_post_button = WebDriverWait(driver, 1.5, poll_frequency=0.1).until(
+                        lambda _: find_enabled_reply_button()
+                    )
+                    break
+                except TimeoutException:
+                    reply_post_button = None
 
         if reply_post_button:
             try:
@@ -208,18 +422,14 @@ def reply_to_tweet(
             except Exception as first_keyboard_error:
                 logger.warning(f"Failed Ctrl+Enter submit attempt: {first_keyboard_error}")
                 try:
-                    new_dialog = None
                     try:
-                        new_dialog = WebDriverWait(driver, 6).until(
-                            EC.presence_of_element_located((By.XPATH, "//div[@role='dialog' and @aria-modal='true']"))
+                        elements.textarea.send_keys(Keys.ENTER)
+                    except StaleElementReferenceException:
+                        # The composer re-rendered; look the textarea up again once.
+                        elements.textarea = WebDriverWait(driver, 6).until(
+                            EC.presence_of_element_located(_TEXTAREA_LOCATOR)
                         )
-                    except Exception:
-                        new_dialog = None
-                    new_scope = new_dialog if new_dialog is not None else driver
-                    new_textarea = WebDriverWait(new_scope, 6).until(
-                        EC.presence_of_element_located((By.XPATH, "//div[@data-testid='tweetTextarea_0']"))
-                    )
-                    new_textarea.send_keys(Keys.ENTER)
+                        elements.textarea.send_keys(Keys.ENTER)
                     submission_attempted = True
                 except Exception as second_keyboard_error:
                     logger.error(
@@ -235,10 +445,7 @@ def reply_to_tweet(
 
         try:
             error_candidate = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((
-                    By.XPATH,
-                    "//*[contains(., 'Try again') or contains(., 'rate limit') or contains(., 'over the limit') or contains(., 'went wrong')]",
-                ))
+                EC.presence_of_element_located(_SUBMIT_ERROR_LOCATOR)
             )
             logger.warning(
                 f"Reply may have failed due to platform limits or errors: {(error_candidate.text or '').strip()}"
@@ -250,30 +457,22 @@ def reply_to_tweet(
             if dialog is not None:
                 WebDriverWait(driver, 10).until(EC.staleness_of(dialog))
         except Exception:
-            time.sleep(2)
-
-        time.sleep(random.uniform(1.2, 2.6))
+            pass
 
         if primary_handle:
-            try:
-                WebDriverWait(driver, 12).until(
-                    lambda d: _collect_existing_reply_links(d, primary_handle) - pre_existing_replies
-                )
+            if _await_new_reply_link(driver, primary_handle, pre_existing_replies, 12):
                 logger.info("Detected new reply from our account in conversation thread.")
                 return True
-            except TimeoutException:
-                logger.warning("Could not confirm reply appearance in-thread; refreshing once to verify.")
-                try:
-                    driver.refresh()
-                    time.sleep(4)
-                    new_links = _collect_existing_reply_links(driver, primary_handle)
-                    if new_links - pre_existing_replies:
-                        logger.info("Reply confirmed after refresh.")
-                        return True
-                except Exception as refresh_error:
-                    logger.error(f"Refresh verification failed: {refresh_error}")
-                logger.error("Reply not detected after verification attempts.")
-                return False
+            logger.warning("Could not confirm reply appearance in-thread; refreshing once to verify.")
+            try:
+                driver.refresh()
+                if _await_new_reply_link(driver, primary_handle, pre_existing_replies, 8):
+                    logger.info("Reply confirmed after refresh.")
+                    return True
+            except Exception as refresh_error:
+                logger.error(f"Refresh verification failed: {refresh_error}")
+            logger.error("Reply not detected after verification attempts.")
+            return False
 
         return True
     except TimeoutException as timeout_error:
@@ -1,29 +1,24 @@
 """Helpers for constructing concise per-account style snapshots."""
 from __future__ import annotations
 
+import heapq
+import re
 from datetime import datetime, timezone
 from typing import Iterable, List, Sequence, Tuple, Dict, Any, Set
 
 from data_models import ScrapedTweet
 from utils.text_utils import (
-    extract_keywords_from_texts,
-    infer_tone_from_samples,
+    analyze_texts,
     estimate_media_usage_ratio,
+    normalize_handle,
 )
 
 
-def _normalize_handle(value: str | None) -> str | None:
-    if not value:
-        return None
-    text = str(value).strip().lstrip("@")
-    if not text:
-        return None
-    text = text.split("?")[0].strip("/")
-    if text.lower().startswith("https://"):
-        parts = text.split("x.com/")
-        if len(parts) > 1:
-            text = parts[-1]
-    return text.lower() or None
+_WHITESPACE_RE = re.compile(r"\s+")
+_STYLE_CONTEXT_HEADER = "Recent personal posting snapshot:\n"
+_STYLE_CONTEXT_MAX_CHARS = 800
+# Snippets keep 220 chars; collapsing whitespace in a bounded prefix is enough.
+_SNIPPET_SCAN_CHARS = 500
 
 
 def filter_to_self_posts(
@@ -34,17 +29,27 @@ def filter_to_self_posts(
 ) -> List[ScrapedTweet]:
     allowed: Set[str] = {
         handle
-        for handle in (_normalize_handle(h) for h in candidate_handles)
+        for handle in (normalize_handle(h) for h in candidate_handles)
         if handle
     }
     if not allowed:
         return list(tweets)
 
-    filtered = [
-        tweet
-        for tweet in tweets
-        if _normalize_handle(tweet.user_handle) in allowed
-    ]
+    # Tweets usually come from a handful of authors: resolve each raw handle once,
+    # and stop as soon as the remaining tweets can no longer reach ``minimum``.
+    membership: Dict[Any, bool] = {}
+    filtered: List[ScrapedTweet] = []
+    remaining = len(tweets)
+    for tweet in tweets:
+        remaining -= 1
+        raw_handle = tweet.user_handle
+        is_self = membership.get(raw_handle)
+        if is_self is None:
+            is_self = membership[raw_handle] = normalize_handle(raw_handle) in allowed
+        if is_self:
+            filtered.append(tweet)
+        elif len(filtered) + remaining < minimum:
+            break
     if len(filtered) >= minimum:
         return filtered
     # Not enough self-authored posts; fall back to mixed list rather than returning empty.
@@ -63,74 +68,79 @@ def build_style_snapshot(
 
     relevant_tweets = filter_to_self_posts(tweets, candidate_handles)
 
+    # Dedup while streaming and keep only the newest max_items without a full sort.
+    epoch_guard = datetime.min.replace(tzinfo=timezone.utc)
     seen_ids: Set[str] = set()
-    deduped: List[ScrapedTweet] = []
-    for tweet in relevant_tweets:
-        tweet_id = getattr(tweet, "tweet_id", None)
-        if not tweet_id or tweet_id in seen_ids:
-            continue
-        seen_ids.add(tweet_id)
-        deduped.append(tweet)
-
-    if not deduped:
+    candidates = (
+        tweet
+        for tweet in relevant_tweets
+        if tweet.tweet_id
+        and not (tweet.tweet_id in seen_ids or seen_ids.add(tweet.tweet_id))
+    )
+    selected = heapq.nlargest(
+        max_items,
+        candidates,
+        key=lambda t: t.created_at or epoch_guard,
+    )
+
+    if not selected:
         return "", {}
 
-    epoch_guard = datetime.min.replace(tzinfo=timezone.utc)
-    deduped.sort(key=lambda t: getattr(t, "created_at", None) or epoch_guard, reverse=True)
-    selected = deduped[:max_items]
-
     context_lines: List[str] = []
+    # Length of header + joined lines so far; once past the budget, further lines would be truncated away.
+    context_len = len(_STYLE_CONTEXT_HEADER) - 1
     memory_entries: List[Dict[str, Any]] = []
     media_entries = 0
 
     for idx, tweet in enumerate(selected, start=1):
-        text_raw = getattr(tweet, "text_content", "") or ""
-        snippet = " ".join(text_raw.split())[:220]
-        created_at = getattr(tweet, "created_at", None)
+        text_raw = tweet.text_content or ""
+        snippet = _WHITESPACE_RE.sub(" ", text_raw[:_SNIPPET_SCAN_CHARS]).strip()[:220]
+        created_at = tweet.created_at
         if created_at:
             try:
                 created_at_utc = created_at.astimezone(timezone.utc)
             except Exception:
                 created_at_utc = created_at
-            timestamp_label = created_at_utc.strftime("%Y-%m-%d %H:%M UTC")
+            # Format once; the display label is a slice of the ISO string ("YYYY-MM-DD HH:MM").
             timestamp_iso = created_at_utc.isoformat()
+            timestamp_label = f"{timestamp_iso[:10]} {timestamp_iso[11:16]} UTC"
         else:
             timestamp_label = "Unknown time"
             timestamp_iso = None
 
         media_urls = [
             str(url)
-            for url in (getattr(tweet, "embedded_media_urls", []) or [])
+            for url in (tweet.embedded_media_urls or [])
             if url
         ]
         has_media = bool(media_urls)
         if has_media:
             media_entries += 1
 
-        context_lines.append(
-            f"{idx}. {timestamp_label} | {snippet}"
-        )
+        if context_len <= _STYLE_CONTEXT_MAX_CHARS:
+            line = f"{idx}. {timestamp_label} | {snippet}"
+            context_lines.append(line)
+            context_len += 1 + len(line)
         memory_entries.append(
             {
-                "tweet_id": getattr(tweet, "tweet_id", None),
-                "url": str(getattr(tweet, "tweet_url", "")) or None,
+                "tweet_id": tweet.tweet_id,
+                "url": str(tweet.tweet_url) if tweet.tweet_url else None,
                 "created_at": timestamp_iso,
-                "likes": getattr(tweet, "like_count", 0) or 0,
-                "retweets": getattr(tweet, "retweet_count", 0) or 0,
-                "replies": getattr(tweet, "reply_count", 0) or 0,
-                "views": getattr(tweet, "view_count", 0) or 0,
+                "likes": tweet.like_count or 0,
+                "retweets": tweet.retweet_count or 0,
+                "replies": tweet.reply_count or 0,
+                "views": tweet.view_count or 0,
                 "text": snippet,
                 "media_urls": media_urls,
             }
         )
 
-    style_context_text = "Recent personal posting snapshot:\n" + "\n".join(context_lines)
-    if len(style_context_text) > 800:
-        style_context_text = style_context_text[:800].rstrip() + "…"
+    style_context_text = _STYLE_CONTEXT_HEADER + "\n".join(context_lines)
+    if len(style_context_text) > _STYLE_CONTEXT_MAX_CHARS:
+        style_context_text = style_context_text[:_STYLE_CONTEXT_MAX_CHARS].rstrip() + "…"
 
     texts = [entry["text"] for entry in memory_entries if entry.get("text")]
-    keywords = extract_keywords_from_texts(texts, max_keywords=8)
-    tone = infer_tone_from_samples(texts)
+    keywords, tone = analyze_texts(texts, max_keywords=8)
     media_ratio = estimate_media_usage_ratio(media_entries, len(memory_entries))
 
     summary_lines = []
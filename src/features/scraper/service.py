@@ -1,9 +1,10 @@
+import asyncio
 import os
 import logging
 import sys
 import time
 import random
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, List, Optional
 
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
@@ -51,6 +52,8 @@ class TweetScraper:
         )
         self.scroll_delay_min = self.scrape_settings.get("scroll_delay_min_seconds", 1.5)
         self.scroll_delay_max = self.scrape_settings.get("scroll_delay_max_seconds", 3.5)
+        # Scrolls run in worker threads; a per-scraper generator keeps accounts off the shared one
+        self._rng = random.Random()
         self.no_new_tweets_scroll_limit = self.scrape_settings.get(
             "no_new_tweets_scroll_limit", 5
         )
@@ -69,6 +72,16 @@ class TweetScraper:
         max_tweets: Optional[int] = None,
         stop_if_no_new_tweets_count: Optional[int] = None,
     ) -> List[ScrapedTweet]:
+        return list(self.iter_tweets_from_url(url, search_type, max_tweets, stop_if_no_new_tweets_count))
+
+    def iter_tweets_from_url(
+        self,
+        url: str,
+        search_type: str,
+        max_tweets: Optional[int] = None,
+        stop_if_no_new_tweets_count: Optional[int] = None,
+    ) -> Iterator[ScrapedTweet]:
+        """Yield tweets from ``url`` as they are parsed, scrolling until ``max_tweets`` are found."""
         if max_tweets is None:
             max_tweets = self.default_max_tweets
         if max_tweets is None:
@@ -87,14 +100,14 @@ class TweetScraper:
         self.browser_manager.navigate_to(url)
         time.sleep(5)
 
-        scraped_tweets: List[ScrapedTweet] = []
+        found = 0
         seen_tweet_ids = set()
         scroll_attempts_with_no_new_tweets = 0
 
         progress = Progress(int(max_tweets), description=f"Scraping {search_type}", unit="tweets")
         progress.set_progress(0, status_message="Starting")
 
-        while len(scraped_tweets) < int(max_tweets):
+        while found < int(max_tweets):
             try:
                 tweet_card_elements = self._get_tweet_cards_from_page()
                 if not tweet_card_elements:
@@ -108,12 +121,12 @@ class TweetScraper:
                         break
                     if not self.scroller.scroll_page():
                         break
-                    time.sleep(random.uniform(self.scroll_delay_min, self.scroll_delay_max))
+                    time.sleep(self._rng.uniform(self.scroll_delay_min, self.scroll_delay_max))
                     continue
 
                 new_tweets_found_this_scroll = 0
                 for card_el in tweet_card_elements:
-                    if len(scraped_tweets) >= int(max_tweets):
+                    if found >= int(max_tweets):
                         break
 
                     parsed_tweet = parse_tweet_card(card_el, logger)
@@ -136,14 +149,15 @@ class TweetScraper:
                             "Could not scroll tweet card into view: %s", scroll_err
                         )
 
-                    scraped_tweets.append(parsed_tweet)
+                    found += 1
                     if tweet_id_str:
                         seen_tweet_ids.add(tweet_id_str)
                     new_tweets_found_this_scroll += 1
                     progress.set_progress(
-                        len(scraped_tweets),
-                        status_message=f"Found {len(scraped_tweets)}",
+                        found,
+                        status_message=f"Found {found}",
                     )
+                    yield parsed_tweet
 
                 if new_tweets_found_this_scroll == 0:
                     scroll_attempts_with_no_new_tweets += 1
@@ -163,7 +177,7 @@ class TweetScraper:
                     )
                     break
 
-                if len(scraped_tweets) >= int(max_tweets):
+                if found >= int(max_tweets):
                     logger.info("Reached max_tweets (%s) for %s.", max_tweets, url)
                     break
 
@@ -171,7 +185,7 @@ class TweetScraper:
                     logger.info("End of page or scroll error for %s.", url)
                     break
 
-                time.sleep(random.uniform(self.scroll_delay_min, self.scroll_delay_max))
+                time.sleep(self._rng.uniform(self.scroll_delay_min, self.scroll_delay_max))
 
             except TimeoutException:
                 logger.warning("Timeout during tweet scraping for %s. May proceed with fewer tweets.", url)
@@ -184,9 +198,8 @@ class TweetScraper:
                 logger.error("Unhandled exception during scraping %s: %s", url, e, exc_info=True)
                 break
 
-        progress.finish(final_message=f"Found {len(scraped_tweets)} tweets.")
-        logger.info("Finished scraping for %s. Found %s tweets.", url, len(scraped_tweets))
-        return scraped_tweets
+        progress.finish(final_message=f"Found {found} tweets.")
+        logger.info("Finished scraping for %s. Found %s tweets.", url, found)
 
     def scrape_tweets_by_keyword(self, keyword: str, max_tweets: Optional[int] = None) -> List[ScrapedTweet]:
         search_url = f"https://x.com/search?q={keyword.replace(' ', '%20')}&f=live"
@@ -204,6 +217,35 @@ class TweetScraper:
         """Scrape tweets from the logged-in account's home timeline."""
         return self.scrape_tweets_from_url("https://x.com/home", "home", max_tweets)
 
+    async def stream_tweets_from_url(
+        self,
+        url: str,
+        search_type: str,
+        max_tweets: Optional[int] = None,
+    ) -> AsyncIterator[ScrapedTweet]:
+        """Async variant of scrape_tweets_from_url that yields each tweet as soon as it is parsed.
+
+        The blocking Selenium work runs in a worker thread, one tweet at a time.
+        """
+        tweets = self.iter_tweets_from_url(url, search_type, max_tweets)
+        while True:
+            tweet = await asyncio.to_thread(next, tweets, None)
+            if tweet is None:
+                break
+            yield tweet
+
+    def stream_tweets_by_keyword(self, keyword: str, max_tweets: Optional[int] = None) -> AsyncIterator[ScrapedTweet]:
+        """Async variant of scrape_tweets_by_keyword; see stream_tweets_from_url."""
+        search_url = f"https://x.com/search?q={keyword.replace(' ', '%20')}&f=live"
+        return self.stream_tweets_from_url(search_url, "keyword", max_tweets)
+
+    def stream_tweets_from_profile(self, profile_url: str, max_tweets: Optional[int] = None) -> AsyncIterator[ScrapedTweet]:
+        return self.stream_tweets_from_url(profile_url, "profile", max_tweets)
+
+    def stream_home_timeline(self, max_tweets: Optional[int] = None) -> AsyncIterator[ScrapedTweet]:
+        """Async variant of scrape_home_timeline; see stream_tweets_from_url."""
+        return self.stream_tweets_from_url("https://x.com/home", "home", max_tweets)
+
 
 if __name__ == "__main__":
     # The interactive example runner previously in the monolith can be re-added here if desired.
@@ -1,12 +1,16 @@
 import asyncio
 import logging
+import multiprocessing
 import sys
 import os
 import time
+import heapq
 import random
-from datetime import datetime, timezone, timedelta
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 # Ensure src directory is in Python path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -16,13 +20,15 @@ from core.browser_manager import BrowserManager
 from core.llm_service import LLMService
 from utils.logger import setup_logger
 from utils.file_handler import FileHandler
+from utils.text_utils import normalize_for_dedupe, normalize_handle, truncate_text
 from data_models import AccountConfig, TweetContent, LLMSettings, ScrapedTweet, ActionConfig
 from features.scraper import TweetScraper
 from features.publisher import TweetPublisher
-from features.publisher.reply_generator import generate_guarded_reply, should_apply_style_profile
+from features.publisher.reply_generator import MAX_REPLY_CHARS, generate_guarded_reply, should_apply_style_profile
 from features.publisher.style_utils import build_style_snapshot
 from features.engagement import TweetEngagement
 from features.analyzer import TweetAnalyzer
+from features.analyzer.heuristics import keyword_relevance_score
 from utils.metrics import MetricsRecorder
 
 # Initialize main config loader and logger
@@ -31,7 +37,78 @@ main_config_loader = ConfigLoader()
 setup_logger(main_config_loader)
 logger = logging.getLogger(__name__)
 
+# Reply prompts for keyword and community replies; filled in only for tweets that pass every filter.
+_KEYWORD_REPLY_PROMPT = (
+    "TASK: Write a concise, natural reply under 270 characters that is DIRECTLY RELEVANT to this tweet. "
+    "{thread_context}{media_context}\n\n"
+    "Tweet by @{handle}:\n"
+    "\"{text}\"\n\n"
+    "Your reply (stay on-topic, avoid hashtags/links/emojis):"
+)
+_COMMUNITY_REPLY_PROMPT = (
+    "TASK: Write a concise, natural reply under 270 characters that is DIRECTLY RELEVANT to this community post.{media_context}\n\n"
+    "Post by @{handle}:\n\"{text}\"\n\n"
+    "Your reply (stay on-topic, avoid hashtags/links/emojis):"
+)
+
+
+def _reply_media_context(tweet: ScrapedTweet, label: str):
+    """Return (prompt media note, inline media messages) for up to four of the tweet's media URLs."""
+    media_urls = tweet.embedded_media_urls
+    if not media_urls:
+        return "", []
+    inline_media = [
+        {
+            'role': 'user',
+            'parts': [
+                {'type': 'text', 'text': label},
+                {'type': 'media', 'media_type': 'image', 'source': {'type': 'url', 'url': str(media_url)}},
+            ],
+        }
+        for media_url in media_urls[:4]
+    ]
+    return f"\n[This tweet contains {len(media_urls)} media item(s)]", inline_media
+
+
+class _ActionPacer:
+    """Keeps a randomized human-like gap between one account's actions.
+
+    The gap is measured from the previous action, so scraping, scoring and LLM work done
+    in between counts toward it instead of being added on top of a fixed sleep.
+    """
+
+    def __init__(self, min_delay: float, max_delay: float, rng: Optional[random.Random] = None):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        # Each pacer owns its generator, so concurrent accounts never share jitter state
+        self._rng = rng or random.Random()
+        self._ready_at = 0.0
+
+    def mark(self, scale: float = 1.0) -> None:
+        """Record an action; the next one may start after a fresh random delay."""
+        self._ready_at = time.monotonic() + self._rng.uniform(self.min_delay * scale, self.max_delay * scale)
+
+    async def wait(self) -> None:
+        """Sleep only for whatever remains of the delay since the last action."""
+        remaining = self._ready_at - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+
 class TwitterOrchestrator:
+    # Bound on memoized thread/relevance analyses shared across profiles, searches and accounts
+    _ANALYSIS_CACHE_SIZE = 1024
+    # Relevance filter settings per pipeline:
+    # (account enable field, analysis_config enable key, default, account threshold field, thresholds key, default)
+    _RELEVANCE_GATE_SETTINGS = {
+        'reply': ('enable_relevance_filter_keyword_replies', 'keyword_replies', False,
+                  'relevance_threshold_keyword_replies', 'keyword_replies_min', 0.35),
+        'like': ('enable_relevance_filter_likes', 'likes', True,
+                 'relevance_threshold_likes', 'likes_min', 0.3),
+        'competitor_repost': ('enable_relevance_filter_competitor_reposts', 'competitor_reposts', True,
+                              'relevance_threshold_competitor_reposts', 'competitor_reposts_min', 0.35),
+    }
+
     def __init__(self):
         self.config_loader = main_config_loader
         self.file_handler = FileHandler(self.config_loader)
@@ -43,53 +120,153 @@ class TwitterOrchestrator:
         ta = self.global_settings.get('twitter_automation', {})
         self.analysis_config = ta.get('analysis_config', {})
         self.engagement_decision_cfg = ta.get('engagement_decision', {"enabled": False})
+        # LRU of analysis futures; concurrent requests for the same tweet share one LLM call
+        self._analysis_cache: "OrderedDict[tuple, asyncio.Future]" = OrderedDict()
+        # Created on first use and shared by every account, so provider clients and their
+        # connection pools are set up once per process
+        self._llm_service: Optional[LLMService] = None
+
+    def _shared_llm_service(self) -> LLMService:
+        """Return the LLM service shared by all accounts processed by this orchestrator."""
+        if self._llm_service is None:
+            self._llm_service = LLMService(config_loader=self.config_loader)
+        return self._llm_service
 
     @staticmethod
-    def _is_own_tweet(user_handle: str, account: AccountConfig, browser_manager: BrowserManager) -> bool:
-        """Return True if the given user_handle belongs to the current account.
+    def _own_handle_set(account: AccountConfig, browser_manager: BrowserManager) -> frozenset:
+        """Return the normalized handles that identify the current account.
 
-        Compares against:
+        Includes:
         - configured account.self_handles (if provided)
         - browser_manager.logged_in_handle (if detected)
         - account.account_id (as last-resort heuristic)
         """
+        candidates = set()
+        # Explicit self handles from config
+        for h in (account.self_handles or []):
+            if isinstance(h, str):
+                candidates.add(normalize_handle(h))
+        # Runtime-detected handle from UI
+        if getattr(browser_manager, 'logged_in_handle', None):
+            candidates.add(normalize_handle(str(browser_manager.logged_in_handle)))
+        # Heuristic fallback: account_id (in case user set it to the handle)
+        if isinstance(account.account_id, str):
+            candidates.add(normalize_handle(account.account_id))
+        candidates.discard(None)
+        return frozenset(candidates)
+
+    @staticmethod
+    def _is_own_tweet(user_handle: str, account: AccountConfig, browser_manager: BrowserManager) -> bool:
+        """Return True if the given user_handle belongs to the current account."""
         try:
-            handle = (user_handle or "").strip().lstrip('@').lower()
-            candidates = set()
-            # Explicit self handles from config
-            for h in (account.self_handles or []):
-                if isinstance(h, str) and h.strip():
-                    candidates.add(h.strip().lstrip('@').lower())
-            # Runtime-detected handle from UI
-            if getattr(browser_manager, 'logged_in_handle', None):
-                candidates.add(str(browser_manager.logged_in_handle).strip().lstrip('@').lower())
-            # Heuristic fallback: account_id (in case user set it to the handle)
-            if isinstance(account.account_id, str) and account.account_id.strip():
-                candidates.add(account.account_id.strip().lstrip('@').lower())
-            return handle in candidates and handle != ""
+            handle = normalize_handle(user_handle)
+            return handle is not None and handle in TwitterOrchestrator._own_handle_set(account, browser_manager)
         except Exception:
             return False
 
+    def _relevance_gate(self, account: AccountConfig, kind: str) -> Tuple[bool, float]:
+        """Return (enabled, threshold) for a relevance filter: account settings first, then analysis_config.
+
+        Invalid settings disable the filter.
+        """
+        enable_field, enable_key, enable_default, threshold_field, threshold_key, threshold_default = (
+            self._RELEVANCE_GATE_SETTINGS[kind]
+        )
+        acc_ac = account.action_config
+        try:
+            enabled = getattr(acc_ac, enable_field, None) if acc_ac else None
+            if enabled is None:
+                enabled = self.analysis_config.get('enable_relevance_filter', {}).get(enable_key, enable_default)
+            if not enabled:
+                return False, 0.0
+            threshold = getattr(acc_ac, threshold_field, None) if acc_ac else None
+            if threshold is None:
+                threshold = float(self.analysis_config.get('thresholds', {}).get(threshold_key, threshold_default))
+            return True, threshold
+        except Exception:
+            return False, 0.0
+
+    async def _cached_analysis(self, key: tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return compute()'s result, sharing it with every other caller of the same key.
+
+        Failed analyses are evicted so a later caller retries instead of reusing the error.
+        """
+        cache = self._analysis_cache
+        future = cache.get(key)
+        if future is None:
+            future = asyncio.ensure_future(compute())
+            cache[key] = future
+            if len(cache) > self._ANALYSIS_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        try:
+            # Shielded: cancelling one waiter must not cancel the analysis for the others.
+            return await asyncio.shield(future)
+        except Exception:
+            if cache.get(key) is future:
+                del cache[key]
+            raise
+
+    async def _flush_processed_keys_periodically(self, flush_due: asyncio.Event) -> None:
+        """Write queued processed-action keys from a worker thread every few seconds, or as soon as a batch is due."""
+        while True:
+            try:
+                await asyncio.wait_for(flush_due.wait(), timeout=self.file_handler.PROCESSED_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            flush_due.clear()
+            await asyncio.to_thread(self.file_handler.flush_processed_action_keys)
+
+    async def _with_key_flusher(self, work: Awaitable[Any]) -> Any:
+        """Await work while queued processed-action keys are flushed in the background."""
+        loop = asyncio.get_running_loop()
+        flush_due = asyncio.Event()
+        # Registered before work starts so no full batch goes unsignalled.
+        self.file_handler.flush_due_callback = lambda: loop.call_soon_threadsafe(flush_due.set)
+        flusher = asyncio.ensure_future(self._flush_processed_keys_periodically(flush_due))
+        try:
+            return await work
+        finally:
+            flusher.cancel()
+            self.file_handler.flush_due_callback = None
+
+    async def _check_thread(self, analyzer: TweetAnalyzer, tweet: ScrapedTweet, llm_settings: Optional[LLMSettings]) -> bool:
+        """Memoized analyzer.check_if_thread_with_llm, keyed by tweet and LLM settings."""
+        if not tweet.tweet_id:
+            return await analyzer.check_if_thread_with_llm(tweet, custom_llm_settings=llm_settings)
+        key = ('thread', tweet.tweet_id, repr(llm_settings))
+        return await self._cached_analysis(
+            key, lambda: analyzer.check_if_thread_with_llm(tweet, custom_llm_settings=llm_settings)
+        )
+
+    async def _score_relevance(self, analyzer: TweetAnalyzer, tweet: ScrapedTweet, account: AccountConfig) -> float:
+        """Memoized analyzer.score_relevance for the account's keywords and LLM override.
+
+        Keyed by normalized text rather than tweet id, so reposts and copies of an
+        already scored text reuse its score.
+        """
+        text_key = normalize_for_dedupe(tweet.text_content) or tweet.tweet_id
+        if not text_key:
+            return await analyzer.score_relevance(tweet, keywords=account.target_keywords)
+        key = (
+            'relevance',
+            text_key,
+            tuple(sorted(k.lower() for k in (account.target_keywords or []))),
+            repr(account.llm_settings_override),
+        )
+        return await self._cached_analysis(
+            key, lambda: analyzer.score_relevance(tweet, keywords=account.target_keywords)
+        )
+
     async def _build_style_context(
         self,
         scraper: TweetScraper,
         browser_manager: BrowserManager,
         account: AccountConfig,
         max_items: int = 10,
+        cache_ttl_hours: float = 0.0,
     ):
-        def _normalize_handle(raw_value):
-            if not raw_value:
-                return None
-            value = str(raw_value).strip()
-            if not value:
-                return None
-            if value.lower().startswith("https://"):
-                parts = value.split("x.com/")
-                if len(parts) > 1:
-                    value = parts[-1]
-            value = value.split('?')[0].strip('/').lstrip('@')
-            return value.lower() or None
-
         handle_candidates = []
         if getattr(browser_manager, 'logged_in_handle', None):
             handle_candidates.append(browser_manager.logged_in_handle)
@@ -100,11 +277,35 @@ class TwitterOrchestrator:
         normalized_handles = []
         seen_handles = set()
         for raw in handle_candidates:
-            normalized = _normalize_handle(raw)
+            normalized = normalize_handle(raw)
             if normalized and normalized not in seen_handles:
                 seen_handles.add(normalized)
                 normalized_handles.append(normalized)
 
+        style_memory_dir = Path(PROJECT_ROOT) / 'data' / 'style_memory'
+        style_memory_path = style_memory_dir / f"{account.account_id}.json"
+        try:
+            cache_age = time.time() - style_memory_path.stat().st_mtime
+        except OSError:
+            cache_age = None
+        if cache_age is not None:
+            cached_memory = self.file_handler.read_json(style_memory_path) or {}
+            if (
+                cache_age < cache_ttl_hours * 3600
+                and cached_memory.get('entries')
+                and 'style_context' in cached_memory
+            ):
+                logger.info(
+                    f"[{account.account_id}] Reusing style memory from {int(cache_age // 60)} minutes ago; skipping profile scrape."
+                )
+                return cached_memory['style_context'], cached_memory
+            # Profiles share one browser, so they are scraped one at a time; try the
+            # handle that produced the last snapshot first instead of walking stale ones.
+            last_handle = normalize_handle(cached_memory.get('profile_url'))
+            if last_handle in normalized_handles:
+                normalized_handles.remove(last_handle)
+                normalized_handles.insert(0, last_handle)
+
         tweets_collected = []
         profile_used = None
         for handle in normalized_handles:
@@ -152,13 +353,12 @@ class TwitterOrchestrator:
             {
                 'account_id': account.account_id,
                 'profile_url': str(profile_used) if profile_used else None,
+                'style_context': style_context_text,
             }
         )
 
         try:
-            style_memory_dir = Path(PROJECT_ROOT) / 'data' / 'style_memory'
             self.file_handler.ensure_directory_exists(style_memory_dir)
-            style_memory_path = style_memory_dir / f"{account.account_id}.json"
             self.file_handler.write_json(style_memory_path, style_memory)
             logger.info(
                 f"[{account.account_id}] Refreshed style memory with {len(style_memory.get('entries', []))} entries."
@@ -194,8 +394,9 @@ class TwitterOrchestrator:
         min_delay = max(10, action_config.min_delay_between_actions_seconds)
         max_delay = max(min_delay, action_config.max_delay_between_actions_seconds)
 
-        session_start = datetime.now(timezone.utc)
-        session_end = session_start + timedelta(hours=max_hours)
+        # Session, hour-window and pacing deadlines are time.monotonic() seconds.
+        session_start = time.monotonic()
+        session_end = session_start + max_hours * 3600.0
         current_hour_start = session_start
         replies_sent_total = 0
         replies_this_hour = 0
@@ -208,7 +409,12 @@ class TwitterOrchestrator:
         style_metadata = {}
         style_system_prompt = None
         try:
-            style_context_text, style_metadata = await self._build_style_context(scraper, browser_manager, account)
+            style_context_text, style_metadata = await self._build_style_context(
+                scraper,
+                browser_manager,
+                account,
+                cache_ttl_hours=action_config.style_memory_ttl_hours,
+            )
             entries_count = len(style_metadata.get('entries', [])) if style_metadata else 0
             if entries_count:
                 media_entry_count = style_metadata.get('media_entry_count', 0)
@@ -246,6 +452,8 @@ class TwitterOrchestrator:
             media_entries = [entry for entry in style_metadata.get('entries', []) if entry.get('media_urls')]
             if media_entries:
                 lines = []
+                # URLs already inlined; grown as parts are appended rather than re-derived per entry.
+                existing_urls: Set[str] = set()
                 for entry in media_entries[:5]:
                     media_urls = [str(url) for url in entry.get('media_urls') or [] if url]
                     if not media_urls:
@@ -253,15 +461,6 @@ class TwitterOrchestrator:
                     lines.append(
                         "Media reference: " + ", ".join(media_urls)
                     )
-                    existing_urls = {
-                        str(part['source']['url'])
-                        for media in inline_media_payload
-                        for part in media.get('parts', [])
-                        if part.get('type') == 'media'
-                        and isinstance(part.get('source'), dict)
-                        and part['source'].get('type') == 'url'
-                        and part['source'].get('url')
-                    }
                     for media_url in media_urls:
                         media_url_str = str(media_url)
                         if media_url_str in existing_urls:
@@ -326,96 +525,140 @@ class TwitterOrchestrator:
             spacing_max_seconds = spacing_max_candidate
         if spacing_max_seconds - spacing_min_seconds < 1.0:
             spacing_max_seconds = spacing_min_seconds + max(5.0, spacing_min_seconds * 0.05)
-
-        next_reply_earliest = datetime.now(timezone.utc)
+        # One delay per possible reply, drawn up front; a seed makes the schedule replayable.
+        pacing_rng = random.Random(action_config.home_timeline_pacing_seed)
+        reply_delays = [pacing_rng.uniform(spacing_min_seconds, spacing_max_seconds) for _ in range(total_cap)]
+        reply_attempts = 0
+
+        reply_prefetch = max(0, action_config.home_timeline_reply_prefetch or 0)
+        reply_generations: Dict[str, Any] = {}
+        candidate_queue: deque = deque()
+        candidate_queue_limit = replies_per_hour * 2
+        seen_candidate_ids: Set[str] = set()
+        candidate_scores: Dict[str, float] = {}
+        self_handle_set = self._own_handle_set(account, browser_manager)
+        own_handle_cache: Dict[str, bool] = {}
+        action_key_prefix = f"home_reply_{account.account_id}_"
+
+        next_reply_earliest = time.monotonic()
         logger.info(
             f"[{account.account_id}] Pacing replies with at least {spacing_min_seconds:.0f}s (~{spacing_min_seconds / 60.0:.1f} min) between attempts."
         )
 
-        while replies_sent_total < total_cap:
-            now = datetime.now(timezone.utc)
-            if now >= session_end:
-                logger.info(f"[{account.account_id}] Home timeline session reached {max_hours} hour limit, stopping.")
-                break
-
-            if (now - current_hour_start).total_seconds() >= 3600:
-                logger.debug(f"[{account.account_id}] Advancing to next hourly window for home timeline replies.")
-                current_hour_start = now
-                replies_this_hour = 0
-
-            if replies_this_hour >= replies_per_hour:
-                next_hour_time = current_hour_start + timedelta(hours=1)
-                sleep_seconds = (next_hour_time - now).total_seconds()
-                remaining_session = (session_end - now).total_seconds()
-                if remaining_session <= 0:
-                    logger.info(f"[{account.account_id}] Session time exhausted while waiting for next hour.")
+        try:
+            while replies_sent_total < total_cap:
+                now = time.monotonic()
+                if now >= session_end:
+                    logger.info("[%s] Home timeline session reached %s hour limit, stopping.", account.account_id, max_hours)
                     break
-                sleep_seconds = max(0.0, min(sleep_seconds, remaining_session))
-                if sleep_seconds <= 0:
-                    current_hour_start = datetime.now(timezone.utc)
-                    replies_this_hour = 0
-                    continue
-                minutes = sleep_seconds / 60.0
-                logger.info(
-                    f"[{account.account_id}] Reached hourly cap ({replies_per_hour}). Cooling down for {minutes:.1f} minutes before resuming."
-                )
-                await asyncio.sleep(sleep_seconds)
-                next_reply_earliest = max(next_reply_earliest, datetime.now(timezone.utc))
-                current_hour_start = datetime.now(timezone.utc)
-                replies_this_hour = 0
-                continue
-
-            batch_limit = max(40, replies_per_hour * 4)
-            tweets = await asyncio.to_thread(
-                scraper.scrape_home_timeline,
-                batch_limit,
-            )
-
-            if not tweets:
-                logger.info(f"[{account.account_id}] No tweets retrieved from home timeline. Ending session early.")
-                break
-
-            scored_candidates = sorted(
-                tweets,
-                key=self._score_home_timeline_tweet,
-                reverse=True,
-            )
-
-            made_reply_this_batch = False
 
-            for candidate in scored_candidates:
-                if replies_this_hour >= replies_per_hour or replies_sent_total >= total_cap:
-                    break
+                if now - current_hour_start >= 3600:
+                    logger.debug("[%s] Advancing to next hourly window for home timeline replies.", account.account_id)
+                    current_hour_start = now
+                    replies_this_hour = 0
 
-                if not candidate.tweet_id:
+                if replies_this_hour >= replies_per_hour:
+                    sleep_seconds = current_hour_start + 3600 - now
+                    remaining_session = session_end - now
+                    if remaining_session <= 0:
+                        logger.info("[%s] Session time exhausted while waiting for next hour.", account.account_id)
+                        break
+                    sleep_seconds = max(0.0, min(sleep_seconds, remaining_session))
+                    if sleep_seconds <= 0:
+                        current_hour_start = time.monotonic()
+                        replies_this_hour = 0
+                        continue
+                    logger.info(
+                        "[%s] Reached hourly cap (%s). Cooling down for %.1f minutes before resuming.",
+                        account.account_id,
+                        replies_per_hour,
+                        sleep_seconds / 60.0,
+                    )
+                    await asyncio.sleep(sleep_seconds)
+                    current_hour_start = time.monotonic()
+                    next_reply_earliest = max(next_reply_earliest, current_hour_start)
+                    replies_this_hour = 0
                     continue
 
-                if candidate.user_handle and self._is_own_tweet(candidate.user_handle, account, browser_manager):
+                # Honor reply pacing before scraping so the wait doesn't leave a scraped batch going stale.
+                if now < next_reply_earliest:
+                    wait_seconds = min(next_reply_earliest, session_end) - now
+                    logger.info(
+                        "[%s] Waiting %.1f minutes before next reply to honor pacing.",
+                        account.account_id,
+                        wait_seconds / 60.0,
+                    )
+                    await asyncio.sleep(wait_seconds)
                     continue
 
-                action_key = f"home_reply_{account.account_id}_{candidate.tweet_id}"
-                if action_key in self.processed_action_keys:
-                    continue
+                # Scrape only when the queued candidates from the previous scrape are used up;
+                # each scrape yields far more candidates than one reply consumes.
+                batch_is_fresh = not candidate_queue
+                if batch_is_fresh:
+                    batch_limit = max(40, replies_per_hour * 4)
+                    # Score and filter tweets as the scraper yields them, keeping a bounded min-heap of
+                    # the best (score, -position) entries so ties keep timeline order.
+                    top_candidates: List[tuple] = []
+                    tweets_seen = 0
+                    async for candidate in scraper.stream_home_timeline(batch_limit):
+                        tweets_seen += 1
+                        tweet_id = candidate.tweet_id
+                        if (
+                            not tweet_id
+                            or tweet_id in seen_candidate_ids
+                            or action_key_prefix + tweet_id in self.processed_action_keys
+                        ):
+                            continue
+                        raw_handle = candidate.user_handle
+                        if raw_handle:
+                            # The timeline repeats a few authors; normalize each raw handle once per session.
+                            is_own = own_handle_cache.get(raw_handle)
+                            if is_own is None:
+                                is_own = own_handle_cache[raw_handle] = (
+                                    normalize_handle(raw_handle) in self_handle_set
+                                )
+                            if is_own:
+                                continue
+                        entry = (self._score_home_timeline_tweet(candidate), -tweets_seen, candidate)
+                        if len(top_candidates) < candidate_queue_limit:
+                            heapq.heappush(top_candidates, entry)
+                        elif entry[:2] > top_candidates[0][:2]:
+                            heapq.heapreplace(top_candidates, entry)
+
+                    if not tweets_seen:
+                        logger.info("[%s] No tweets retrieved from home timeline. Ending session early.", account.account_id)
+                        break
 
-                tweet_inline_media = []
-                if candidate.embedded_media_urls:
-                    for media_url in candidate.embedded_media_urls[:4]:  # Limit to 4 media items
-                        tweet_inline_media.append(
-                            {
-                                'role': 'user',
-                                'parts': [
-                                    {'type': 'text', 'text': "Media from the tweet you're replying to:"},
-                                    {'type': 'media', 'media_type': 'image', 'source': {'type': 'url', 'url': str(media_url)}},
-                                ],
-                            }
-                        )
+                    for score, _, candidate in sorted(top_candidates, key=lambda e: e[:2], reverse=True):
+                        seen_candidate_ids.add(candidate.tweet_id)
+                        candidate_scores[candidate.tweet_id] = score
+                        candidate_queue.append(candidate)
+
+                made_reply_this_batch = False
+                eligible_candidates = list(candidate_queue)
+                consumed_candidates = 0
+
+                def _start_reply_generation(candidate: ScrapedTweet):
+                    tweet_inline_media = []
+                    if candidate.embedded_media_urls:
+                        # Cards can list the same image more than once; send each URL to the model only once.
+                        unique_media_urls = list(dict.fromkeys(str(url) for url in candidate.embedded_media_urls if url))
+                        for media_url in unique_media_urls[:4]:  # Limit to 4 media items
+                            tweet_inline_media.append(
+                                {
+                                    'role': 'user',
+                                    'parts': [
+                                        {'type': 'text', 'text': "Media from the tweet you're replying to:"},
+                                        {'type': 'media', 'media_type': 'image', 'source': {'type': 'url', 'url': media_url}},
+                                    ],
+                                }
+                            )
 
-                use_style_profile = should_apply_style_profile(candidate, style_keywords)
-                system_prompt_for_reply = style_system_prompt if use_style_profile else base_system_prompt
-                summary_for_reply = style_summary if use_style_profile else None
+                    use_style_profile = should_apply_style_profile(candidate, style_keywords)
+                    system_prompt_for_reply = style_system_prompt if use_style_profile else base_system_prompt
+                    summary_for_reply = style_summary if use_style_profile else None
 
-                try:
-                    generated_reply_text, guard_metadata = await generate_guarded_reply(
+                    generation = asyncio.ensure_future(generate_guarded_reply(
                         llm_service=llm_service,
                         tweet=candidate,
                         llm_settings=llm_for_reply,
@@ -425,109 +668,162 @@ class TwitterOrchestrator:
                         inline_media=tweet_inline_media,
                         banned_terms=None,
                         retry_limit=2,
-                    )
-                except Exception as llm_error:
-                    logger.error(f"[{account.account_id}] LLM failed to generate reply for {candidate.tweet_id}: {llm_error}")
-                    metrics.increment('errors')
-                    metrics.log_event(
-                        'home_timeline_reply',
-                        'failure',
-                        {'tweet_id': candidate.tweet_id, 'reason': 'llm_error'},
-                    )
-                    continue
-
-                if not generated_reply_text:
-                    logger.debug(
-                        f"[{account.account_id}] Guardrails blocked reply for tweet {candidate.tweet_id}: {guard_metadata.get('relevance_reason')}"
-                    )
-                    metrics.log_event(
-                        'home_timeline_reply',
-                        'skipped',
-                        {
-                            'tweet_id': candidate.tweet_id,
-                            'reason': guard_metadata.get('relevance_reason'),
-                            'attempts': guard_metadata.get('attempts'),
-                        },
-                    )
-                    continue
+                    ))
+                    return use_style_profile, generation
+
+                # Replies for the next `reply_prefetch` candidates are generated concurrently, so a
+                # guardrail rejection does not leave the loop waiting on a fresh LLM round-trip.
+                # Unconsumed generations carry over to the next batch via reply_generations.
+                next_to_start = 0
+                for candidate_index, candidate in enumerate(eligible_candidates):
+                    if replies_this_hour >= replies_per_hour or replies_sent_total >= total_cap:
+                        break
+                    consumed_candidates = candidate_index + 1
+
+                    action_key = action_key_prefix + candidate.tweet_id
+
+                    while next_to_start < len(eligible_candidates) and next_to_start <= candidate_index + reply_prefetch:
+                        upcoming = eligible_candidates[next_to_start]
+                        if upcoming.tweet_id not in reply_generations:
+                            reply_generations[upcoming.tweet_id] = _start_reply_generation(upcoming)
+                        next_to_start += 1
+                    use_style_profile, generation = reply_generations.pop(candidate.tweet_id)
+
+                    try:
+                        generated_reply_text, guard_metadata = await generation
+                    except Exception as llm_error:
+                        logger.error("[%s] LLM failed to generate reply for %s: %s", account.account_id, candidate.tweet_id, llm_error)
+                        metrics.increment('errors', flush=False)
+                        metrics.buffered_log_event(
+                            'home_timeline_reply',
+                            'failure',
+                            {'tweet_id': candidate.tweet_id, 'reason': 'llm_error'},
+                        )
+                        continue
 
-                generated_reply_text = generated_reply_text[:270].rstrip()
-                if not generated_reply_text:
-                    logger.debug(
-                        f"[{account.account_id}] Generated reply empty after trimming for tweet {candidate.tweet_id}. Skipping."
-                    )
-                    metrics.log_event(
-                        'home_timeline_reply',
-                        'skipped',
-                        {
-                            'tweet_id': candidate.tweet_id,
-                            'reason': 'empty_after_trim',
-                            'attempts': guard_metadata.get('attempts'),
-                        },
-                    )
-                    continue
+                    if not generated_reply_text:
+                        logger.debug(
+                            "[%s] Guardrails blocked reply for tweet %s: %s",
+                            account.account_id,
+                            candidate.tweet_id,
+                            guard_metadata.get('relevance_reason'),
+                        )
+                        metrics.buffered_log_event(
+                            'home_timeline_reply',
+                            'skipped',
+                            {
+                                'tweet_id': candidate.tweet_id,
+                                'reason': guard_metadata.get('relevance_reason'),
+                                'attempts': guard_metadata.get('attempts'),
+                            },
+                        )
+                        continue
 
-                now_for_pacing = datetime.now(timezone.utc)
-                if now_for_pacing < next_reply_earliest:
-                    wait_seconds = (next_reply_earliest - now_for_pacing).total_seconds()
-                    if wait_seconds > 0:
-                        logger.info(
-                            f"[{account.account_id}] Waiting {wait_seconds / 60.0:.1f} minutes before next reply to honor pacing."
+                    generated_reply_text = truncate_text(generated_reply_text, MAX_REPLY_CHARS)
+                    if not generated_reply_text:
+                        logger.debug(
+                            "[%s] Generated reply empty after trimming for tweet %s. Skipping.",
+                            account.account_id,
+                            candidate.tweet_id,
+                        )
+                        metrics.buffered_log_event(
+                            'home_timeline_reply',
+                            'skipped',
+                            {
+                                'tweet_id': candidate.tweet_id,
+                                'reason': 'empty_after_trim',
+                                'attempts': guard_metadata.get('attempts'),
+                            },
                         )
-                        await asyncio.sleep(wait_seconds)
+                        continue
 
-                logger.info(
-                    f"[{account.account_id}] Attempting home timeline reply {replies_sent_total + 1}/{total_cap} "
-                    f"(hour slot {replies_this_hour + 1}/{replies_per_hour}) on tweet {candidate.tweet_id}."
-                )
+                    now_for_pacing = time.monotonic()
+                    if now_for_pacing < next_reply_earliest:
+                        wait_seconds = next_reply_earliest - now_for_pacing
+                        if wait_seconds > 0:
+                            logger.info(
+                                "[%s] Waiting %.1f minutes before next reply to honor pacing.",
+                                account.account_id,
+                                wait_seconds / 60.0,
+                            )
+                            await asyncio.sleep(wait_seconds)
 
-                success = await publisher.reply_to_tweet(candidate, generated_reply_text)
-                attempt_completed_at = datetime.now(timezone.utc)
-                next_delay = random.uniform(spacing_min_seconds, spacing_max_seconds)
-                next_reply_earliest = attempt_completed_at + timedelta(seconds=next_delay)
-                logger.debug(
-                    f"[{account.account_id}] Scheduled next reply attempt no sooner than {next_reply_earliest.isoformat()} (delay {next_delay:.0f}s)."
-                )
-                if success:
-                    score = self._score_home_timeline_tweet(candidate)
-                    replies_sent_total += 1
-                    replies_this_hour += 1
-                    metrics.increment('replies')
-                    metrics.log_event(
-                        'home_timeline_reply',
-                        'success',
-                        {
-                            'tweet_id': candidate.tweet_id,
-                            'score': score,
-                            'likes': candidate.like_count,
-                            'retweets': candidate.retweet_count,
-                            'views': candidate.view_count,
-                            'media_in_style_context': bool(media_references.strip()),
-                            'style_applied': use_style_profile,
-                            'guard_attempts': guard_metadata.get('attempts'),
-                            'flagged_terms': guard_metadata.get('flagged_terms'),
-                        },
-                    )
-                    log_index = f"{replies_sent_total}/{total_cap}"
                     logger.info(
-                        f"[{account.account_id}] Home timeline reply {log_index} complete for tweet {candidate.tweet_id} (score {score:.2f})."
-                    )
-                    self.file_handler.save_processed_action_key(action_key, timestamp=datetime.now().isoformat())
-                    self.processed_action_keys.add(action_key)
-                    made_reply_this_batch = True
-                    break
-                else:
-                    metrics.increment('errors')
-                    metrics.log_event(
-                        'home_timeline_reply',
-                        'failure',
-                        {'tweet_id': candidate.tweet_id, 'reason': 'selenium_failure'},
+                        "[%s] Attempting home timeline reply %s/%s (hour slot %s/%s) on tweet %s.",
+                        account.account_id,
+                        replies_sent_total + 1,
+                        total_cap,
+                        replies_this_hour + 1,
+                        replies_per_hour,
+                        candidate.tweet_id,
                     )
-                    logger.error(f"[{account.account_id}] Failed to post reply to home timeline tweet {candidate.tweet_id}.")
 
-            if not made_reply_this_batch:
-                logger.info(f"[{account.account_id}] No suitable home timeline tweets produced replies this batch. Ending session.")
-                break
+                    success = await publisher.reply_to_tweet(candidate, generated_reply_text)
+                    next_delay = reply_delays[reply_attempts % total_cap]
+                    reply_attempts += 1
+                    next_reply_earliest = time.monotonic() + next_delay
+                    logger.debug(
+                        "[%s] Scheduled next reply attempt no sooner than %.0fs from now.",
+                        account.account_id,
+                        next_delay,
+                    )
+                    if success:
+                        score = candidate_scores.get(candidate.tweet_id)
+                        if score is None:
+                            score = self._score_home_timeline_tweet(candidate)
+                        replies_sent_total += 1
+                        replies_this_hour += 1
+                        metrics.increment('replies', flush=False)
+                        metrics.buffered_log_event(
+                            'home_timeline_reply',
+                            'success',
+                            {
+                                'tweet_id': candidate.tweet_id,
+                                'score': score,
+                                'likes': candidate.like_count,
+                                'retweets': candidate.retweet_count,
+                                'views': candidate.view_count,
+                                'media_in_style_context': bool(media_references.strip()),
+                                'style_applied': use_style_profile,
+                                'guard_attempts': guard_metadata.get('attempts'),
+                                'flagged_terms': guard_metadata.get('flagged_terms'),
+                            },
+                        )
+                        logger.info(
+                            "[%s] Home timeline reply %s/%s complete for tweet %s (score %.2f).",
+                            account.account_id,
+                            replies_sent_total,
+                            total_cap,
+                            candidate.tweet_id,
+                            score,
+                        )
+                        self.processed_action_keys.add(action_key)
+                        self.file_handler.queue_processed_action_key(action_key)
+                        made_reply_this_batch = True
+                        break
+                    else:
+                        metrics.increment('errors', flush=False)
+                        metrics.buffered_log_event(
+                            'home_timeline_reply',
+                            'failure',
+                            {'tweet_id': candidate.tweet_id, 'reason': 'selenium_failure'},
+                        )
+                        logger.error("[%s] Failed to post reply to home timeline tweet %s.", account.account_id, candidate.tweet_id)
+                for _ in range(consumed_candidates):
+                    candidate_queue.popleft()
+                # Events from this batch are written together rather than one file append per event.
+                metrics.flush()
+
+                if not made_reply_this_batch:
+                    if not batch_is_fresh:
+                        # Only leftovers were tried; fetch a fresh batch before giving up.
+                        continue
+                    logger.info("[%s] No suitable home timeline tweets produced replies this batch. Ending session.", account.account_id)
+                    break
+        finally:
+            # Covers early exits (errors, cancellation) too, so no prefetched generation keeps running.
+            for _, generation in reply_generations.values():
+                generation.cancel()
 
     async def _decide_competitor_action(self, analyzer: TweetAnalyzer, tweet: ScrapedTweet, account: AccountConfig) -> str:
         """Return one of: 'repost', 'retweet', 'quote_tweet', 'like' based on relevance and sentiment, honoring per-account overrides and thresholds."""
@@ -543,6 +839,12 @@ class TwitterOrchestrator:
         repost_min = (acc_ac.decision_repost_min if (acc_ac and acc_ac.decision_repost_min is not None) else float(ed_thr.get('repost_min', 0.35)))
         if not decision_enabled:
             return (acc_ac.competitor_post_interaction_type if acc_ac else 'repost')
+        # Deterministic shortcut: tweets matching too few target keywords become likes without any LLM call
+        like_below = (acc_ac.decision_like_below_keyword_score if (acc_ac and acc_ac.decision_like_below_keyword_score is not None)
+                      else ed_thr.get('like_below_keyword_score'))
+        if like_below is not None and account.target_keywords:
+            if keyword_relevance_score(tweet.text_content or "", account.target_keywords) < float(like_below):
+                return 'like'
         # Try structured analysis first
         structured = await analyzer.analyze_tweet_structured(tweet, keywords=account.target_keywords)
         if structured and isinstance(structured, dict) and 'recommended_action' in structured:
@@ -555,7 +857,7 @@ class TwitterOrchestrator:
             if rec in ('quote_tweet', 'retweet', 'repost', 'like'):
                 return rec
         # Fallback: Compute relevance and optionally sentiment
-        rel = await analyzer.score_relevance(tweet, keywords=account.target_keywords)
+        rel = await self._score_relevance(analyzer, tweet, account)
         sentiment = 'neutral'
         if use_sentiment:
             try:
@@ -571,8 +873,66 @@ class TwitterOrchestrator:
             return 'repost'
         return 'like'
 
-    async def _process_account(self, account_dict: dict):
-        """Processes tasks for a single Twitter account."""
+    async def _scrape_competitor_profiles(
+        self,
+        scraper: TweetScraper,
+        account: AccountConfig,
+        account_dict: dict,
+        profile_urls: List[Any],
+        max_tweets: int,
+        concurrency: int = 1,
+        candidate_filter: Optional[Callable[[ScrapedTweet], bool]] = None,
+    ) -> List[Any]:
+        """Scrape competitor profiles, up to `concurrency` at a time.
+
+        A Selenium session can only load one page at a time, so each extra concurrent
+        scrape gets its own browser for the account; those are closed afterwards.
+        Tweets are checked against `candidate_filter` as they stream in; rejected ones are not kept.
+        Returns one entry per profile URL, in order: its tweets, or the exception raised.
+        """
+        concurrency = max(1, min(concurrency or 1, len(profile_urls)))
+        available: asyncio.Queue = asyncio.Queue()
+        available.put_nowait(scraper)
+        extra_browsers: List[BrowserManager] = []
+        try:
+            for _ in range(concurrency - 1):
+                try:
+                    extra_browser = BrowserManager(account_config=account_dict)
+                    extra_browsers.append(extra_browser)
+                    available.put_nowait(
+                        await asyncio.to_thread(TweetScraper, extra_browser, account_id=account.account_id)
+                    )
+                except Exception as browser_error:
+                    logger.warning(
+                        f"[{account.account_id}] Could not start an extra browser for profile scraping: {browser_error}"
+                    )
+                    break
+
+            async def _scrape_one_profile(profile_url):
+                profile_scraper = await available.get()
+                try:
+                    logger.info(f"[{account.account_id}] Scraping profile: {str(profile_url)}")
+                    kept_tweets = []
+                    async for tweet in profile_scraper.stream_tweets_from_profile(str(profile_url), max_tweets=max_tweets):
+                        if candidate_filter is None or candidate_filter(tweet):
+                            kept_tweets.append(tweet)
+                    return kept_tweets
+                finally:
+                    available.put_nowait(profile_scraper)
+
+            return await asyncio.gather(
+                *(_scrape_one_profile(profile_url) for profile_url in profile_urls),
+                return_exceptions=True,
+            )
+        finally:
+            for extra_browser in extra_browsers:
+                extra_browser.close_driver()
+
+    async def _process_account(self, account_dict: dict, browser_manager: Optional[BrowserManager] = None):
+        """Processes tasks for a single Twitter account.
+
+        A pre-started browser_manager may be passed in; it is closed when processing ends.
+        """
         
         # Normalize legacy override keys to current AccountConfig fields
         def _normalize_account_config(d: dict) -> dict:
@@ -614,11 +974,11 @@ class TwitterOrchestrator:
 
         logger.info(f"--- Starting processing for account: {account.account_id} ---")
         
-        browser_manager = None
         metrics = None
         try:
-            browser_manager = BrowserManager(account_config=account_dict) # Pass original dict for cookie path handling
-            llm_service = LLMService(config_loader=self.config_loader)
+            if browser_manager is None:
+                browser_manager = BrowserManager(account_config=account_dict) # Pass original dict for cookie path handling
+            llm_service = self._shared_llm_service()
             
             # Initialize feature modules with the current account's context
             scraper = TweetScraper(browser_manager, account_id=account.account_id)
@@ -642,6 +1002,54 @@ class TwitterOrchestrator:
             llm_for_post = account.llm_settings_override or current_action_config.llm_settings_for_post
             llm_for_reply = account.llm_settings_override or current_action_config.llm_settings_for_reply
             llm_for_thread_analysis = account.llm_settings_override or current_action_config.llm_settings_for_thread_analysis
+            # Relevance filters, resolved once per run; keyword retweets reuse the likes settings
+            relevance_gates = {
+                kind: self._relevance_gate(account, kind) for kind in self._RELEVANCE_GATE_SETTINGS
+            }
+            relevance_gates['retweet'] = relevance_gates['like']
+            enable_rel_reply = relevance_gates['reply'][0]
+
+            async def _passes_relevance(kind: str, tweet: ScrapedTweet) -> bool:
+                """Apply the relevance filter for kind; a failed score does not filter."""
+                enabled, threshold = relevance_gates[kind]
+                if not enabled:
+                    return True
+                try:
+                    rel = await self._score_relevance(analyzer, tweet, account)
+                except Exception:
+                    return True
+                if rel is not None and rel < threshold:
+                    logger.debug(f"[{account.account_id}] Skipping {kind} for {tweet.tweet_id} (rel {rel:.2f} < {threshold}).")
+                    return False
+                return True
+
+            async def _passes_relevance_batch(kind: str, tweets: List[ScrapedTweet]) -> List[bool]:
+                """_passes_relevance for a batch of candidates, scored concurrently."""
+                if not relevance_gates[kind][0]:
+                    return [True] * len(tweets)
+                return list(await asyncio.gather(*(_passes_relevance(kind, tweet) for tweet in tweets)))
+
+            min_action_delay = current_action_config.min_delay_between_actions_seconds
+            max_action_delay = current_action_config.max_delay_between_actions_seconds
+            action_pacer = _ActionPacer(min_action_delay, max_action_delay)
+            # Own-handle set is rebuilt only when the browser detects (or changes) the logged-in handle,
+            # which happens lazily on first driver use. Verdicts are memoized per raw scraped handle,
+            # since the same authors recur across searches, profiles and the community feed.
+            own_handles_state = {'logged_in': object(), 'handles': frozenset()}
+            own_handle_verdicts: Dict[str, bool] = {}
+
+            def _is_own_handle(user_handle: str) -> bool:
+                logged_in = getattr(browser_manager, 'logged_in_handle', None)
+                if logged_in != own_handles_state['logged_in']:
+                    own_handles_state['logged_in'] = logged_in
+                    own_handles_state['handles'] = self._own_handle_set(account, browser_manager)
+                    own_handle_verdicts.clear()
+                verdict = own_handle_verdicts.get(user_handle)
+                if verdict is None:
+                    verdict = own_handle_verdicts[user_handle] = (
+                        normalize_handle(user_handle) in own_handles_state['handles']
+                    )
+                return verdict
             
             # Determine automation mode for inbound content
             competitor_profiles_for_account = account.competitor_profiles
@@ -676,113 +1084,146 @@ class TwitterOrchestrator:
                 and not home_timeline_enabled
             ):
                 logger.info(f"[{account.account_id}] Starting competitor profile scraping and posting using {len(competitor_profiles_for_account)} profiles.")
-                for profile_url in competitor_profiles_for_account:
-                    logger.info(f"[{account.account_id}] Scraping profile: {str(profile_url)}")
-                    
-                    tweets_from_profile = await asyncio.to_thread(
-                        scraper.scrape_tweets_from_profile, 
-                        str(profile_url), 
-                        max_tweets=current_action_config.max_posts_per_competitor_run * 3
-                    )
-                    
+                # Resolve per-run settings once rather than for every scraped tweet.
+                max_posts_per_profile = current_action_config.max_posts_per_competitor_run
+                media_only = current_action_config.repost_only_tweets_with_media
+                min_likes = current_action_config.min_likes_for_repost_candidate
+                min_retweets = current_action_config.min_retweets_for_repost_candidate
+                enable_thread_analysis = current_action_config.enable_thread_analysis
+
+                def _repost_skip_reason(
+                    t: ScrapedTweet,
+                    _media_only: bool = media_only,
+                    _min_likes: int = min_likes,
+                    _min_retweets: int = min_retweets,
+                ) -> Optional[str]:
+                    # Settings are bound once as defaults; no attribute chains per scraped tweet.
+                    if _media_only and not t.embedded_media_urls:
+                        return "no media"
+                    if (t.like_count or 0) < _min_likes:
+                        return f"likes {t.like_count} < min"
+                    if (t.retweet_count or 0) < _min_retweets:
+                        return f"retweets {t.retweet_count} < min"
+                    return None
+
+                log_repost_skips = logger.isEnabledFor(logging.DEBUG)
+
+                def _is_repost_candidate(scraped_tweet: ScrapedTweet) -> bool:
+                    # Cheap field filters run while the profile is still scrolling; relevance
+                    # (an LLM call) is scored later, only for as many candidates as posts remain.
+                    skip_reason = _repost_skip_reason(scraped_tweet)
+                    if skip_reason is not None:
+                        if log_repost_skips:
+                            logger.debug(f"[{account.account_id}] Skipping tweet {scraped_tweet.tweet_id} ({skip_reason}).")
+                        return False
+                    return True
+
+                profile_results = await self._scrape_competitor_profiles(
+                    scraper,
+                    account,
+                    account_dict,
+                    competitor_profiles_for_account,
+                    max_tweets=max_posts_per_profile * 3,
+                    concurrency=current_action_config.max_concurrent_profile_scrapes,
+                    candidate_filter=_is_repost_candidate,
+                )
+
+                # Scrapes overlap, but acting on the results stays serial to keep per-profile caps and delays.
+                for profile_url, candidate_tweets in zip(competitor_profiles_for_account, profile_results):
+                    if isinstance(candidate_tweets, Exception):
+                        logger.error(f"[{account.account_id}] Failed to scrape profile {str(profile_url)}: {candidate_tweets}")
+                        continue
+
                     posts_made_this_profile = 0
-                    for scraped_tweet in tweets_from_profile:
-                        if posts_made_this_profile >= current_action_config.max_posts_per_competitor_run:
+                    remaining_candidates = iter(candidate_tweets)
+                    while posts_made_this_profile < max_posts_per_profile:
+                        # Score only as many candidates as posts are still allowed, in one concurrent batch
+                        # (likes do not count towards the cap, so later windows may follow).
+                        repost_window = []
+                        for scraped_tweet in remaining_candidates:
+                            repost_window.append(scraped_tweet)
+                            if len(repost_window) >= max_posts_per_profile - posts_made_this_profile:
+                                break
+                        if not repost_window:
                             break
                         # Optional relevance filter (settings-driven)
-                        try:
-                            acc_ac = account.action_config
-                            enable_rel = (acc_ac.enable_relevance_filter_competitor_reposts if (acc_ac and acc_ac.enable_relevance_filter_competitor_reposts is not None)
-                                          else self.analysis_config.get('enable_relevance_filter', {}).get('competitor_reposts', True))
-                            thr = (acc_ac.relevance_threshold_competitor_reposts if (acc_ac and acc_ac.relevance_threshold_competitor_reposts is not None)
-                                   else float(self.analysis_config.get('thresholds', {}).get('competitor_reposts_min', 0.35)))
-                            if enable_rel:
-                                rel_score = await analyzer.score_relevance(scraped_tweet, keywords=account.target_keywords)
-                                if rel_score < thr:
-                                    logger.debug(f"[{account.account_id}] Skipping tweet {scraped_tweet.tweet_id} (rel {rel_score:.2f} < {thr}).")
-                                    continue
-                        except Exception:
-                            pass
-                        
-                        if current_action_config.repost_only_tweets_with_media and not scraped_tweet.embedded_media_urls:
-                            logger.debug(f"[{account.account_id}] Skipping tweet {scraped_tweet.tweet_id} (no media).")
-                            continue
-                        if (scraped_tweet.like_count or 0) < current_action_config.min_likes_for_repost_candidate:
-                            logger.debug(f"[{account.account_id}] Skipping tweet {scraped_tweet.tweet_id} (likes {scraped_tweet.like_count} < min).")
-                            continue
-                        if (scraped_tweet.retweet_count or 0) < current_action_config.min_retweets_for_repost_candidate:
-                            logger.debug(f"[{account.account_id}] Skipping tweet {scraped_tweet.tweet_id} (retweets {scraped_tweet.retweet_count} < min).")
-                            continue
+                        repost_relevance = await _passes_relevance_batch('competitor_repost', repost_window)
+                        for scraped_tweet, relevant in zip(repost_window, repost_relevance):
+                            if not relevant:
+                                continue
 
-                        interaction_type = await self._decide_competitor_action(analyzer, scraped_tweet, account)
-                        action_key = f"{interaction_type}_{account.account_id}_{scraped_tweet.tweet_id}"
+                            interaction_type = await self._decide_competitor_action(analyzer, scraped_tweet, account)
+                            action_key = f"{interaction_type}_{account.account_id}_{scraped_tweet.tweet_id}"
                             
-                        if action_key in self.processed_action_keys:
-                            logger.info(f"[{account.account_id}] Action '{action_key}' already processed. Skipping.")
-                            continue
-
-                        if scraped_tweet.is_thread_candidate and current_action_config.enable_thread_analysis:
-                            logger.info(f"[{account.account_id}] Analyzing thread candidacy for tweet {scraped_tweet.tweet_id}...")
-                            is_confirmed = await analyzer.check_if_thread_with_llm(scraped_tweet, custom_llm_settings=llm_for_thread_analysis)
-                            scraped_tweet.is_confirmed_thread = is_confirmed
-                            logger.info(f"[{account.account_id}] Thread analysis result for {scraped_tweet.tweet_id}: {is_confirmed}")
-
-                        interaction_success = False
+                            if action_key in self.processed_action_keys:
+                                logger.info(f"[{account.account_id}] Action '{action_key}' already processed. Skipping.")
+                                continue
 
-                        if interaction_type == "like":
-                            logger.info(f"[{account.account_id}] Decided to like tweet {scraped_tweet.tweet_id}.")
-                            interaction_success = await engagement.like_tweet(tweet_id=scraped_tweet.tweet_id, tweet_url=str(scraped_tweet.tweet_url) if scraped_tweet.tweet_url else None)
-                            if interaction_success:
-                                metrics.increment('likes')
-                                metrics.log_event('like', 'success', {'source': 'competitor', 'tweet_id': scraped_tweet.tweet_id})
-                            else:
-                                metrics.increment('errors')
-                                metrics.log_event('like', 'failure', {'source': 'competitor', 'tweet_id': scraped_tweet.tweet_id})
-                        elif interaction_type == "repost":
-                            prompt = f"Rewrite this tweet in an engaging way: '{scraped_tweet.text_content}' by {scraped_tweet.user_handle or 'a user'}."
-                            if scraped_tweet.is_confirmed_thread:
-                                prompt = f"This tweet is part of a thread. Rewrite its essence engagingly: '{scraped_tweet.text_content}' by {scraped_tweet.user_handle or 'a user'}."
-                            new_tweet_content = TweetContent(text=prompt)
-                            logger.info(f"[{account.account_id}] Generating and posting new tweet based on {scraped_tweet.tweet_id}")
-                            interaction_success = await publisher.post_new_tweet(new_tweet_content, llm_settings=llm_for_post)
-                            metrics.log_event('post', 'success' if interaction_success else 'failure', {'source': 'competitor', 'tweet_id': scraped_tweet.tweet_id})
-                            if interaction_success:
-                                metrics.increment('posts')
+                            if scraped_tweet.is_thread_candidate and enable_thread_analysis:
+                                logger.info(f"[{account.account_id}] Analyzing thread candidacy for tweet {scraped_tweet.tweet_id}...")
+                                is_confirmed = await self._check_thread(analyzer, scraped_tweet, llm_for_thread_analysis)
+                                scraped_tweet.is_confirmed_thread = is_confirmed
+                                logger.info(f"[{account.account_id}] Thread analysis result for {scraped_tweet.tweet_id}: {is_confirmed}")
+
+                            interaction_success = False
+                            await action_pacer.wait()
+
+                            if interaction_type == "like":
+                                logger.info(f"[{account.account_id}] Decided to like tweet {scraped_tweet.tweet_id}.")
+                                interaction_success = await engagement.like_tweet(tweet_id=scraped_tweet.tweet_id, tweet_url=str(scraped_tweet.tweet_url) if scraped_tweet.tweet_url else None)
+                                if interaction_success:
+                                    metrics.increment('likes', flush=False)
+                                    metrics.buffered_log_event('like', 'success', {'source': 'competitor', 'tweet_id': scraped_tweet.tweet_id})
+                                else:
+                                    metrics.increment('errors', flush=False)
+                                    metrics.buffered_log_event('like', 'failure', {'source': 'competitor', 'tweet_id': scraped_tweet.tweet_id})
+                            elif interaction_type == "repost":
+                                prompt = f"Rewrite this tweet in an engaging way: '{scraped_tweet.text_content}' by {scraped_tweet.user_handle or 'a user'}."
+                                if scraped_tweet.is_confirmed_thread:
+                                    prompt = f"This tweet is part of a thread. Rewrite its essence engagingly: '{scraped_tweet.text_content}' by {scraped_tweet.user_handle or 'a user'}."
+                                new_tweet_content = TweetContent(text=prompt)
+                                logger.info(f"[{account.account_id}] Generating and posting new tweet based on {scraped_tweet.tweet_id}")
+                                interaction_success = await publisher.post_new_tweet(new_tweet_content, llm_settings=llm_for_post)
+                                metrics.buffered_log_event('post', 'success' if interaction_success else 'failure', {'source': 'competitor', 'tweet_id': scraped_tweet.tweet_id})
+                                if interaction_success:
+                                    metrics.increment('posts', flush=False)
                         
-                        elif interaction_type == "retweet":
-                            logger.info(f"[{account.account_id}] Attempting to retweet {scraped_tweet.tweet_id}")
-                            interaction_success = await publisher.retweet_tweet(scraped_tweet)
-                            metrics.log_event('retweet', 'success' if interaction_success else 'failure', {'tweet_id': scraped_tweet.tweet_id})
-                            if interaction_success:
-                                metrics.increment('retweets')
+                            elif interaction_type == "retweet":
+                                logger.info(f"[{account.account_id}] Attempting to retweet {scraped_tweet.tweet_id}")
+                                interaction_success = await publisher.retweet_tweet(scraped_tweet)
+                                metrics.buffered_log_event('retweet', 'success' if interaction_success else 'failure', {'tweet_id': scraped_tweet.tweet_id})
+                                if interaction_success:
+                                    metrics.increment('retweets', flush=False)
                         
-                        elif interaction_type == "quote_tweet":
-                            quote_prompt_template = current_action_config.prompt_for_quote_tweet_from_competitor
-                            quote_prompt = quote_prompt_template.format(
-                                user_handle=(scraped_tweet.user_handle or "a user"), 
-                                tweet_text=scraped_tweet.text_content
-                            )
-                            logger.info(f"[{account.account_id}] Attempting to quote tweet {scraped_tweet.tweet_id} with generated text.")
-                            # LLM settings for quote tweets could be distinct if added to ActionConfig, for now using llm_for_post
-                            interaction_success = await publisher.retweet_tweet(scraped_tweet, 
-                                                                                quote_text_prompt_or_direct=quote_prompt, 
-                                                                                llm_settings_for_quote=llm_for_post)
-                            metrics.log_event('quote_tweet', 'success' if interaction_success else 'failure', {'tweet_id': scraped_tweet.tweet_id})
-                            if interaction_success:
-                                metrics.increment('quote_tweets')
-                        else:
-                            logger.warning(f"[{account.account_id}] Unknown competitor_post_interaction_type: {interaction_type}")
-                            continue
+                            elif interaction_type == "quote_tweet":
+                                quote_prompt_template = current_action_config.prompt_for_quote_tweet_from_competitor
+                                quote_prompt = quote_prompt_template.format(
+                                    user_handle=(scraped_tweet.user_handle or "a user"), 
+                                    tweet_text=scraped_tweet.text_content
+                                )
+                                logger.info(f"[{account.account_id}] Attempting to quote tweet {scraped_tweet.tweet_id} with generated text.")
+                                # LLM settings for quote tweets could be distinct if added to ActionConfig, for now using llm_for_post
+                                interaction_success = await publisher.retweet_tweet(scraped_tweet, 
+                                                                                    quote_text_prompt_or_direct=quote_prompt, 
+                                                                                    llm_settings_for_quote=llm_for_post)
+                                metrics.buffered_log_event('quote_tweet', 'success' if interaction_success else 'failure', {'tweet_id': scraped_tweet.tweet_id})
+                                if interaction_success:
+                                    metrics.increment('quote_tweets', flush=False)
+                            else:
+                                logger.warning(f"[{account.account_id}] Unknown competitor_post_interaction_type: {interaction_type}")
+                                continue
 
-                        if interaction_success:
-                            self.file_handler.save_processed_action_key(action_key, timestamp=datetime.now().isoformat())
-                            self.processed_action_keys.add(action_key) # Add to in-memory set for current run
-                            if interaction_type != 'like':
-                                posts_made_this_profile += 1
-                            await asyncio.sleep(random.uniform(current_action_config.min_delay_between_actions_seconds, current_action_config.max_delay_between_actions_seconds))
-                        else:
-                            logger.error(f"[{account.account_id}] Failed to {interaction_type} based on tweet {scraped_tweet.tweet_id}")
-                            metrics.increment('errors')
+                            if interaction_success:
+                                self.file_handler.queue_processed_action_key(action_key)
+                                self.processed_action_keys.add(action_key) # Add to in-memory set for current run
+                                if interaction_type != 'like':
+                                    posts_made_this_profile += 1
+                                action_pacer.mark()
+                            else:
+                                logger.error(f"[{account.account_id}] Failed to {interaction_type} based on tweet {scraped_tweet.tweet_id}")
+                                metrics.increment('errors', flush=False)
+                        # Events from this window are written together rather than one file append per event.
+                        metrics.flush()
 
             elif current_action_config.enable_competitor_reposts and not home_timeline_enabled:
                 logger.info(f"[{account.account_id}] Competitor reposts enabled, but no competitor profiles configured for this account.")
@@ -792,6 +1233,7 @@ class TwitterOrchestrator:
                 current_action_config.enable_community_engagement
                 and account.community_id
             ):
+                community_reply_generations: Dict[str, asyncio.Future] = {}
                 try:
                     community_url = f"https://x.com/i/communities/{account.community_id}"
                     logger.info(f"[{account.account_id}] Scraping community timeline: {community_url}")
@@ -806,21 +1248,92 @@ class TwitterOrchestrator:
 
                     total_community_actions = 0
                     replies_made_in_community = 0
+                    # Ages are measured against the scrape time; one clock read serves the whole batch.
+                    community_scraped_at = datetime.now(timezone.utc)
+                    community_reply_hours = current_action_config.community_reply_only_recent_tweets_hours
+
+                    def _community_reply_too_old(tweet: ScrapedTweet, log: bool = True) -> bool:
+                        """Respect the community reply recency window, if configured."""
+                        if not (community_reply_hours and tweet.created_at):
+                            return False
+                        try:
+                            age_hours = (community_scraped_at - tweet.created_at).total_seconds() / 3600
+                        except TypeError:
+                            # Naive timestamp: age unknown, so skip the reply as before
+                            return True
+                        if age_hours > community_reply_hours:
+                            if log:
+                                logger.debug(f"[{account.account_id}] Skipping community reply for {tweet.tweet_id}, age {age_hours:.1f}h > {community_reply_hours}h")
+                            return True
+                        return False
+
+                    # Replies for the next `community_reply_prefetch` reply-eligible posts are generated
+                    # while the current post is handled, so posting and LLM latency overlap.
+                    community_reply_prefetch = (
+                        max(0, current_action_config.community_reply_prefetch or 0)
+                        if current_action_config.enable_community_replies
+                        else 0
+                    )
+
+                    def _community_reply_eligible(tweet: ScrapedTweet) -> bool:
+                        return not (
+                            f"community_reply_{account.account_id}_{tweet.tweet_id}" in self.processed_action_keys
+                            or _community_reply_too_old(tweet, log=False)
+                            or (tweet.user_handle and _is_own_handle(tweet.user_handle))
+                            or not (tweet.text_content or tweet.embedded_media_urls)
+                        )
+
+                    def _start_community_reply(tweet: ScrapedTweet) -> asyncio.Future:
+                        # Build context-aware reply prompt with proper media handling
+                        tweet_media_context, tweet_inline_media = _reply_media_context(tweet, "Media from the community tweet:")
+                        reply_prompt = _COMMUNITY_REPLY_PROMPT.format(
+                            media_context=tweet_media_context,
+                            handle=tweet.user_handle or 'user',
+                            text=tweet.text_content,
+                        )
+                        generation = asyncio.ensure_future(llm_service.generate_text(
+                            prompt=reply_prompt,
+                            service_preference=llm_for_reply.service_preference,
+                            model_name=llm_for_reply.model_name_override,
+                            max_tokens=llm_for_reply.max_tokens,
+                            temperature=llm_for_reply.temperature,
+                            inline_media=tweet_inline_media,
+                        ))
+                        # A failure surfaces when the reply is awaited; unused prefetches must not warn.
+                        generation.add_done_callback(lambda f: f.cancelled() or f.exception())
+                        return generation
 
-                    for ct in community_tweets:
+                    for ct_index, ct in enumerate(community_tweets):
                         if total_community_actions >= current_action_config.max_community_engagements_per_run:
                             break
+                        # Never hold more generations than replies the run may still post.
+                        community_reply_budget = min(
+                            current_action_config.max_community_replies_per_run - replies_made_in_community,
+                            current_action_config.max_community_engagements_per_run - total_community_actions,
+                        )
+                        # The current post's own generation (if it is not prefetched already) counts too.
+                        community_replies_in_flight = len(community_reply_generations) + (
+                            community_reply_prefetch > 0
+                            and ct.tweet_id not in community_reply_generations
+                            and _community_reply_eligible(ct)
+                        )
+                        for upcoming in community_tweets[ct_index + 1:ct_index + 1 + community_reply_prefetch]:
+                            if community_replies_in_flight >= community_reply_budget:
+                                break
+                            if upcoming.tweet_id not in community_reply_generations and _community_reply_eligible(upcoming):
+                                community_reply_generations[upcoming.tweet_id] = _start_community_reply(upcoming)
+                                community_replies_in_flight += 1
 
                         # Avoid re-processing the same tweet for the same action
                         # We'll create an action key per decided action below.
 
                         # Decide how to engage (reuse competitor decision logic + thresholds)
                         # Skip own posts entirely in the community
-                        if ct.user_handle and self._is_own_tweet(ct.user_handle, account, browser_manager):
+                        if ct.user_handle and _is_own_handle(ct.user_handle):
                             logger.info(f"[{account.account_id}] Skipping own community post {ct.tweet_id} ({ct.user_handle}).")
                             try:
                                 skip_key = f"skip_own_{account.account_id}_{ct.tweet_id}"
-                                self.file_handler.save_processed_action_key(skip_key, timestamp=datetime.now().isoformat())
+                                self.file_handler.queue_processed_action_key(skip_key)
                                 self.processed_action_keys.add(skip_key)
                             except Exception:
                                 pass
@@ -839,11 +1352,12 @@ class TwitterOrchestrator:
                             if action_key in self.processed_action_keys:
                                 continue
                             logger.info(f"[{account.account_id}] Liking community post {ct.tweet_id}")
+                            await action_pacer.wait()
                             interaction_success = await engagement.like_tweet(ct.tweet_id, str(ct.tweet_url) if ct.tweet_url else None)
-                            metrics.log_event('community_like', 'success' if interaction_success else 'failure', {'tweet_id': ct.tweet_id})
+                            metrics.buffered_log_event('community_like', 'success' if interaction_success else 'failure', {'tweet_id': ct.tweet_id})
                             if interaction_success:
-                                metrics.increment('likes')
-                                self.file_handler.save_processed_action_key(action_key, timestamp=datetime.now().isoformat())
+                                metrics.increment('likes', flush=False)
+                                self.file_handler.queue_processed_action_key(action_key)
                                 self.processed_action_keys.add(action_key)
                                 total_community_actions += 1
 
@@ -852,13 +1366,14 @@ class TwitterOrchestrator:
                             if action_key in self.processed_action_keys:
                                 continue
                             logger.info(f"[{account.account_id}] Retweeting community post {ct.tweet_id}")
+                            await action_pacer.wait()
                             interaction_success = await publisher.retweet_tweet(ct, quote_text_prompt_or_direct=None)
-                            metrics.log_event('community_retweet', 'success' if interaction_success else 'failure', {'tweet_id': ct.tweet_id})
+                            metrics.buffered_log_event('community_retweet', 'success' if interaction_success else 'failure', {'tweet_id': ct.tweet_id})
                             if interaction_success:
-                                metrics.increment('retweets')
+                                metrics.increment('retweets', flush=False)
 
                             if interaction_success:
-                                self.file_handler.save_processed_action_key(action_key, timestamp=datetime.now().isoformat())
+                                self.file_handler.queue_processed_action_key(action_key)
                                 self.processed_action_keys.add(action_key)
                                 total_community_actions += 1
 
@@ -871,193 +1386,227 @@ class TwitterOrchestrator:
                             if reply_key in self.processed_action_keys:
                                 # Already replied to this post in past runs
                                 pass
+                            elif _community_reply_too_old(ct):
+                                # Outside the recency window; not treated as an error
+                                pass
                             else:
-                                # Respect recency window if configured
-                                try:
-                                    hours_limit = current_action_config.community_reply_only_recent_tweets_hours
-                                    if hours_limit and ct.created_at:
-                                        now_utc = datetime.now(timezone.utc)
-                                        age_hours = (now_utc - ct.created_at).total_seconds() / 3600
-                                        if age_hours > hours_limit:
-                                            logger.debug(f"[{account.account_id}] Skipping community reply for {ct.tweet_id}, age {age_hours:.1f}h > {hours_limit}h")
-                                            raise Exception("skip_reply_due_to_age")
-                                except Exception:
-                                    # Skip on explicit age failure; do not treat as error
-                                    pass
-                                else:
-                                    # Do not reply to own posts
-                                    if ct.user_handle and self._is_own_tweet(ct.user_handle, account, browser_manager):
-                                        logger.info(f"[{account.account_id}] Skipping own community post {ct.tweet_id} for reply.")
-                                        try:
-                                            skip_key = f"skip_own_{account.account_id}_{ct.tweet_id}"
-                                            self.file_handler.save_processed_action_key(skip_key, timestamp=datetime.now().isoformat())
-                                            self.processed_action_keys.add(skip_key)
-                                        except Exception:
-                                            pass
-                                        continue
-                                    # Build context-aware reply prompt with proper media handling
-                                    tweet_media_context = ""
-                                    tweet_inline_media = []
-                                    if ct.embedded_media_urls:
-                                        media_count = len(ct.embedded_media_urls)
-                                        tweet_media_context = f"\n[This tweet contains {media_count} media item(s)]"
-                                        for media_url in ct.embedded_media_urls[:4]:
-                                            tweet_inline_media.append({
-                                                'role': 'user',
-                                                'parts': [
-                                                    {'type': 'text', 'text': f"Media from the community tweet:"},
-                                                    {'type': 'media', 'media_type': 'image', 'source': {'type': 'url', 'url': str(media_url)}},
-                                                ],
-                                            })
-
-                                    reply_prompt = (
-                                        f"TASK: Write a concise, natural reply under 270 characters that is DIRECTLY RELEVANT to this community post.{tweet_media_context}\n\n"
-                                        f"Post by @{ct.user_handle or 'user'}:\n\"{ct.text_content}\"\n\n"
-                                        f"Your reply (stay on-topic, avoid hashtags/links/emojis):"
-                                    )
-                                    logger.info(f"[{account.account_id}] Replying to community post {ct.tweet_id}")
-                                    generated_reply_text = await llm_service.generate_text(
-                                        prompt=reply_prompt,
-                                        service_preference=llm_for_reply.service_preference,
-                                        model_name=llm_for_reply.model_name_override,
-                                        max_tokens=llm_for_reply.max_tokens,
-                                        temperature=llm_for_reply.temperature,
-                                        inline_media=tweet_inline_media,
-                                    )
-                                    generated_reply_text = (generated_reply_text or "")[:270].rstrip()
-                                    if generated_reply_text:
-                                        reply_success = await publisher.reply_to_tweet(ct, generated_reply_text)
-                                        metrics.log_event('community_reply', 'success' if reply_success else 'failure', {'tweet_id': ct.tweet_id})
-                                        if reply_success:
-                                            metrics.increment('replies')
-                                            self.file_handler.save_processed_action_key(reply_key, timestamp=datetime.now().isoformat())
-                                            self.processed_action_keys.add(reply_key)
-                                            replies_made_in_community += 1
-                                            total_community_actions += 1
-
+                                # Do not reply to own posts
+                                if ct.user_handle and _is_own_handle(ct.user_handle):
+                                    logger.info(f"[{account.account_id}] Skipping own community post {ct.tweet_id} for reply.")
+                                    try:
+                                        skip_key = f"skip_own_{account.account_id}_{ct.tweet_id}"
+                                        self.file_handler.queue_processed_action_key(skip_key)
+                                        self.processed_action_keys.add(skip_key)
+                                    except Exception:
+                                        pass
+                                    continue
+                                # Nothing to reply to: no text and no media
+                                if not ct.text_content and not ct.embedded_media_urls:
+                                    continue
+                                logger.info(f"[{account.account_id}] Replying to community post {ct.tweet_id}")
+                                generation = community_reply_generations.pop(ct.tweet_id, None) or _start_community_reply(ct)
+                                generated_reply_text = await generation
+                                generated_reply_text = truncate_text(generated_reply_text, MAX_REPLY_CHARS)
+                                if generated_reply_text:
+                                    await action_pacer.wait()
+                                    reply_success = await publisher.reply_to_tweet(ct, generated_reply_text)
+                                    metrics.buffered_log_event('community_reply', 'success' if reply_success else 'failure', {'tweet_id': ct.tweet_id})
+                                    if reply_success:
+                                        metrics.increment('replies', flush=False)
+                                        self.file_handler.queue_processed_action_key(reply_key)
+                                        self.processed_action_keys.add(reply_key)
+                                        replies_made_in_community += 1
+                                        total_community_actions += 1
+                                        if replies_made_in_community >= current_action_config.max_community_replies_per_run:
+                                            # Reply cap reached: drop prefetches before they finish.
+                                            for unused_generation in community_reply_generations.values():
+                                                unused_generation.cancel()
+                                            community_reply_generations.clear()
+
+                        metrics.flush()
                         # Backoff between actions to be human-like
                         if total_community_actions >= current_action_config.max_community_engagements_per_run:
                             break
-                        await asyncio.sleep(random.uniform(current_action_config.min_delay_between_actions_seconds, current_action_config.max_delay_between_actions_seconds))
+                        action_pacer.mark()
 
                 except Exception as e:
                     logger.error(f"[{account.account_id}] Failed during community engagement: {e}", exc_info=True)
-                    metrics.increment('errors')
+                    metrics.increment('errors', flush=False)
+                finally:
+                    # Also reached on errors and cancellation, so no prefetched reply keeps running.
+                    for unused_generation in community_reply_generations.values():
+                        unused_generation.cancel()
 
             # Action 2: Scrape keywords and reply
             target_keywords_for_account = account.target_keywords
             if current_action_config.enable_keyword_replies and target_keywords_for_account:
                 logger.info(f"[{account.account_id}] Starting keyword scraping and replying for {len(target_keywords_for_account)} keywords.")
+                recent_hours_limit = current_action_config.reply_only_to_recent_tweets_hours
+                enable_thread_analysis = current_action_config.enable_thread_analysis
+
+                def _keyword_reply_skip(tweet: ScrapedTweet) -> Optional[str]:
+                    """Return why a tweet cannot get a keyword reply ('' skips silently), or None."""
+                    if f"reply_{account.account_id}_{tweet.tweet_id}" in self.processed_action_keys:
+                        return f"Already replied or processed tweet {tweet.tweet_id}. Skipping."
+                    if current_action_config.avoid_replying_to_own_tweets and tweet.user_handle and _is_own_handle(tweet.user_handle):
+                        return f"Skipping own tweet {tweet.tweet_id} for reply."
+                    if recent_hours_limit and tweet.created_at:
+                        tweet_age_hours = (keyword_scraped_at - tweet.created_at).total_seconds() / 3600
+                        if tweet_age_hours > recent_hours_limit:
+                            return f"Skipping old tweet {tweet.tweet_id} (age: {tweet_age_hours:.1f}h > limit: {recent_hours_limit}h)."
+                    # Nothing to reply to: no text and no media
+                    if not tweet.text_content and not tweet.embedded_media_urls:
+                        return ""
+                    return None
+
+                def _prefetch_reply_analysis(tweet: ScrapedTweet) -> None:
+                    # Fills the analysis cache while the search keeps scrolling; failures are retried when needed.
+                    prefetches = []
+                    if enable_rel_reply:
+                        prefetches.append(self._score_relevance(analyzer, tweet, account))
+                    if tweet.is_thread_candidate and enable_thread_analysis:
+                        prefetches.append(self._check_thread(analyzer, tweet, llm_for_thread_analysis))
+                    for prefetch in prefetches:
+                        asyncio.ensure_future(prefetch).add_done_callback(lambda f: f.cancelled() or f.exception())
+
                 for keyword in target_keywords_for_account:
                     logger.info(f"[{account.account_id}] Processing keyword for replies: '{keyword}'")
-                    # Scrape tweets for the keyword
-                    tweets_for_keyword = await asyncio.to_thread(
-                        scraper.scrape_tweets_by_keyword,
+                    # Ages are measured against the scrape start; one clock read serves the whole batch.
+                    keyword_scraped_at = datetime.now(timezone.utc)
+                    # Stream the search so analysis of the first reply candidates overlaps the rest of the scroll.
+                    # Only as many candidates as replies are allowed are analyzed early, so no extra LLM calls
+                    # are made in the common case. Posting waits for the scrape: both drive the same browser.
+                    tweets_for_keyword = []
+                    prefetch_budget = (
+                        current_action_config.max_replies_per_keyword_run
+                        if (enable_rel_reply or enable_thread_analysis)
+                        else 0
+                    )
+                    async for scraped_tweet in scraper.stream_tweets_by_keyword(
                         keyword,
                         max_tweets=current_action_config.max_replies_per_keyword_run * 2 # Get more to filter
-                    )
-                    
-                    replies_made_this_keyword = 0
-                    for scraped_tweet_to_reply in tweets_for_keyword:
-                        if replies_made_this_keyword >= current_action_config.max_replies_per_keyword_run:
-                            break
-
-                        action_key = f"reply_{account.account_id}_{scraped_tweet_to_reply.tweet_id}"
-                        if action_key in self.processed_action_keys:
-                            logger.info(f"[{account.account_id}] Already replied or processed tweet {scraped_tweet_to_reply.tweet_id}. Skipping.")
-                            continue
-                        
-                        if current_action_config.avoid_replying_to_own_tweets and scraped_tweet_to_reply.user_handle and self._is_own_tweet(scraped_tweet_to_reply.user_handle, account, browser_manager):
-                            logger.info(f"[{account.account_id}] Skipping own tweet {scraped_tweet_to_reply.tweet_id} for reply.")
-                            continue
+                    ):
+                        tweets_for_keyword.append(scraped_tweet)
+                        if prefetch_budget > 0 and _keyword_reply_skip(scraped_tweet) is None:
+                            prefetch_budget -= 1
+                            _prefetch_reply_analysis(scraped_tweet)
 
-                        if current_action_config.reply_only_to_recent_tweets_hours and scraped_tweet_to_reply.created_at:
-                            now_utc = datetime.now(timezone.utc)
-                            tweet_age_hours = (now_utc - scraped_tweet_to_reply.created_at).total_seconds() / 3600
-                            if tweet_age_hours > current_action_config.reply_only_to_recent_tweets_hours:
-                                logger.info(f"[{account.account_id}] Skipping old tweet {scraped_tweet_to_reply.tweet_id} (age: {tweet_age_hours:.1f}h > limit: {current_action_config.reply_only_to_recent_tweets_hours}h).")
+                    replies_made_this_keyword = 0
+                    reply_batch_size = max(1, current_action_config.llm_batch_size or 1)
+                    remaining_tweets = iter(tweets_for_keyword)
+
+                    async def _prepare_reply_batch(batch_target: int):
+                        """Collect up to batch_target eligible tweets, then generate their replies
+                        together instead of one LLM round-trip per tweet."""
+                        reply_batch = []
+                        for scraped_tweet_to_reply in remaining_tweets:
+                            skip_reason = _keyword_reply_skip(scraped_tweet_to_reply)
+                            if skip_reason is not None:
+                                if skip_reason:
+                                    logger.info(f"[{account.account_id}] {skip_reason}")
                                 continue
-                        
-                        # Thread Analysis for context before replying (optional, could make reply more relevant)
-                        if scraped_tweet_to_reply.is_thread_candidate and current_action_config.enable_thread_analysis:
-                            logger.info(f"[{account.account_id}] Analyzing thread candidacy for reply target tweet {scraped_tweet_to_reply.tweet_id}...")
-                            is_confirmed = await analyzer.check_if_thread_with_llm(scraped_tweet_to_reply, custom_llm_settings=llm_for_thread_analysis)
-                            scraped_tweet_to_reply.is_confirmed_thread = is_confirmed
-                            logger.info(f"[{account.account_id}] Thread analysis for reply target {scraped_tweet_to_reply.tweet_id}: {is_confirmed}")
-
-                        # Build context-aware reply prompt with proper media handling
-                        tweet_media_context = ""
-                        tweet_inline_media = []
-                        if scraped_tweet_to_reply.embedded_media_urls:
-                            media_count = len(scraped_tweet_to_reply.embedded_media_urls)
-                            tweet_media_context = f"\n[This tweet contains {media_count} media item(s)]"
-                            for media_url in scraped_tweet_to_reply.embedded_media_urls[:4]:
-                                tweet_inline_media.append({
-                                    'role': 'user',
-                                    'parts': [
-                                        {'type': 'text', 'text': f"Media from the tweet you're replying to:"},
-                                        {'type': 'media', 'media_type': 'image', 'source': {'type': 'url', 'url': str(media_url)}},
-                                    ],
-                                })
-
-                        reply_prompt_context = (
-                            "This tweet is part of a thread." if scraped_tweet_to_reply.is_confirmed_thread else "This is a standalone tweet."
-                        )
-                        reply_prompt = (
-                            f"TASK: Write a concise, natural reply under 270 characters that is DIRECTLY RELEVANT to this tweet. "
-                            f"{reply_prompt_context}{tweet_media_context}\n\n"
-                            f"Tweet by @{scraped_tweet_to_reply.user_handle or 'user'}:\n"
-                            f"\"{scraped_tweet_to_reply.text_content}\"\n\n"
-                            f"Your reply (stay on-topic, avoid hashtags/links/emojis):"
-                        )
-                        
-                        logger.info(f"[{account.account_id}] Generating reply for tweet {scraped_tweet_to_reply.tweet_id}...")
-                        generated_reply_text = await llm_service.generate_text(
-                            prompt=reply_prompt,
-                            service_preference=llm_for_reply.service_preference,
-                            model_name=llm_for_reply.model_name_override,
-                            max_tokens=llm_for_reply.max_tokens,
-                            temperature=llm_for_reply.temperature,
-                            inline_media=tweet_inline_media,
+                            action_key = f"reply_{account.account_id}_{scraped_tweet_to_reply.tweet_id}"
+
+                            # Thread Analysis for context before replying (optional, could make reply more relevant)
+                            if scraped_tweet_to_reply.is_thread_candidate and enable_thread_analysis:
+                                logger.info(f"[{account.account_id}] Analyzing thread candidacy for reply target tweet {scraped_tweet_to_reply.tweet_id}...")
+                                is_confirmed = await self._check_thread(analyzer, scraped_tweet_to_reply, llm_for_thread_analysis)
+                                scraped_tweet_to_reply.is_confirmed_thread = is_confirmed
+                                logger.info(f"[{account.account_id}] Thread analysis for reply target {scraped_tweet_to_reply.tweet_id}: {is_confirmed}")
+
+                            # Build context-aware reply prompt with proper media handling
+                            tweet_media_context, tweet_inline_media = _reply_media_context(
+                                scraped_tweet_to_reply, "Media from the tweet you're replying to:"
+                            )
+                            reply_prompt = _KEYWORD_REPLY_PROMPT.format(
+                                thread_context=(
+                                    "This tweet is part of a thread." if scraped_tweet_to_reply.is_confirmed_thread else "This is a standalone tweet."
+                                ),
+                                media_context=tweet_media_context,
+                                handle=scraped_tweet_to_reply.user_handle or 'user',
+                                text=scraped_tweet_to_reply.text_content,
+                            )
+                            reply_batch.append((scraped_tweet_to_reply, action_key, reply_prompt, tweet_inline_media))
+                            if len(reply_batch) >= batch_target:
+                                break
+                        if not reply_batch:
+                            return reply_batch, [], []
+
+                        logger.info(f"[{account.account_id}] Generating replies for {len(reply_batch)} tweet(s) for keyword '{keyword}'...")
+                        # Relevance scores for the batch are computed alongside the replies
+                        generated_replies, reply_relevance = await asyncio.gather(
+                            llm_service.generate_text_batch(
+                                [prompt for _, _, prompt, _ in reply_batch],
+                                inline_media_list=[media for _, _, _, media in reply_batch],
+                                max_concurrency=reply_batch_size,
+                                service_preference=llm_for_reply.service_preference,
+                                model_name=llm_for_reply.model_name_override,
+                                max_tokens=llm_for_reply.max_tokens,
+                                temperature=llm_for_reply.temperature,
+                            ),
+                            _passes_relevance_batch('reply', [tweet for tweet, _, _, _ in reply_batch]),
                         )
-
-                        if not generated_reply_text:
-                            logger.error(f"[{account.account_id}] Failed to generate reply text for tweet {scraped_tweet_to_reply.tweet_id}. Skipping.")
-                            continue
-                        # Hard-cap reply length to 270 characters
-                        generated_reply_text = (generated_reply_text or "")[:270].rstrip()
+                        return reply_batch, generated_replies, reply_relevance
+
+                    next_reply_batch: Optional[asyncio.Future] = None
+                    try:
+                        while replies_made_this_keyword < current_action_config.max_replies_per_keyword_run:
+                            if next_reply_batch is not None:
+                                prepared_batch = await next_reply_batch
+                                next_reply_batch = None
+                            else:
+                                prepared_batch = await _prepare_reply_batch(min(
+                                    reply_batch_size,
+                                    current_action_config.max_replies_per_keyword_run - replies_made_this_keyword,
+                                ))
+                            reply_batch, generated_replies, reply_relevance = prepared_batch
+                            if not reply_batch:
+                                break
+                            # While this batch is posted through the browser, prepare the batch that is still
+                            # needed if every post succeeds; generation overlaps posting without extra LLM calls.
+                            lookahead = min(
+                                reply_batch_size,
+                                current_action_config.max_replies_per_keyword_run - replies_made_this_keyword - len(reply_batch),
+                            )
+                            if lookahead > 0:
+                                next_reply_batch = asyncio.ensure_future(_prepare_reply_batch(lookahead))
+
+                            for (scraped_tweet_to_reply, action_key, _, _), generated_reply_text, relevant in zip(
+                                reply_batch, generated_replies, reply_relevance
+                            ):
+                                if replies_made_this_keyword >= current_action_config.max_replies_per_keyword_run:
+                                    break
+                                if not generated_reply_text:
+                                    logger.error(f"[{account.account_id}] Failed to generate reply text for tweet {scraped_tweet_to_reply.tweet_id}. Skipping.")
+                                    continue
+                                # Hard-cap reply length to 270 characters
+                                generated_reply_text = truncate_text(generated_reply_text, MAX_REPLY_CHARS)
                         
-                        # Optional relevance filter for keyword replies
-                        try:
-                            acc_ac = account.action_config
-                            enable_rel_reply = (acc_ac.enable_relevance_filter_keyword_replies if (acc_ac and acc_ac.enable_relevance_filter_keyword_replies is not None)
-                                                else self.analysis_config.get('enable_relevance_filter', {}).get('keyword_replies', False))
-                            thr_reply = (acc_ac.relevance_threshold_keyword_replies if (acc_ac and acc_ac.relevance_threshold_keyword_replies is not None)
-                                         else float(self.analysis_config.get('thresholds', {}).get('keyword_replies_min', 0.35)))
-                            if enable_rel_reply:
-                                rel_reply = await analyzer.score_relevance(scraped_tweet_to_reply, keywords=account.target_keywords)
-                                if rel_reply < thr_reply:
-                                    logger.debug(f"[{account.account_id}] Skipping reply to {scraped_tweet_to_reply.tweet_id} (rel {rel_reply:.2f} < {thr_reply}).")
+                                # Optional relevance filter for keyword replies
+                                if not relevant:
                                     continue
-                        except Exception:
-                            pass
-
-                        logger.info(f"[{account.account_id}] Attempting to post reply to tweet {scraped_tweet_to_reply.tweet_id}...")
-                        reply_success = await publisher.reply_to_tweet(scraped_tweet_to_reply, generated_reply_text)
-                        metrics.log_event('reply', 'success' if reply_success else 'failure', {'tweet_id': scraped_tweet_to_reply.tweet_id})
-                        if reply_success:
-                            metrics.increment('replies')
-                        else:
-                            metrics.increment('errors')
-
-                        if reply_success:
-                            self.file_handler.save_processed_action_key(action_key, timestamp=datetime.now().isoformat())
-                            self.processed_action_keys.add(action_key)
-                            replies_made_this_keyword += 1
-                            await asyncio.sleep(random.uniform(current_action_config.min_delay_between_actions_seconds, current_action_config.max_delay_between_actions_seconds))
-                        else:
-                            logger.error(f"[{account.account_id}] Failed to post reply to tweet {scraped_tweet_to_reply.tweet_id}.")
-                            # Optionally, add to a temporary blocklist for this session to avoid retrying immediately
+
+                                logger.info(f"[{account.account_id}] Attempting to post reply to tweet {scraped_tweet_to_reply.tweet_id}...")
+                                await action_pacer.wait()
+                                reply_success = await publisher.reply_to_tweet(scraped_tweet_to_reply, generated_reply_text)
+                                metrics.buffered_log_event('reply', 'success' if reply_success else 'failure', {'tweet_id': scraped_tweet_to_reply.tweet_id})
+                                if reply_success:
+                                    metrics.increment('replies', flush=False)
+                                else:
+                                    metrics.increment('errors', flush=False)
+
+                                if reply_success:
+                                    self.file_handler.queue_processed_action_key(action_key)
+                                    self.processed_action_keys.add(action_key)
+                                    replies_made_this_keyword += 1
+                                    action_pacer.mark()
+                                else:
+                                    logger.error(f"[{account.account_id}] Failed to post reply to tweet {scraped_tweet_to_reply.tweet_id}.")
+                                    # Optionally, add to a temporary blocklist for this session to avoid retrying immediately
+                            metrics.flush()
+                    finally:
+                        if next_reply_batch is not None:
+                            next_reply_batch.cancel()
                     logger.info(f"[{account.account_id}] Finished processing keyword '{keyword}' for replies.")
             elif current_action_config.enable_keyword_replies:
                 logger.info(f"[{account.account_id}] Keyword replies enabled, but no target keywords configured for this account.")
@@ -1073,34 +1622,36 @@ class TwitterOrchestrator:
                         max_tweets=max(5, current_action_config.max_retweets_per_keyword_run * 3)
                     )
                     retweets_made = 0
-                    for tweet_candidate in tweets_for_keyword:
-                        if retweets_made >= current_action_config.max_retweets_per_keyword_run:
+                    max_retweets = current_action_config.max_retweets_per_keyword_run
+                    remaining_candidates = iter(tweets_for_keyword)
+                    while retweets_made < max_retweets:
+                        # Score as many candidates as retweets are still needed in one concurrent batch
+                        retweet_window = []
+                        for tweet_candidate in remaining_candidates:
+                            # Avoid retweeting own tweets
+                            if tweet_candidate.user_handle and _is_own_handle(tweet_candidate.user_handle):
+                                continue
+                            retweet_window.append(tweet_candidate)
+                            if len(retweet_window) >= max_retweets - retweets_made:
+                                break
+                        if not retweet_window:
                             break
-                        # Optional relevance filter: reuse likes filter settings if available
-                        try:
-                            acc_ac = account.action_config
-                            enable_rel_like = (acc_ac.enable_relevance_filter_likes if (acc_ac and acc_ac.enable_relevance_filter_likes is not None)
-                                               else self.analysis_config.get('enable_relevance_filter', {}).get('likes', True))
-                            thr_like = (acc_ac.relevance_threshold_likes if (acc_ac and acc_ac.relevance_threshold_likes is not None)
-                                        else float(self.analysis_config.get('thresholds', {}).get('likes_min', 0.3)))
-                            if enable_rel_like:
-                                rel_like = await analyzer.score_relevance(tweet_candidate, keywords=account.target_keywords)
-                                if rel_like < thr_like:
-                                    continue
-                        except Exception:
-                            pass
-                        # Avoid retweeting own tweets
-                        if tweet_candidate.user_handle and self._is_own_tweet(tweet_candidate.user_handle, account, browser_manager):
-                            continue
-                        interaction_success = await publisher.retweet_tweet(tweet_candidate)
-                        if interaction_success:
-                            retweets_made += 1
-                            metrics.increment('retweets')
-                            metrics.log_event('retweet', 'success', {'source': 'keyword', 'keyword': keyword, 'tweet_id': tweet_candidate.tweet_id})
-                            await asyncio.sleep(random.uniform(current_action_config.min_delay_between_actions_seconds, current_action_config.max_delay_between_actions_seconds))
-                        else:
-                            metrics.increment('errors')
-                            metrics.log_event('retweet', 'failure', {'source': 'keyword', 'keyword': keyword, 'tweet_id': tweet_candidate.tweet_id})
+                        # Optional relevance filter (likes settings)
+                        retweet_relevance = await _passes_relevance_batch('retweet', retweet_window)
+                        for tweet_candidate, relevant in zip(retweet_window, retweet_relevance):
+                            if not relevant:
+                                continue
+                            await action_pacer.wait()
+                            interaction_success = await publisher.retweet_tweet(tweet_candidate)
+                            if interaction_success:
+                                retweets_made += 1
+                                metrics.increment('retweets', flush=False)
+                                metrics.buffered_log_event('retweet', 'success', {'source': 'keyword', 'keyword': keyword, 'tweet_id': tweet_candidate.tweet_id})
+                                action_pacer.mark()
+                            else:
+                                metrics.increment('errors', flush=False)
+                                metrics.buffered_log_event('retweet', 'failure', {'source': 'keyword', 'keyword': keyword, 'tweet_id': tweet_candidate.tweet_id})
+                        metrics.flush()
                 logger.info(f"[{account.account_id}] Finished keyword-based retweets.")
 
 
@@ -1129,47 +1680,47 @@ class TwitterOrchestrator:
                             keyword,
                             max_tweets=current_action_config.max_likes_per_run * 2 # Fetch more to have options
                         )
-                        for tweet_to_like in tweets_to_potentially_like:
-                            if likes_done_this_run >= current_action_config.max_likes_per_run:
+                        remaining_like_candidates = iter(tweets_to_potentially_like)
+                        while likes_done_this_run < current_action_config.max_likes_per_run:
+                            # Score as many candidates as likes are still needed in one concurrent batch
+                            like_window = []
+                            for tweet_to_like in remaining_like_candidates:
+                                action_key = f"like_{account.account_id}_{tweet_to_like.tweet_id}"
+                                if action_key in self.processed_action_keys:
+                                    logger.info(f"[{account.account_id}] Already liked or processed tweet {tweet_to_like.tweet_id}. Skipping.")
+                                    continue
+
+                                if current_action_config.avoid_replying_to_own_tweets and tweet_to_like.user_handle and _is_own_handle(tweet_to_like.user_handle):
+                                    logger.info(f"[{account.account_id}] Skipping own tweet {tweet_to_like.tweet_id} for liking.")
+                                    continue
+
+                                like_window.append((tweet_to_like, action_key))
+                                if len(like_window) >= current_action_config.max_likes_per_run - likes_done_this_run:
+                                    break
+                            if not like_window:
                                 break
-                            
-                            action_key = f"like_{account.account_id}_{tweet_to_like.tweet_id}"
-                            if action_key in self.processed_action_keys:
-                                logger.info(f"[{account.account_id}] Already liked or processed tweet {tweet_to_like.tweet_id}. Skipping.")
-                                continue
-                            
-                            if current_action_config.avoid_replying_to_own_tweets and tweet_to_like.user_handle and self._is_own_tweet(tweet_to_like.user_handle, account, browser_manager):
-                                logger.info(f"[{account.account_id}] Skipping own tweet {tweet_to_like.tweet_id} for liking.")
-                                continue
 
                             # Optional relevance filter for likes pipeline (settings-driven)
-                            try:
-                                acc_ac = account.action_config
-                                enable_rel_like = (acc_ac.enable_relevance_filter_likes if (acc_ac and acc_ac.enable_relevance_filter_likes is not None)
-                                                   else self.analysis_config.get('enable_relevance_filter', {}).get('likes', True))
-                                thr_like = (acc_ac.relevance_threshold_likes if (acc_ac and acc_ac.relevance_threshold_likes is not None)
-                                            else float(self.analysis_config.get('thresholds', {}).get('likes_min', 0.3)))
-                                if enable_rel_like:
-                                    rel_like = await analyzer.score_relevance(tweet_to_like, keywords=account.target_keywords)
-                                    if rel_like < thr_like:
-                                        logger.debug(f"[{account.account_id}] Skipping like {tweet_to_like.tweet_id} (rel {rel_like:.2f} < {thr_like}).")
-                                        continue
-                            except Exception:
-                                pass
+                            like_relevance = await _passes_relevance_batch('like', [tweet for tweet, _ in like_window])
+                            for (tweet_to_like, action_key), relevant in zip(like_window, like_relevance):
+                                if not relevant:
+                                    continue
 
-                            logger.info(f"[{account.account_id}] Attempting to like tweet {tweet_to_like.tweet_id} from URL: {tweet_to_like.tweet_url}")
-                            like_success = await engagement.like_tweet(tweet_id=tweet_to_like.tweet_id, tweet_url=str(tweet_to_like.tweet_url) if tweet_to_like.tweet_url else None)
-                            metrics.log_event('like', 'success' if like_success else 'failure', {'tweet_id': tweet_to_like.tweet_id})
-                            
-                            if like_success:
-                                self.file_handler.save_processed_action_key(action_key, timestamp=datetime.now().isoformat())
-                                self.processed_action_keys.add(action_key)
-                                likes_done_this_run += 1
-                                await asyncio.sleep(random.uniform(current_action_config.min_delay_between_actions_seconds / 2, current_action_config.max_delay_between_actions_seconds / 2)) # Shorter delay for likes
-                                metrics.increment('likes')
-                            else:
-                                logger.warning(f"[{account.account_id}] Failed to like tweet {tweet_to_like.tweet_id}.")
-                                metrics.increment('errors')
+                                logger.info(f"[{account.account_id}] Attempting to like tweet {tweet_to_like.tweet_id} from URL: {tweet_to_like.tweet_url}")
+                                await action_pacer.wait()
+                                like_success = await engagement.like_tweet(tweet_id=tweet_to_like.tweet_id, tweet_url=str(tweet_to_like.tweet_url) if tweet_to_like.tweet_url else None)
+                                metrics.buffered_log_event('like', 'success' if like_success else 'failure', {'tweet_id': tweet_to_like.tweet_id})
+
+                                if like_success:
+                                    self.file_handler.queue_processed_action_key(action_key)
+                                    self.processed_action_keys.add(action_key)
+                                    likes_done_this_run += 1
+                                    action_pacer.mark(scale=0.5) # Shorter delay for likes
+                                    metrics.increment('likes', flush=False)
+                                else:
+                                    logger.warning(f"[{account.account_id}] Failed to like tweet {tweet_to_like.tweet_id}.")
+                                    metrics.increment('errors', flush=False)
+                            metrics.flush()
                 
                 elif current_action_config.like_tweets_from_feed:
                     logger.warning(f"[{account.account_id}] Liking tweets from feed is enabled but not yet implemented.")
@@ -1188,15 +1739,13 @@ class TwitterOrchestrator:
                     metrics.mark_run_finish()
                 except Exception:
                     pass
+            # Persist this account's queued action keys even if processing failed midway
+            self.file_handler.flush_processed_action_keys()
             # Safely log account ID
             account_id_for_log = account_dict.get('account_id', 'UnknownAccount')
             if 'account' in locals() and hasattr(account, 'account_id'):
                 account_id_for_log = account.account_id
             logger.info(f"--- Finished processing for account: {account_id_for_log} ---")
-            # The delay_between_accounts_seconds will now apply after each account finishes,
-            # but accounts will start concurrently.
-            # If a delay *between starts* is needed, a different mechanism (e.g., semaphore with delays) is required.
-            await asyncio.sleep(self.global_settings.get('delay_between_accounts_seconds', 10)) # Reduced default for concurrent example
 
     async def run(self):
         logger.info("Twitter Orchestrator starting...")
@@ -1204,12 +1753,63 @@ class TwitterOrchestrator:
             logger.warning("No accounts found in configuration. Orchestrator will exit.")
             return
 
+        # Each account owns a browser; bound how many run at once.
+        max_concurrent = max(1, int(self.global_settings.get('max_concurrent_accounts', 4) or 1))
+        account_slots = asyncio.Semaphore(max_concurrent)
+
+        # Optionally give each account its own process so blocking browser calls of one
+        # account never stall the event loop shared by the others.
+        worker_processes = max(0, int(self.global_settings.get('account_worker_processes', 0) or 0))
+        process_pool = None
+        if worker_processes:
+            process_pool = ProcessPoolExecutor(
+                max_workers=min(worker_processes, max_concurrent, len(self.accounts_data)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        # Standby browsers: start up to this many queued accounts' browsers while they wait for a slot,
+        # so an account begins work on a signed-in browser instead of paying the cold start.
+        standby_browsers = 0 if process_pool is not None else max(0, int(self.global_settings.get('browser_standby_accounts', 0) or 0))
+        warm_slots = asyncio.Semaphore(max_concurrent + standby_browsers)
+
+        async def _process_account_bounded(account_dict: dict):
+            if process_pool is not None:
+                async with account_slots:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(process_pool, _process_account_in_worker, account_dict)
+            async with warm_slots:
+                browser_manager = None
+                warm_up = None
+                try:
+                    if standby_browsers and account_dict.get('is_active', True):
+                        browser_manager = BrowserManager(account_config=account_dict)
+                        warm_up = asyncio.ensure_future(asyncio.to_thread(browser_manager.get_driver))
+                    async with account_slots:
+                        if warm_up is not None:
+                            try:
+                                await warm_up
+                            except Exception as e:
+                                # The driver is started again lazily on first use.
+                                logger.warning(f"Standby browser for account {account_dict.get('account_id')} failed to start: {e}")
+                        return await self._process_account(account_dict, browser_manager=browser_manager)
+                finally:
+                    if browser_manager is not None:
+                        if warm_up is not None and not warm_up.done():
+                            await asyncio.wait([warm_up])
+                        # No-op when _process_account already closed it.
+                        browser_manager.close_driver()
+
         tasks = []
         for account_dict in self.accounts_data:
-            tasks.append(self._process_account(account_dict))
+            tasks.append(_process_account_bounded(account_dict))
         
-        logger.info(f"Starting concurrent processing for {len(tasks)} accounts.")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Starting concurrent processing for {len(tasks)} accounts (up to {max_concurrent} at a time).")
+        try:
+            results = await self._with_key_flusher(asyncio.gather(*tasks, return_exceptions=True))
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
+        self.file_handler.flush_processed_action_keys()
         
         for i, result in enumerate(results):
             account_id = self.accounts_data[i].get('account_id', f"AccountIndex_{i}")
@@ -1221,7 +1821,22 @@ class TwitterOrchestrator:
         logger.info("Twitter Orchestrator finished processing all accounts.")
 
 
+def _process_account_in_worker(account_dict: dict) -> None:
+    """Process one account in a worker process with its own orchestrator, browser and event loop.
+
+    Action keys are per account, so each worker's freshly loaded processed-key set is complete.
+    """
+    orchestrator = TwitterOrchestrator()
+    asyncio.run(orchestrator._with_key_flusher(orchestrator._process_account(account_dict)))
+
+
 if __name__ == "__main__":
+    try:  # Optional faster event loop; uvloop is not available on Windows
+        import uvloop
+    except ImportError:
+        uvloop = None
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     orchestrator = TwitterOrchestrator()
     try:
         asyncio.run(orchestrator.run())
@@ -2,9 +2,14 @@ import os
 import logging
 import sys
 import csv
+import io
 import json
+import mmap
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Set, List, Optional, Dict, Any
+from typing import Set, List, Optional, Dict, Any, Callable, Iterator
 from datetime import datetime, timezone, date # Added date for JSON encoding helpers
 
 try: # Optional import for better serialization of Pydantic types
@@ -12,6 +17,12 @@ try: # Optional import for better serialization of Pydantic types
 except ImportError: # pragma: no cover - fallback when Pydantic is unavailable
     _pydantic_encoder = None
 
+try: # Inter-process file locks: fcntl on POSIX, msvcrt on Windows
+    import fcntl
+except ImportError: # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
 # Adjust import path for ConfigLoader and setup_logger
 try:
     from ..core.config_loader import ConfigLoader
@@ -28,6 +39,26 @@ config_loader_instance = ConfigLoader() # Initialize once
 setup_logger(config_loader_instance)
 logger = logging.getLogger(__name__)
 
+
+@contextmanager
+def _exclusive_file_lock(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive OS lock on lock_path, blocking until other processes release it."""
+    with lock_path.open(mode='a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else: # pragma: no cover - Windows
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else: # pragma: no cover - Windows
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
 # Define project root relative to this file's location (src/utils/file_handler.py)
 # Path(__file__) -> current file
 # .resolve() -> absolute path
@@ -37,6 +68,11 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
 class FileHandler:
+    # queue_processed_action_key signals flush_due_callback once this many rows are pending;
+    # callers flush in the background then, and at least every PROCESSED_FLUSH_INTERVAL_SECONDS
+    PROCESSED_FLUSH_BATCH = 32
+    PROCESSED_FLUSH_INTERVAL_SECONDS = 5.0
+
     def __init__(self, config_loader: Optional[ConfigLoader] = None):
         if config_loader is None:
             self.config_loader = config_loader_instance
@@ -54,6 +90,17 @@ class FileHandler:
         # Ensure the directory for the processed tweets file exists
         self.ensure_directory_exists(self.processed_tweets_file_path.parent)
 
+        # Rows queued by queue_processed_action_key, appended to the CSV in batches
+        self._pending_action_rows: List[List[str]] = []
+        # Flushes may run in worker threads while the event loop keeps queueing
+        self._pending_action_lock = threading.Lock()
+        # Sidecar lock file: account worker processes append to the same CSV
+        self._processed_lock_path: Path = self.processed_tweets_file_path.with_name(
+            f"{self.processed_tweets_file_path.name}.lock"
+        )
+        # Set by the background flusher; called (never flushed inline) once a batch is due
+        self.flush_due_callback: Optional[Callable[[], None]] = None
+
     def ensure_directory_exists(self, dir_path: Path) -> None:
         """Ensures that the specified directory exists, creating it if necessary."""
         try:
@@ -79,46 +126,65 @@ class FileHandler:
 
         try:
             today_date = datetime.now(timezone.utc).date()
+            today_iso = today_date.isoformat()
             timestamp_col_idx = -1
 
-            with self.processed_tweets_file_path.open(mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                header = next(reader, None)
-                if header is None:
+            with self.processed_tweets_file_path.open(mode='rb') as raw_file:
+                if os.fstat(raw_file.fileno()).st_size == 0:
                     logger.warning(f"Processed actions file is empty: {self.processed_tweets_file_path}")
                     return processed_keys
+                with mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    header_end = mapped.find(b'\n')
+                    if header_end == -1:
+                        header_end = len(mapped)
+                    header = next(csv.reader([mapped[:header_end].decode('utf-8')]), None) or []
+                    # Try to find the 'timestamp' column index
+                    try:
+                        timestamp_col_idx = header.index('timestamp')
+                    except ValueError:
+                        timestamp_col_idx = -1
+                        body_start = header_end + 1
+                    else:
+                        # Keys are appended in time order: rows before the first mention of today's
+                        # date belong to earlier days and are never decoded.
+                        first_today = mapped.find(today_iso.encode('ascii'), header_end)
+                        body_start = len(mapped) if first_today == -1 else mapped.rfind(b'\n', 0, first_today) + 1
+                    body = mapped[body_start:].decode('utf-8')
+            # newline='' keeps quoted newlines intact; str.splitlines() would also split on \x85, \u2028, ...
+            reader = csv.reader(io.StringIO(body, newline=''))
+
+            if timestamp_col_idx == -1:
+                logger.warning(f"'timestamp' column not found in header of {self.processed_tweets_file_path}. Cannot filter by day. Loading all keys.")
+                # Fallback to loading all keys if no timestamp column
+                for row in reader:
+                    if row: processed_keys.add(row[0])
+                logger.info(f"Loaded {len(processed_keys)} processed action keys (all, no timestamp filter) from {self.processed_tweets_file_path}")
+                return processed_keys
 
-                # Try to find the 'timestamp' column index
+            for row in reader:
+                if not row or len(row) <= timestamp_col_idx:
+                    continue # Skip empty or short rows
+                
+                action_key = row[0]
+                timestamp_str = row[timestamp_col_idx]
+                # Most of the history is from earlier days: a YYYY-MM-DD prefix for another
+                # date can be skipped without parsing the full timestamp.
+                if timestamp_str[4:5] == '-' and timestamp_str[7:8] == '-' and timestamp_str[:10] != today_iso:
+                    continue
+                
                 try:
-                    timestamp_col_idx = header.index('timestamp')
+                    action_datetime = datetime.fromisoformat(timestamp_str)
+                    # Ensure datetime is timezone-aware for correct comparison if needed, or convert to UTC
+                    if action_datetime.tzinfo is None:
+                        action_datetime = action_datetime.replace(tzinfo=timezone.utc) # Assume UTC if naive
+                    
+                    if action_datetime.date() == today_date:
+                        processed_keys.add(action_key)
                 except ValueError:
-                    logger.warning(f"'timestamp' column not found in header of {self.processed_tweets_file_path}. Cannot filter by day. Loading all keys.")
-                    # Fallback to loading all keys if no timestamp column
-                    for row in reader:
-                        if row: processed_keys.add(row[0])
-                    logger.info(f"Loaded {len(processed_keys)} processed action keys (all, no timestamp filter) from {self.processed_tweets_file_path}")
-                    return processed_keys
+                    logger.warning(f"Could not parse timestamp '{timestamp_str}' for action_key '{action_key}'. Skipping this entry for daily check.")
+                    # Optionally, still add the key if timestamp is unparseable but you want to be conservative
+                    # processed_keys.add(action_key) 
 
-                for row in reader:
-                    if not row or len(row) <= timestamp_col_idx:
-                        continue # Skip empty or short rows
-                    
-                    action_key = row[0]
-                    timestamp_str = row[timestamp_col_idx]
-                    
-                    try:
-                        action_datetime = datetime.fromisoformat(timestamp_str)
-                        # Ensure datetime is timezone-aware for correct comparison if needed, or convert to UTC
-                        if action_datetime.tzinfo is None:
-                            action_datetime = action_datetime.replace(tzinfo=timezone.utc) # Assume UTC if naive
-                        
-                        if action_datetime.date() == today_date:
-                            processed_keys.add(action_key)
-                    except ValueError:
-                        logger.warning(f"Could not parse timestamp '{timestamp_str}' for action_key '{action_key}'. Skipping this entry for daily check.")
-                        # Optionally, still add the key if timestamp is unparseable but you want to be conservative
-                        # processed_keys.add(action_key) 
-            
             logger.info(f"Loaded {len(processed_keys)} processed action keys from today ({today_date.isoformat()}) from {self.processed_tweets_file_path}")
         except StopIteration: # Handles empty file after header read attempt
              logger.warning(f"Processed actions file {self.processed_tweets_file_path} contains only a header or is empty.")
@@ -189,6 +255,50 @@ class FileHandler:
             logger.error(f"Error saving action_key {action_key} to {self.processed_tweets_file_path}: {e}")
             return False
 
+    def queue_processed_action_key(self, action_key: str, timestamp: Optional[str] = None) -> None:
+        """
+        Buffers a processed action_key for a batched append to the CSV file.
+        Never writes itself: once PROCESSED_FLUSH_BATCH rows accumulate, flush_due_callback is
+        called so the owner can run flush_processed_action_keys() off the event loop. Call
+        flush_processed_action_keys() periodically and before shutdown to write the remainder.
+        """
+        with self._pending_action_lock:
+            self._pending_action_rows.append([action_key, timestamp or datetime.now().isoformat()])
+            pending = len(self._pending_action_rows)
+        callback = self.flush_due_callback
+        if pending >= self.PROCESSED_FLUSH_BATCH and callback is not None:
+            callback()
+
+    def flush_processed_action_keys(self) -> bool:
+        """
+        Appends all queued action_keys to the CSV file in a single write.
+        Returns True on success (or nothing to write), False on failure; failed rows stay queued.
+        Safe to call from a worker thread.
+        """
+        with self._pending_action_lock:
+            return self._write_pending_action_rows()
+
+    def _write_pending_action_rows(self) -> bool:
+        if not self._pending_action_rows:
+            return True
+        rows = self._pending_action_rows
+        try:
+            # Held across the header check and the append so rows (and the header) from
+            # concurrent account worker processes never interleave.
+            with _exclusive_file_lock(self._processed_lock_path):
+                file_exists_and_not_empty = self.processed_tweets_file_path.exists() and self.processed_tweets_file_path.stat().st_size > 0
+                with self.processed_tweets_file_path.open(mode='a', newline='', encoding='utf-8') as file:
+                    writer = csv.writer(file)
+                    if not file_exists_and_not_empty:
+                        writer.writerow(['action_key', 'timestamp'])
+                    writer.writerows(rows)
+            self._pending_action_rows = []
+            logger.debug(f"Saved {len(rows)} queued action_keys to {self.processed_tweets_file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving {len(rows)} queued action_keys to {self.processed_tweets_file_path}: {e}")
+            return False
+
     # --- Generic File Utilities ---
 
     def read_text(self, file_path: Path) -> Optional[str]:
@@ -253,15 +363,32 @@ class FileHandler:
         return str(obj)
 
     def write_json(self, file_path: Path, data: Dict[str, Any], indent: int = 4) -> bool:
-        """Writes data to a JSON file. Ensures directory exists."""
+        """Writes data to a JSON file. Ensures directory exists.
+
+        The file is replaced atomically: readers see either the old or the new content.
+        """
+        tmp_path: Optional[Path] = None
         try:
             self.ensure_directory_exists(file_path.parent)
-            with file_path.open('w', encoding='utf-8') as file:
-                json.dump(data, file, indent=indent, ensure_ascii=False, default=self._json_default_encoder)
+            # Serialize up front so the file is written in one call rather than many small chunks.
+            payload = json.dumps(data, indent=indent, ensure_ascii=False, default=self._json_default_encoder)
+            # A unique temp file per write, so concurrent writers never share (or clobber) one.
+            with tempfile.NamedTemporaryFile(
+                mode='w', encoding='utf-8', dir=file_path.parent,
+                prefix=f"{file_path.name}.", suffix='.tmp', delete=False,
+            ) as tmp_file:
+                tmp_path = Path(tmp_file.name)
+                tmp_file.write(payload)
+            os.replace(tmp_path, file_path)
             logger.debug(f"Successfully wrote JSON to file: {file_path}")
             return True
         except Exception as e:
             logger.error(f"Error writing JSON to file {file_path}: {e}")
+            if tmp_path is not None:
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
             return False
 
     def list_files(self, directory_path: Path, pattern: str = "*") -> List[Path]:
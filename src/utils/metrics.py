@@ -1,8 +1,14 @@
 import json
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+try:  # Optional faster serializer for the JSONL event log
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - fallback when orjson is unavailable
+    _orjson = None
+
 try:
     from ..core.config_loader import ConfigLoader
 except ImportError:
@@ -18,8 +24,14 @@ class MetricsRecorder:
     - JSON summary at data/metrics/<account_id>.json
     - JSONL events at logs/accounts/<account_id>.jsonl
     Paths are relative to project root.
+    Buffered updates are written by flush(), which the action loops call after each
+    batch (or each post, where posts are handled one at a time) and mark_run_finish()
+    calls at the end; a recorder call made at least FLUSH_INTERVAL_SECONDS after the
+    last flush also writes them.
     """
 
+    FLUSH_INTERVAL_SECONDS = 0.5
+
     def __init__(self, account_id: str, config_loader: ConfigLoader):
         self.account_id = account_id
         self.config_loader = config_loader
@@ -34,6 +46,10 @@ class MetricsRecorder:
         self.events_path = self.logs_dir / f'{self.account_id}.jsonl'
         # Cached summary
         self.summary: Dict[str, Any] = self._load_summary()
+        # Buffered JSONL lines and pending summary changes, written by flush()
+        self._pending_events: List[str] = []
+        self._summary_dirty = False
+        self._last_flush = time.monotonic()
 
     def _load_summary(self) -> Dict[str, Any]:
         if self.summary_path.exists():
@@ -61,13 +77,19 @@ class MetricsRecorder:
 
     def mark_run_finish(self):
         self.summary['last_run_finished_at'] = datetime.utcnow().isoformat()
-        self._flush_summary()
+        self._summary_dirty = True
+        self.flush()
 
-    def increment(self, key: str, by: int = 1):
+    def increment(self, key: str, by: int = 1, flush: bool = True):
+        """Bump a counter; with flush=False the summary is written on the next flush()."""
         self.summary['counters'][key] = int(self.summary['counters'].get(key, 0)) + by
-        self._flush_summary()
+        if flush:
+            self._flush_summary()
+        else:
+            self._summary_dirty = True
+            self._maybe_flush()
 
-    def log_event(self, action: str, result: str, metadata: Optional[Dict[str, Any]] = None):
+    def _event_line(self, action: str, result: str, metadata: Optional[Dict[str, Any]]) -> str:
         payload = {
             'ts': datetime.utcnow().isoformat(),
             'account_id': self.account_id,
@@ -75,8 +97,35 @@ class MetricsRecorder:
             'result': result,
             'meta': metadata or {},
         }
+        if _orjson is not None:
+            return _orjson.dumps(payload).decode('utf-8') + '\n'
+        return json.dumps(payload, ensure_ascii=False) + '\n'
+
+    def log_event(self, action: str, result: str, metadata: Optional[Dict[str, Any]] = None):
+        line = self._event_line(action, result, metadata)
         with self.events_path.open('a', encoding='utf-8') as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + '\n')
+            f.write(line)
+
+    def buffered_log_event(self, action: str, result: str, metadata: Optional[Dict[str, Any]] = None):
+        """Like log_event, but the line is only written on the next flush()."""
+        self._pending_events.append(self._event_line(action, result, metadata))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Write buffered events in a single append and the summary if counters changed."""
+        self._last_flush = time.monotonic()
+        if self._pending_events:
+            lines = ''.join(self._pending_events)
+            self._pending_events.clear()
+            with self.events_path.open('a', encoding='utf-8') as f:
+                f.write(lines)
+        if self._summary_dirty:
+            self._summary_dirty = False
+            self._flush_summary()
 
     def _flush_summary(self):
         self.summary_path.write_text(json.dumps(self.summary, ensure_ascii=False, indent=2), encoding='utf-8')
@@ -5,14 +5,17 @@ in constrained environments (e.g. headless automation workers).
 """
 from __future__ import annotations
 
+import heapq
 import re
+import unicodedata
 from collections import Counter
-from typing import Iterable, List, Sequence, Set
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Sequence, Set, Tuple
 
 _TOKEN_PATTERN = re.compile(r"[A-Za-z0-9']+")
 # A compact stopword list to filter out non-informative tokens. We avoid pulling in
 # external libraries to keep the runtime light. Only include lowercase entries.
-_STOPWORDS: Set[str] = {
+_STOPWORDS: FrozenSet[str] = frozenset({
     "a",
     "an",
     "and",
@@ -80,7 +83,7 @@ _STOPWORDS: Set[str] = {
     "http",
     "https",
     "www",
-}
+})
 
 _HUMOR_MARKERS = {"lol", "lmao", "haha", "haha", "hehe", "😂", "🤣", "🤣", "😹", "meme"}
 _TECH_MARKERS = {
@@ -110,6 +113,19 @@ _SENTIMENT_MARKERS = {
     "thrilled": 1,
     "furious": -1,
 }
+# Word markers are matched against tokens (so "ai" no longer fires inside "said");
+# emoji never survive tokenization and are still matched as substrings.
+_HUMOR_WORD_MARKERS = frozenset(m for m in _HUMOR_MARKERS if _TOKEN_PATTERN.fullmatch(m))
+_HUMOR_EMOJI_MARKERS = tuple(m for m in _HUMOR_MARKERS if m not in _HUMOR_WORD_MARKERS)
+_TECH_MARKER_SET = frozenset(_TECH_MARKERS)
+# One alternation over every humor marker: whole words (any case) or emoji, first hit wins
+_HUMOR_RE = re.compile(
+    r"\b(?:" + "|".join(sorted(re.escape(m) for m in _HUMOR_WORD_MARKERS)) + r")\b|"
+    + "|".join(sorted(re.escape(m) for m in _HUMOR_EMOJI_MARKERS)),
+    re.I,
+)
+# Extension of a media URL, ignoring any query string or fragment; anything else counts as an image.
+_MEDIA_EXT_RE = re.compile(r"\.(gif|mp4|m3u8)(?:[?#]|$)", re.I)
 
 
 def _tokenize(text: str) -> List[str]:
@@ -127,51 +143,37 @@ def tokenize_for_overlap(text: str) -> Set[str]:
     }
 
 
-def extract_keywords_from_texts(
-    texts: Iterable[str],
-    *,
-    max_keywords: int = 8,
-    min_frequency: int = 1,
-) -> List[str]:
-    """Extract top keywords from the supplied texts using a simple frequency tally."""
-    counter: Counter[str] = Counter()
-    for text in texts:
-        for token in _tokenize(text):
-            if len(token) <= 2:
-                continue
-            if token in _STOPWORDS:
-                continue
-            counter[token] += 1
+def _count_keyword_tokens(counter: Counter[str], tokens: Iterable[str]) -> None:
+    stopwords = _STOPWORDS
+    counter.update(token for token in tokens if len(token) > 2 and token not in stopwords)
+
+
+def _rank_keywords(counter: Counter[str], max_keywords: int, min_frequency: int) -> List[str]:
     if not counter:
         return []
     filtered = [token for token, count in counter.items() if count >= min_frequency]
     if not filtered:
         filtered = list(counter.keys())
-    top_tokens = sorted(
+    # Only the top few are kept: select them without sorting every distinct token.
+    return heapq.nlargest(
+        max_keywords,
         filtered,
         key=lambda t: (counter[t], -len(t), t),
-        reverse=True,
     )
-    return top_tokens[:max_keywords]
 
 
-def infer_tone_from_samples(texts: Sequence[str]) -> str:
-    """Infer a coarse tone from sample texts (playful, technical, or conversational)."""
-    humor_score = 0
-    tech_score = 0
-    exclamation_score = 0
-    sentiment_score = 0
+def _score_tone(text: str, tokens: List[str], scores: List[int]) -> None:
+    """Accumulate [humor, tech, exclamation, sentiment] scores for one text and its tokens."""
+    token_set = set(tokens)
+    scores[0] += len(token_set & _HUMOR_WORD_MARKERS) + sum(1 for marker in _HUMOR_EMOJI_MARKERS if marker in text)
+    scores[1] += len(token_set & _TECH_MARKER_SET)
+    scores[2] += text.count("!")
+    sentiment = _SENTIMENT_MARKERS.get
+    scores[3] += sum(sentiment(token, 0) for token in tokens)
 
-    for text in texts:
-        if not text:
-            continue
-        lowered = text.lower()
-        humor_score += sum(1 for marker in _HUMOR_MARKERS if marker in lowered)
-        tech_score += sum(1 for marker in _TECH_MARKERS if marker in lowered)
-        exclamation_score += lowered.count("!")
-        for marker, weight in _SENTIMENT_MARKERS.items():
-            sentiment_score += lowered.count(marker) * weight
 
+def _classify_tone(scores: Sequence[int]) -> str:
+    humor_score, tech_score, exclamation_score, sentiment_score = scores
     if humor_score >= max(1, tech_score // 2):
         return "playful"
     if tech_score > 0 and tech_score >= humor_score:
@@ -183,6 +185,51 @@ def infer_tone_from_samples(texts: Sequence[str]) -> str:
     return "conversational"
 
 
+def extract_keywords_from_texts(
+    texts: Iterable[str],
+    *,
+    max_keywords: int = 8,
+    min_frequency: int = 1,
+) -> List[str]:
+    """Extract top keywords from the supplied texts using a simple frequency tally."""
+    counter: Counter[str] = Counter()
+    for text in texts:
+        _count_keyword_tokens(counter, _tokenize(text))
+    return _rank_keywords(counter, max_keywords, min_frequency)
+
+
+def infer_tone_from_samples(texts: Sequence[str]) -> str:
+    """Infer a coarse tone from sample texts (playful, technical, or conversational)."""
+    scores = [0, 0, 0, 0]
+    for text in texts:
+        if not text:
+            continue
+        _score_tone(text, _tokenize(text), scores)
+    return _classify_tone(scores)
+
+
+def analyze_texts(
+    texts: Iterable[str],
+    *,
+    max_keywords: int = 8,
+    min_frequency: int = 1,
+) -> Tuple[List[str], str]:
+    """Return (keywords, tone) from a single pass over the texts.
+
+    Equivalent to calling extract_keywords_from_texts and infer_tone_from_samples
+    separately, without walking the samples twice.
+    """
+    counter: Counter[str] = Counter()
+    scores = [0, 0, 0, 0]
+    for text in texts:
+        if not text:
+            continue
+        tokens = _tokenize(text)
+        _count_keyword_tokens(counter, tokens)
+        _score_tone(text, tokens, scores)
+    return _rank_keywords(counter, max_keywords, min_frequency), _classify_tone(scores)
+
+
 def estimate_media_usage_ratio(entries_with_media: int, total_entries: int) -> float:
     if total_entries <= 0:
         return 0.0
@@ -190,27 +237,20 @@ def estimate_media_usage_ratio(entries_with_media: int, total_entries: int) -> f
 
 
 def is_probably_humorous(text: str) -> bool:
-    tokens = tokenize_for_overlap(text)
-    if not tokens:
-        return False
-    humor_tokens = tokens.intersection({marker.strip("#") for marker in _HUMOR_MARKERS})
-    return bool(humor_tokens)
+    return bool(text) and _HUMOR_RE.search(text) is not None
 
 
 def describe_media_urls(urls: Sequence[str]) -> str:
     if not urls:
         return "No media attached."
-    image_types = 0
-    video_types = 0
-    gif_types = 0
+    counts = {"gif": 0, "mp4": 0, "m3u8": 0}
     for url in urls:
-        lowered = url.lower()
-        if lowered.endswith((".gif",)):
-            gif_types += 1
-        elif lowered.endswith((".mp4", "m3u8")):
-            video_types += 1
-        else:
-            image_types += 1
+        match = _MEDIA_EXT_RE.search(url)
+        if match:
+            counts[match.group(1).lower()] += 1
+    gif_types = counts["gif"]
+    video_types = counts["mp4"] + counts["m3u8"]
+    image_types = len(urls) - gif_types - video_types
     segments = []
     if image_types:
         segments.append(f"{image_types} image(s)")
@@ -222,13 +262,103 @@ def describe_media_urls(urls: Sequence[str]) -> str:
     return f"Media detected: {summary}."
 
 
+# '@Name', 'Name?s=1' or 'https://(mobile.)x.com/Name/...' -> 'Name'; other URLs don't match.
+_HANDLE_RE = re.compile(r"^(?:(?:https?://)?(?:[\w-]+\.)*x\.com/|/?(?!https?://))@*(?P<handle>[^/?#@]+)", re.I)
+
+
+@lru_cache(maxsize=4096)
+def normalize_handle(value: str | None) -> str | None:
+    """Normalize an X handle, profile path or URL ('@Name', '/Name', 'x.com/Name?s=1') to 'name'."""
+    if not value:
+        return None
+    # Fast path: a bare lowercase handle (the common scraped case) is already normalized.
+    if (
+        isinstance(value, str)
+        and value.islower()
+        and not value[0].isspace()
+        and not value[-1].isspace()
+        and "@" not in value
+        and "/" not in value
+        and "?" not in value
+        and "#" not in value
+    ):
+        return value
+    match = _HANDLE_RE.match(str(value).strip())
+    return match.group("handle").lower() if match else None
+
+
+_DEDUPE_NOISE_RE = re.compile(r"https?://\S+|^rt @\w+:|[^\w\s@#']+")
+
+
+def normalize_for_dedupe(text: str | None) -> str:
+    """Reduce a tweet text to a key shared by reposts and trivial re-wordings of it.
+
+    Case, links (t.co links differ per post), a leading 'RT @user:' marker,
+    punctuation and whitespace runs are ignored.
+    """
+    if not text:
+        return ""
+    return " ".join(_DEDUPE_NOISE_RE.sub(" ", text.lower()).split())
+
+
+_ZERO_WIDTH_JOINER = "\u200d"
+
+
+def _is_regional_indicator(char: str) -> bool:
+    return 0x1F1E6 <= ord(char) <= 0x1F1FF
+
+
+def _continues_cluster(text: str, index: int) -> bool:
+    """True if text[index] belongs to the same user-perceived character as text[index - 1]."""
+    char = text[index]
+    if _is_regional_indicator(char):
+        # Flags are pairs of regional indicators: text[index] completes a flag when an
+        # odd number of indicators directly precede it.
+        run = 0
+        while index - run - 1 >= 0 and _is_regional_indicator(text[index - run - 1]):
+            run += 1
+        return run % 2 == 1
+    code = ord(char)
+    return (
+        text[index - 1] == _ZERO_WIDTH_JOINER
+        or char == _ZERO_WIDTH_JOINER
+        or 0xFE00 <= code <= 0xFE0F  # variation selectors
+        or 0x1F3FB <= code <= 0x1F3FF  # emoji skin-tone modifiers
+        or 0xE0020 <= code <= 0xE007F  # emoji tag sequences
+        or unicodedata.category(char) in ("Mn", "Mc", "Me")
+    )
+
+
+def truncate_text(text: str | None, limit: int) -> str:
+    """Cut text to at most ``limit`` code points and strip trailing whitespace.
+
+    A combined character (accents, emoji with modifiers or joiners, flags) that would
+    straddle the limit is dropped whole instead of being split.
+    """
+    if not text:
+        return ""
+    if len(text) <= limit:
+        return text.rstrip()
+    end = limit
+    while end > 0 and _continues_cluster(text, end):
+        end -= 1
+    return text[:end].rstrip()
+
+
 def harmonic_mean(values: Sequence[float]) -> float:
-    cleaned = [v for v in values if v > 0]
-    if not cleaned:
+    # One pass over the positive values; no intermediate list.
+    count = 0
+    reciprocal_sum = 0.0
+    for v in values:
+        if v > 0:
+            count += 1
+            reciprocal_sum += 1.0 / v
+    if not count:
         return 0.0
-    return round(len(cleaned) / sum(1.0 / v for v in cleaned), 4)
+    return round(count / reciprocal_sum, 4)
 
 __all__ = [
+    "analyze_texts",
     "extract_keywords_from_texts",
     "tokenize_for_overlap",
     "infer_tone_from_samples",
@@ -236,4 +366,7 @@ __all__ = [
     "is_probably_humorous",
     "describe_media_urls",
     "harmonic_mean",
+    "normalize_for_dedupe",
+    "normalize_handle",
+    "truncate_text",
 ]
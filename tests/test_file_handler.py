@@ -0,0 +1,129 @@
+"""Tests for FileHandler: the processed action keys log and atomic JSON writes."""
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Ensure the project src/ directory is on sys.path for direct imports
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from utils.file_handler import FileHandler  # noqa: E402  pylint: disable=wrong-import-position
+
+
+class StubConfigLoader:
+    """Points FileHandler at a processed-actions file under the test's tmp_path."""
+
+    def __init__(self, processed_file: Path):
+        self._settings = {"processed_tweets_file": str(processed_file)}
+
+    def get_twitter_automation_setting(self, key, default=None):
+        return self._settings
+
+
+def _handler_for(tmp_path: Path, content: bytes) -> FileHandler:
+    processed_file = tmp_path / "processed_tweets_log.csv"
+    processed_file.write_bytes(content)
+    return FileHandler(config_loader=StubConfigLoader(processed_file))
+
+
+def _timestamp(days_ago: int) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat()
+
+
+def test_load_processed_action_keys_keeps_only_todays_rows(tmp_path):
+    today_iso = datetime.now(timezone.utc).date().isoformat()
+    rows = [
+        "action_key,timestamp",
+        f"reply_acc_1,{_timestamp(2)}",
+        # Mentions today's date outside the timestamp column; still an old row.
+        f"reply_acc_{today_iso},{_timestamp(1)}",
+        f"like_acc_2,{_timestamp(1)}",
+        f"reply_acc_3,{_timestamp(0)}",
+        f"like_acc_4,{_timestamp(0)}",
+    ]
+    handler = _handler_for(tmp_path, ("\n".join(rows) + "\n").encode("utf-8"))
+
+    assert handler.load_processed_action_keys() == {"reply_acc_3", "like_acc_4"}
+
+
+def test_load_processed_action_keys_handles_crlf_line_endings(tmp_path):
+    rows = [
+        "action_key,timestamp",
+        f"reply_acc_1,{_timestamp(1)}",
+        f"reply_acc_2,{_timestamp(0)}",
+    ]
+    handler = _handler_for(tmp_path, ("\r\n".join(rows) + "\r\n").encode("utf-8"))
+
+    assert handler.load_processed_action_keys() == {"reply_acc_2"}
+
+
+
+def test_load_processed_action_keys_keeps_keys_with_unicode_line_separators(tmp_path):
+    rows = [
+        "action_key,timestamp",
+        f"reply_acc_1\u2028tail,{_timestamp(0)}",
+        f"\"reply_acc_2\nquoted\",{_timestamp(0)}",
+        f"like_acc_3\x85,{_timestamp(0)}",
+    ]
+    handler = _handler_for(tmp_path, ("\n".join(rows) + "\n").encode("utf-8"))
+
+    assert handler.load_processed_action_keys() == {
+        "reply_acc_1\u2028tail",
+        "reply_acc_2\nquoted",
+        "like_acc_3\x85",
+    }
+
+def test_load_processed_action_keys_returns_empty_for_header_only_file(tmp_path):
+    handler = _handler_for(tmp_path, b"action_key,timestamp\n")
+
+    assert handler.load_processed_action_keys() == set()
+
+
+def test_load_processed_action_keys_loads_all_rows_without_timestamp_column(tmp_path):
+    handler = _handler_for(tmp_path, b"action_key,account\nreply_acc_1,acc\nlike_acc_2,acc\n")
+
+    assert handler.load_processed_action_keys() == {"reply_acc_1", "like_acc_2"}
+
+
+def test_queue_processed_action_key_signals_full_batch_without_writing(tmp_path):
+    handler = _handler_for(tmp_path, b"")
+    signals = []
+    handler.flush_due_callback = lambda: signals.append(True)
+
+    for index in range(handler.PROCESSED_FLUSH_BATCH - 1):
+        handler.queue_processed_action_key(f"reply_acc_{index}")
+    assert not signals
+
+    handler.queue_processed_action_key("reply_acc_last")
+    assert signals
+    assert handler.processed_tweets_file_path.read_bytes() == b""
+
+    assert handler.flush_processed_action_keys()
+    assert "reply_acc_last" in handler.load_processed_action_keys()
+
+
+def test_write_json_replaces_file_without_leaving_temp_files(tmp_path):
+    handler = _handler_for(tmp_path, b"")
+    target = tmp_path / "state" / "data.json"
+
+    assert handler.write_json(target, {"count": 1})
+    assert handler.write_json(target, {"count": 2, "name": "café"})
+
+    assert handler.read_json(target) == {"count": 2, "name": "café"}
+    assert sorted(path.name for path in target.parent.iterdir()) == ["data.json"]
+
+
+def test_flush_processed_action_keys_writes_one_header_under_a_sidecar_lock(tmp_path):
+    handler = _handler_for(tmp_path, b"")
+    for key in ("reply_acc_1", "like_acc_2"):
+        handler.queue_processed_action_key(key)
+        assert handler.flush_processed_action_keys()
+
+    lines = handler.processed_tweets_file_path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "action_key,timestamp"
+    assert [line.split(",")[0] for line in lines[1:]] == ["reply_acc_1", "like_acc_2"]
+    assert (tmp_path / "processed_tweets_log.csv.lock").exists()
@@ -1,8 +1,11 @@
 """Tests for guarded reply generation guardrails."""
 from __future__ import annotations
 
+import asyncio
+import logging
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -123,6 +126,84 @@ async def test_generate_guarded_reply_retries_on_off_topic_terms():
     assert len(stub_service.calls) == 2
 
 
+@pytest.mark.asyncio
+async def test_generate_guarded_reply_retries_when_reply_exceeds_limit():
+    tweet = ScrapedTweet(
+        tweet_id="7",
+        text_content="Shipping a new AI launch",
+        user_handle="builder",
+    )
+    llm_settings = LLMSettings()
+    stub_service = StubLLMService(
+        [
+            (
+                {
+                    "reply_text": "AI launch " * 40,
+                    "is_relevant": True,
+                    "relevance_reason": "Mentions the launch",
+                },
+                None,
+            ),
+            (
+                {
+                    "reply_text": "Great AI launch!",
+                    "is_relevant": True,
+                    "relevance_reason": "Mentions the launch",
+                },
+                None,
+            ),
+        ]
+    )
+
+    reply_text, metadata = await generate_guarded_reply(
+        llm_service=stub_service,
+        tweet=tweet,
+        llm_settings=llm_settings,
+        system_prompt="system",
+        style_summary=None,
+        persona_handle="bot",
+        inline_media=None,
+        banned_terms=None,
+        retry_limit=2,
+    )
+
+    assert reply_text == "Great AI launch!"
+    assert metadata["attempts"] == 2
+    assert "character limit" in stub_service.calls[1]["task_instruction"]
+
+
+@pytest.mark.asyncio
+async def test_generate_guarded_reply_truncates_over_long_reply_on_final_attempt():
+    tweet = ScrapedTweet(
+        tweet_id="8",
+        text_content="Shipping a new AI launch",
+        user_handle="builder",
+    )
+    over_long = {
+        "reply_text": "AI launch " * 40,
+        "is_relevant": True,
+        "relevance_reason": "Mentions the launch",
+    }
+    stub_service = StubLLMService([(over_long, None), (over_long, None)])
+
+    reply_text, metadata = await generate_guarded_reply(
+        llm_service=stub_service,
+        tweet=tweet,
+        llm_settings=LLMSettings(),
+        system_prompt="system",
+        style_summary=None,
+        persona_handle="bot",
+        inline_media=None,
+        banned_terms=None,
+        retry_limit=2,
+    )
+
+    assert reply_text is not None
+    assert len(reply_text) <= reply_generator.MAX_REPLY_CHARS
+    assert reply_text.startswith("AI launch AI launch")
+    assert metadata["attempts"] == 2
+
+
 @pytest.mark.asyncio
 async def test_generate_guarded_reply_returns_none_when_all_attempts_fail():
     tweet = ScrapedTweet(
@@ -183,6 +264,23 @@ def test_should_apply_style_profile_skips_humorous_tweets():
     assert should_apply_style_profile(tweet, ["deploy", "scripts"]) is False
 
 
+def test_prepare_tweet_context_is_shared_and_read_only():
+    tweet = ScrapedTweet(
+        tweet_id="12",
+        text_content="Kubernetes operators simplify cluster upgrades",
+        user_handle="opslead",
+        embedded_media_urls=["https://example.com/diagram.png"],
+    )
+
+    context = reply_generator._prepare_tweet_context(tweet)
+
+    assert reply_generator._prepare_tweet_context(tweet) is context
+    with pytest.raises(TypeError):
+        context["text"] = "changed"
+    assert isinstance(context["keywords"], tuple)
+    assert isinstance(context["media_urls"], tuple)
+
+
 @pytest.mark.asyncio
 async def test_generate_guarded_reply_includes_media_only_guidance():
     tweet = ScrapedTweet(
@@ -240,14 +338,23 @@ async def test_generate_guarded_reply_includes_media_only_guidance():
 
 
 @pytest.mark.asyncio
-async def test_generate_guarded_reply_inlines_media_for_gemini(monkeypatch):
+async def test_generate_guarded_reply_inlines_media_for_gemini(monkeypatch, caplog):
     captured_urls = []
+    coerce_calls = []
+    original_coerce = reply_generator._coerce_inline_media
 
     async def fake_download(url):  # pragma: no cover - simple test helper
         captured_urls.append(url)
         return "data:image/png;base64,QUFB"
 
+    def counting_coerce(inline_media):
+        coerce_calls.append(inline_media)
+        return original_coerce(inline_media)
+
     monkeypatch.setattr(reply_generator, "_download_media_to_data_url", fake_download)
+    monkeypatch.setattr(reply_generator, "_coerce_inline_media", counting_coerce)
+    # DEBUG enables the media log labels, which must reuse the same coerced refs.
+    caplog.set_level(logging.DEBUG, logger=reply_generator.logger.name)
 
     tweet = ScrapedTweet(
         tweet_id="gemini",
@@ -299,4 +406,173 @@ async def test_generate_guarded_reply_inlines_media_for_gemini(monkeypatch):
     assert captured_urls == ["https://example.com/image.png"]
     media_source = stub_service.calls[0]["inline_media"][0]["parts"][0]["source"]
     assert media_source["type"] == "data_url"
-    assert media_source["data_url"].startswith("data:image/png;base64,QUFB")
\ No newline at end of file
+    assert media_source["data_url"].startswith("data:image/png;base64,QUFB")
+    assert len(coerce_calls) == 1
+
+@pytest.mark.asyncio
+async def test_prepare_inline_media_downloads_parts_concurrently(monkeypatch):
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def fake_download(url):  # pragma: no cover - simple test helper
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return f"data:image/png;base64,{url[-5:]}"
+
+    monkeypatch.setattr(reply_generator, "_download_media_to_data_url", fake_download)
+
+    inline_media = [
+        {
+            "role": "user",
+            "parts": [
+                {"type": "text", "text": "Reference media:"},
+                {"type": "media", "media_type": "image", "source": {"type": "url", "url": f"https://example.com/{idx}.png"}},
+            ],
+        }
+        for idx in range(3)
+    ]
+
+    prepared = await reply_generator._prepare_inline_media_for_service(inline_media, "gemini")
+
+    assert peak_in_flight == 3
+    assert [entry["parts"][0] for entry in prepared] == [entry["parts"][0] for entry in inline_media]
+    sources = [entry["parts"][1]["source"] for entry in prepared]
+    assert all(source["type"] == "data_url" and "url" not in source for source in sources)
+    assert inline_media[0]["parts"][1]["source"]["type"] == "url"
+
+
+class _FakeMediaResponse:
+    def __init__(self, payload, content_type="image/png"):
+        self._payload = payload
+        self.headers = {"Content-Type": content_type, "Content-Length": str(len(payload))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self._payload), chunk_size):
+            yield self._payload[start:start + chunk_size]
+
+
+@pytest.mark.asyncio
+async def test_download_media_to_data_url_reuses_cached_payload(monkeypatch):
+    requested = []
+
+    def fake_get(url, **kwargs):  # pragma: no cover - simple test helper
+        requested.append(url)
+        return _FakeMediaResponse(b"AAA")
+
+    monkeypatch.setattr(reply_generator, "_get_http_session", lambda: SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(reply_generator, "_MEDIA_CACHE", reply_generator.OrderedDict())
+
+    first = await reply_generator._download_media_to_data_url("https://example.com/cached.png")
+    second = await reply_generator._download_media_to_data_url("https://example.com/cached.png")
+
+    assert first == second == "data:image/png;base64,QUFB"
+    assert requested == ["https://example.com/cached.png"]
+
+
+def test_download_media_to_data_url_ignores_downloads_from_another_event_loop(monkeypatch):
+    url = "https://example.com/shared.png"
+    monkeypatch.setattr(reply_generator, "_MEDIA_IN_FLIGHT", {})
+    monkeypatch.setattr(reply_generator, "_MEDIA_CACHE", reply_generator.OrderedDict())
+    monkeypatch.setattr(
+        reply_generator,
+        "_get_http_session",
+        lambda: SimpleNamespace(get=lambda url, **kwargs: _FakeMediaResponse(b"AAA")),
+    )
+
+    fetch_media_data_url = reply_generator._fetch_media_data_url
+    old_loop = asyncio.new_event_loop()
+    monkeypatch.setattr(reply_generator, "_fetch_media_data_url", lambda url: old_loop.create_future())
+
+    async def start_download():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(reply_generator._download_media_to_data_url(url), timeout=0.01)
+
+    # An earlier loop goes away while its download is still registered as in flight.
+    old_loop.run_until_complete(start_download())
+    old_loop.close()
+    assert reply_generator._MEDIA_IN_FLIGHT
+    monkeypatch.setattr(reply_generator, "_fetch_media_data_url", fetch_media_data_url)
+
+    result = asyncio.run(reply_generator._download_media_to_data_url(url))
+
+    assert result == "data:image/png;base64,QUFB"
+
+
+@pytest.mark.asyncio
+async def test_download_media_to_data_url_rejects_oversized_payload(monkeypatch):
+    monkeypatch.setattr(reply_generator, "MAX_INLINE_MEDIA_SIZE", 2)
+    monkeypatch.setattr(
+        reply_generator,
+        "_get_http_session",
+        lambda: SimpleNamespace(get=lambda url, **kwargs: _FakeMediaResponse(b"AAAA")),
+    )
+    monkeypatch.setattr(reply_generator, "_MEDIA_CACHE", reply_generator.OrderedDict())
+
+    assert await reply_generator._download_media_to_data_url("https://example.com/large.png") is None
+    assert not reply_generator._MEDIA_CACHE
+
+
+@pytest.mark.asyncio
+async def test_prepare_inline_media_fetches_duplicate_urls_once(monkeypatch):
+    captured_urls = []
+
+    async def fake_download(url):  # pragma: no cover - simple test helper
+        captured_urls.append(url)
+        return "data:image/png;base64,QUFB"
+
+    monkeypatch.setattr(reply_generator, "_download_media_to_data_url", fake_download)
+
+    text_only = {"role": "user", "parts": [{"type": "text", "text": "caption"}]}
+    media_entry = {
+        "role": "user",
+        "parts": [{"type": "media", "media_type": "image", "source": {"type": "url", "url": "https://example.com/same.png"}}],
+    }
+    prepared = await reply_generator._prepare_inline_media_for_service(
+        [text_only, media_entry, dict(media_entry)],
+        "gemini",
+    )
+
+    assert captured_urls == ["https://example.com/same.png"]
+    assert prepared[0] is text_only
+    assert prepared[1]["parts"][0]["source"]["data_url"] == "data:image/png;base64,QUFB"
+    assert prepared[2]["parts"][0]["source"]["type"] == "data_url"
+
+
+@pytest.mark.asyncio
+async def test_prepare_inline_media_returns_input_when_nothing_is_inlined(monkeypatch):
+    async def failing_download(url):  # pragma: no cover - simple test helper
+        return None
+
+    monkeypatch.setattr(reply_generator, "_download_media_to_data_url", failing_download)
+
+    inline_media = [
+        {"role": "user", "parts": [{"type": "text", "text": "caption"}]},
+        {"role": "user", "parts": [{"type": "media", "source": {"type": "url", "url": "https://example.com/x.png"}}]},
+    ]
+
+    assert await reply_generator._prepare_inline_media_for_service(inline_media, "gemini") is inline_media
+
+
+def test_needs_media_prep_only_for_gemini_with_remote_media():
+    remote = [{"parts": [{"type": "media", "source": {"type": "url", "url": "https://example.com/a.jpg"}}]}]
+    embedded = [{"parts": [{"type": "media", "source": {"type": "data_url", "data_url": "data:image/png;base64,AA=="}}]}]
+
+    remote_refs = reply_generator._coerce_inline_media(remote)
+    embedded_refs = reply_generator._coerce_inline_media(embedded)
+
+    assert reply_generator._needs_media_prep(remote_refs, "gemini")
+    assert not reply_generator._needs_media_prep(remote_refs, "azure")
+    assert not reply_generator._needs_media_prep(embedded_refs, "gemini")
+    assert not reply_generator._needs_media_prep((), "gemini")
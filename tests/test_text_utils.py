@@ -0,0 +1,71 @@
+"""Tests for text helpers shared by the reply pipeline."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure the project src/ directory is on sys.path for direct imports
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from utils.text_utils import normalize_handle, truncate_text  # noqa: E402  pylint: disable=wrong-import-position
+
+US_FLAG = "\U0001F1FA\U0001F1F8"
+FR_FLAG = "\U0001F1EB\U0001F1F7"
+
+
+def test_truncate_text_returns_short_text_unchanged():
+    assert truncate_text("hello ", 10) == "hello"
+    assert truncate_text(None, 10) == ""
+
+
+def test_truncate_text_cuts_plain_text_at_limit():
+    assert truncate_text("abcdef", 4) == "abcd"
+
+
+def test_truncate_text_drops_flag_that_straddles_limit():
+    text = "a" * 268 + US_FLAG
+    assert truncate_text(text, 269) == "a" * 268
+
+
+def test_truncate_text_keeps_flag_that_fits():
+    text = "a" * 10 + US_FLAG + FR_FLAG
+    assert truncate_text(text, 12) == "a" * 10 + US_FLAG
+    # Cutting inside the second flag drops only that flag, not the first.
+    assert truncate_text(text, 13) == "a" * 10 + US_FLAG
+
+
+def test_truncate_text_keeps_combining_marks_with_base_character():
+    text = "cafe\u0301 au lait"
+    assert truncate_text(text, 4) == "caf"
+
+
+def test_truncate_text_keeps_emoji_modifiers_and_joiners_together():
+    thumbs_up_dark = "\U0001F44D\U0001F3FF"
+    family = "\U0001F468\u200d\U0001F469\u200d\U0001F467"
+    assert truncate_text("ok" + thumbs_up_dark, 3) == "ok"
+    assert truncate_text("ok" + family, 4) == "ok"
+
+
+def test_normalize_handle_accepts_handles_and_profile_urls():
+    assert normalize_handle("@Name") == "name"
+    assert normalize_handle("  Name?s=1 ") == "name"
+    assert normalize_handle("https://x.com/Name/status/123") == "name"
+    assert normalize_handle("https://mobile.x.com/Name") == "name"
+    assert normalize_handle("http://www.x.com/@Name/") == "name"
+
+
+def test_normalize_handle_accepts_profile_paths_and_scheme_less_urls():
+    assert normalize_handle("/Name") == "name"
+    assert normalize_handle("/Name/status/123") == "name"
+    assert normalize_handle("x.com/Name") == "name"
+    assert normalize_handle("mobile.x.com/@Name?s=1") == "name"
+
+
+def test_normalize_handle_rejects_empty_values_and_other_sites():
+    assert normalize_handle(None) is None
+    assert normalize_handle("  ") is None
+    assert normalize_handle("@") is None
+    assert normalize_handle("https://example.com/Name") is None